@@ -0,0 +1,83 @@
+"""
+Бенчмарк дискового кэша индекса моделей: разбор без кэша, первый запуск и запуск из кэша.
+
+    python -m benchmarks.bench_disk_cache [files_count]
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, List
+
+from hooks.utils.disk_cache import get_disk_cache
+from hooks.utils.django_models import build_django_model_index
+from hooks.utils.mypy_api_helpers import _load_pyproject_toml
+
+DEFAULT_FILES_COUNT = 500
+CLASSES_PER_FILE = 10
+MODEL_TEMPLATE = '''
+
+class Model{0}(models.Model):
+    """Модель {0}."""
+
+    name = models.CharField(max_length=255)  # имя
+    owner = models.ForeignKey('Owner', null=True, on_delete=models.CASCADE)  # null_by_design
+    created_at = models.DateTimeField(auto_now_add=True)
+    is_active = models.BooleanField(default=True)
+
+    class Meta:
+        ordering = ['name']
+'''
+
+
+def build_models_source(file_idx: int) -> str:
+    classes = (
+        MODEL_TEMPLATE.format(file_idx * CLASSES_PER_FILE + class_idx)
+        for class_idx in range(CLASSES_PER_FILE)
+    )
+    return 'from django.db import models\n' + ''.join(classes)
+
+
+def write_models_files(root_dir: str, files_count: int) -> List[str]:
+    filepaths = []
+    for file_idx in range(files_count):
+        app_dir = os.path.join(root_dir, f'app_{file_idx}')
+        os.makedirs(app_dir)
+        filepath = os.path.join(app_dir, 'models.py')
+        with open(filepath, 'w', encoding='utf-8') as models_file:
+            models_file.write(build_models_source(file_idx))
+        filepaths.append(filepath)
+    return filepaths
+
+
+def measure(run: Callable[[], object]) -> float:
+    _load_pyproject_toml.cache_clear()
+    get_disk_cache.cache_clear()
+    started_at = time.perf_counter()
+    run()
+    return time.perf_counter() - started_at
+
+
+def main() -> None:
+    files_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_FILES_COUNT
+    with tempfile.TemporaryDirectory() as root_dir:
+        filepaths = write_models_files(root_dir, files_count)
+        os.chdir(root_dir)
+        uncached_seconds = measure(lambda: build_django_model_index(filepaths))
+        with open('pyproject.toml', 'w', encoding='utf-8') as project_file:
+            project_file.write('[tool.pre_commit_hooks]\ncache-dir = ".hooks_cache"\n')
+        cold_seconds = measure(lambda: build_django_model_index(filepaths))
+        warm_seconds = measure(lambda: build_django_model_index(filepaths))
+
+    print(  # noqa: T001
+        f'{files_count} files: no cache {uncached_seconds:.3f}s, '
+        f'cold cache {cold_seconds:.3f}s, warm cache {warm_seconds:.3f}s '
+        f'({uncached_seconds / warm_seconds:.1f}x faster)'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Бенчмарк validate_django_model_field_names на большом наборе полей моделей.
+
+    python -m benchmarks.bench_validate_django_model_field_names [fields_count]
+"""
+
+from __future__ import annotations
+
+import sys
+import timeit
+from typing import Iterator, List, Optional, Sequence, TypeVar
+
+from hooks.utils.django_models import ModelClass, ModelField, ModelsModule
+from hooks.validate_django_model_field_names import (
+    VALIDATORS,
+    BaseValidator,
+    Error,
+    validate_models_module,
+)
+
+DEFAULT_FIELDS_COUNT = 20000
+FIELDS_PER_CLASS = 20
+FIELD_TEMPLATES = (
+    ('created_{0}_at', 'DateTimeField'),
+    ('created_{0}', 'DateTimeField'),
+    ('birth_{0}_date', 'DateField'),
+    ('is_active_{0}', 'BooleanField'),
+    ('active_{0}', 'NullBooleanField'),
+    ('name_{0}', 'CharField'),
+    ('owner_{0}', 'ForeignKey'),
+    ('updated_{0}_at', 'MyDateTimeExtraField'),
+)
+
+T = TypeVar('T')
+
+
+def chunked(items: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    for start in range(0, len(items), size):
+        end = start + size
+        yield items[start:end]
+
+
+def build_models_module(fields_count: int) -> ModelsModule:
+    fields = []
+    for field_idx in range(fields_count):
+        name_template, field_type = FIELD_TEMPLATES[field_idx % len(FIELD_TEMPLATES)]
+        fields.append(
+            ModelField(
+                name=name_template.format(field_idx),
+                field_type=field_type,
+                lineno=field_idx + 1,
+                col_offset=4,
+                kwargs=(),
+                leading_comment=None,
+                trailing_comment=None,
+                is_annotated=False,
+                is_class_attribute=True,
+                is_line_statement=True,
+            )
+        )
+    classes = tuple(
+        ModelClass(f'Model{class_idx}', class_idx, True, tuple(class_fields))
+        for class_idx, class_fields in enumerate(chunked(fields, FIELDS_PER_CLASS))
+    )
+    return ModelsModule('app/models.py', classes, ())
+
+
+def get_validator_by_substrings(field_type: str) -> Optional[BaseValidator]:
+    # прежний get_validator: поиск подстрок по очереди для каждого поля
+    if not field_type.endswith('Field'):
+        return None
+    for stem, validator in VALIDATORS:
+        if stem in field_type:
+            return validator
+    return None
+
+
+def validate_by_substrings(models_module: ModelsModule) -> List[Error]:
+    errors = []
+    for field in models_module.iterate_fields():
+        if not field.field_type or not field.is_class_attribute:
+            continue
+        validator = get_validator_by_substrings(field.field_type)
+        if validator and not validator.validate(field.name):
+            errors.append(
+                Error(models_module.path, field.lineno, field.name, field.field_type, validator)
+            )
+    return errors
+
+
+def main() -> None:
+    fields_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_FIELDS_COUNT
+    models_module = build_models_module(fields_count)
+
+    repeats = 5
+    cached_seconds = timeit.timeit(lambda: validate_models_module(models_module), number=repeats)
+    substrings_seconds = timeit.timeit(
+        lambda: validate_by_substrings(models_module), number=repeats
+    )
+    errors = validate_models_module(models_module)
+    if errors != validate_by_substrings(models_module):
+        raise RuntimeError('cached and substring validator lookups report different errors')
+    print(  # noqa: T001
+        f'{fields_count} fields, {len(errors)} errors: '
+        f'cached lookup {cached_seconds / repeats * 1000:.1f}ms, '
+        f'substrings {substrings_seconds / repeats * 1000:.1f}ms per run'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Бенчмарк validate_settings_variables на большом словаре настроек.
+
+    python -m benchmarks.bench_validate_settings_variables [entries_count]
+"""
+
+from __future__ import annotations
+
+import ast
+import sys
+import timeit
+
+from hooks.validate_settings_variables import get_line_numbers_of_wrong_assignments
+
+DEFAULT_ENTRIES_COUNT = 5000
+ENTRY_TEMPLATES = (
+    "    'STATIC_{0}': 'value',",
+    "    'GETENV_{0}': os.getenv('VAR_{0}', ''),",
+    "    'VALUE_{0}': values.Value('value_{0}'),",
+    "    'NESTED_{0}': {{'handlers': ['console'], 'level': os.environ.get('LEVEL_{0}')}},",
+    "    'STATIC_LIST_{0}': ['a', 'b', {{'c': 'd'}}],",
+)
+
+
+def build_settings_source(entries_count: int) -> str:
+    entries = [
+        ENTRY_TEMPLATES[entry_idx % len(ENTRY_TEMPLATES)].format(entry_idx)
+        for entry_idx in range(entries_count)
+    ]
+    return '\n'.join(['SETTINGS = {', *entries, '}', ''])
+
+
+def main() -> None:
+    entries_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ENTRIES_COUNT
+    ast_tree = ast.parse(build_settings_source(entries_count))
+
+    repeats = 3
+    total_seconds = timeit.timeit(
+        lambda: get_line_numbers_of_wrong_assignments(ast_tree, None, ast_tree), number=repeats
+    )
+    errors = get_line_numbers_of_wrong_assignments(ast_tree, None, ast_tree)
+    print(  # noqa: T001
+        f'{entries_count} entries: {total_seconds / repeats:.3f}s per run, {len(errors)} errors'
+    )
+
+
+if __name__ == '__main__':
+    main()
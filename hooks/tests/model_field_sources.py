@@ -148,3 +148,23 @@ first_name: str = models.CharField(  # null_for_compatibility
     help_text='Имя пользователя',
 )  # deprecated SMTH-100500 20.09.2021
 """
+
+ONE_LINE_FIELD_WITH_NON_ASCII_ARGUMENT_AND_TRAILING_COMMENT = """
+name = models.CharField(verbose_name='Имя', null=True)  # null_by_design
+"""
+
+ONE_LINE_FIELD_WITH_NON_ASCII_ARGUMENT_AND_DEPRECATION_COMMENT = """
+name = models.CharField(verbose_name='Имя', null=True)  # deprecated
+"""
+
+MULTI_LINE_NON_ASCII_FIELD_WITH_LEADING_COMMENT = """
+имя_пользователя = models.CharField(  # null_for_compatibility
+    null=True,
+)
+"""
+
+MULTI_LINE_FIELD_WITH_NON_ASCII_LAST_LINE_AND_TRAILING_COMMENT = """
+name = models.CharField(
+    null=True,
+    verbose_name='Имя пользователя')  # deprecated
+"""
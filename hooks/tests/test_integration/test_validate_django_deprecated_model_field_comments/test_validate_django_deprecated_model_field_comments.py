@@ -20,8 +20,10 @@ def mocked_get_input_models_files(mocker):
     )
 
 
-def test_failing_file(mocked_get_input_models_files):
+@pytest.mark.parametrize('parser', ['ast', 'libcst'])
+def test_failing_file(mocked_get_input_models_files, parser):
     args = [
+        f'--parser={parser}',
         f'--valid-deprecation-comment-regex={DEFAULT_VALID_DEPRECATION_COMMENT_REGEX}',
         f'--deprecation-comment-marker-regex={DEFAULT_DEPRECATION_COMMENT_MARKER_REGEX}',
     ]
@@ -34,8 +36,10 @@ def test_failing_file(mocked_get_input_models_files):
     assert ret == 1
 
 
-def test_passing_file(mocked_get_input_models_files):
+@pytest.mark.parametrize('parser', ['ast', 'libcst'])
+def test_passing_file(mocked_get_input_models_files, parser):
     args = [
+        f'--parser={parser}',
         f'--valid-deprecation-comment-regex={DEFAULT_VALID_DEPRECATION_COMMENT_REGEX}',
         f'--deprecation-comment-marker-regex={DEFAULT_DEPRECATION_COMMENT_MARKER_REGEX}',
     ]
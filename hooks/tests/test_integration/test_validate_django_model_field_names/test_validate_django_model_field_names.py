@@ -46,3 +46,38 @@ def test_validate_models_package():
         _date_error('package_b/models/model_b.py', 6, 'date_bad'),
         _datetime_error('package_b/models/model_b.py', 8, 'bad_datetime'),
     ]
+
+
+def test_validate_nested_models_files_and_classes(tmp_path):
+    nested_models_file = tmp_path / 'app' / 'models' / 'clinic' / 'patient.py'
+    nested_models_file.parent.mkdir(parents=True)
+    nested_models_file.write_text(
+        'class Patient(models.Model):\n'
+        '    birth = models.DateField(); created = models.DateTimeField()\n'
+        '\n'
+        '\n'
+        'def make_model():\n'
+        '    class Visit(models.Model):\n'
+        '        visited = models.DateTimeField()\n'
+        '\n'
+        '    return Visit\n'
+        '\n'
+        '\n'
+        'if settings.DEBUG:\n'
+        '    class Debug(models.Model):\n'
+        '        started = models.DateField()\n'
+        '\n'
+        '        def save(self):\n'
+        '            ended = models.DateField()\n',
+        encoding='utf-8',
+    )
+    path = str(nested_models_file)
+
+    errors = validate([path])
+
+    assert sorted(errors) == [
+        Error(path, 2, 'birth', 'DateField', date_validator),
+        Error(path, 2, 'created', 'DateTimeField', datetime_validator),
+        Error(path, 7, 'visited', 'DateTimeField', datetime_validator),
+        Error(path, 14, 'started', 'DateField', date_validator),
+    ]
@@ -1,8 +1,17 @@
 from __future__ import annotations
 
-from textwrap import dedent
+import ast
+from textwrap import dedent, indent
 
-from hooks.validate_django_null_true_comments import Error, validate_null_comments
+import pytest
+
+from hooks.tests import model_field_sources
+from hooks.utils.django_models import extract_models_module, get_models_module
+from hooks.validate_django_null_true_comments import (
+    Error,
+    get_null_comments_errors,
+    validate_null_comments,
+)
 
 
 def test_null_comments_valid_file() -> None:
@@ -54,3 +63,87 @@ def test_null_comments_has_errors() -> None:
         Error(8, 4, 'has_middle_name'),
         Error(10, 4, 'always_null'),
     ]
+
+
+def test_null_comments_from_model_index(tmp_path) -> None:
+    models_file = tmp_path / 'models.py'
+    models_file.write_text(
+        dedent('''
+        class Operator(SafeDeletableModel):
+            uuid = models.UUIDField(  # null_for_compatibility
+                default=uuid4, unique=True, null=True
+            )
+            has_first_name = NullBooleanField('Есть имя')
+            first_name = PersonNameField(
+                'Имя', null=True,
+            )  # null_by_design
+            always_null = Foo(null=True)# mull_for compuktability
+        '''),
+        encoding='utf-8',
+    )
+
+    models_module = get_models_module(str(models_file))
+
+    assert models_module is not None
+    assert get_null_comments_errors(models_module) == [
+        Error(6, 4, 'has_first_name'),
+        Error(10, 4, 'always_null'),
+    ]
+
+
+@pytest.mark.parametrize('comment_marker', ['null_', 'nul_'])
+@pytest.mark.parametrize(
+    'field_source_name', sorted(name for name in vars(model_field_sources) if name.isupper())
+)
+def test_null_comments_ast_and_libcst_parity(field_source_name, comment_marker) -> None:
+    field_source = (
+        getattr(model_field_sources, field_source_name).strip().replace('null_', comment_marker)
+    )
+    module = 'class Operator(SafeDeletableModel):\n' + indent(field_source, '    ') + '\n'
+
+    models_module = extract_models_module('models.py', ast.parse(module), module)
+
+    assert get_null_comments_errors(models_module) == validate_null_comments(module)
+
+
+@pytest.mark.parametrize(
+    'module',
+    [
+        '''
+        class Operator(SafeDeletableModel):
+            class Profile(models.Model):
+                always_null = Foo(null=True)
+        ''',
+        '''
+        if settings.FEATURE_ENABLED:
+            class Operator(SafeDeletableModel):
+                always_null = Foo(null=True)
+        else:
+            class Operator(SafeDeletableModel):
+                always_null = Foo(null=True)  # null_by_design
+        ''',
+        '''
+        def make_model():
+            class Operator(SafeDeletableModel):
+                always_null = Foo(null=True)
+            return Operator
+        ''',
+        '''
+        class Operator(SafeDeletableModel):
+            x = Foo(null=True); y = 1
+            y = 1; x = Foo(null=True)
+            if settings.FEATURE_ENABLED: z = Foo(null=True)
+            always_null = Foo(null=True);
+
+            def save(self):
+                local_null = Foo(null=True)
+        ''',
+    ],
+)
+def test_null_comments_ast_and_libcst_parity_for_nested_classes(module) -> None:
+    module = dedent(module)
+
+    models_module = extract_models_module('models.py', ast.parse(module), module)
+
+    assert get_null_comments_errors(models_module) == validate_null_comments(module)
+    assert validate_null_comments(module)
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+import ast
 import pathlib
 
-from hooks.validate_expressions_complexity import get_file_errors
+from hooks.validate_expressions_complexity import (
+    UnknownAstNodeError,
+    UnknownExpressionError,
+    get_file_errors,
+    get_tree_errors,
+)
 
 SAMPLE_FILE = pathlib.Path(__file__).parent / 'samples' / 'sample.py'
 
@@ -15,3 +21,30 @@ def test_get_file_errors():
     )
 
     assert errors == []
+
+
+def test_get_tree_errors_reports_unknown_expression(mocker):
+    file_content = 'value = compute(1)\n'
+    ast_tree = ast.parse(file_content)
+    call = ast_tree.body[0].value
+    mocker.patch(
+        'hooks.validate_expressions_complexity.get_expression_complexity',
+        side_effect=UnknownAstNodeError('unknown expression type', node=call),
+    )
+
+    errors = list(
+        get_tree_errors(
+            'module.py',
+            ast_tree,
+            file_content,
+            max_expression_complexity=9,
+            ignore_django_orm_queries=True,
+        )
+    )
+
+    assert errors == [
+        UnknownExpressionError('module.py', 1, 'unknown expression type', file_content[:-1], 8, 18)
+    ]
+    assert errors[0].format() == (
+        'unknown expression type in module.py:1\nvalue = compute(1)\n        ^^^^^^^^^^'
+    )
@@ -4,11 +4,12 @@ import ast
 
 import pytest
 
+from hooks.utils.noqa import build_noqa_index
 from hooks.validate_settings_variables import (
     LineError,
     Reasons,
-    exclude_lines_with_noqa,
     get_line_numbers_of_wrong_assignments,
+    get_lines_with_settings_noqa,
 )
 
 
@@ -23,7 +24,10 @@ from hooks.validate_settings_variables import (
             'VAR': values.Value('value', ''),
         }
         """,
-            [LineError(2, Reasons.STRAIGHT_ASSIGNMENT), LineError(3, Reasons.GETENV)],
+            [
+                LineError('settings.py', 2, Reasons.STRAIGHT_ASSIGNMENT),
+                LineError('settings.py', 3, Reasons.GETENV),
+            ],
         ),
         (
             """
@@ -38,12 +42,12 @@ from hooks.validate_settings_variables import (
         }
         """,
             [
-                LineError(2, Reasons.GETENV),
-                LineError(3, Reasons.GETENV),
-                LineError(4, Reasons.GETENV),
-                LineError(5, Reasons.GETENV),
-                LineError(6, Reasons.GETENV),
-                LineError(8, Reasons.GETENV),
+                LineError('settings.py', 2, Reasons.GETENV),
+                LineError('settings.py', 3, Reasons.GETENV),
+                LineError('settings.py', 4, Reasons.GETENV),
+                LineError('settings.py', 5, Reasons.GETENV),
+                LineError('settings.py', 6, Reasons.GETENV),
+                LineError('settings.py', 8, Reasons.GETENV),
             ],
         ),
         (
@@ -53,7 +57,10 @@ from hooks.validate_settings_variables import (
             VAR = os.getenv('value', '')
             VAR = logging.getLogger('value')
         """,
-            [LineError(2, Reasons.STRAIGHT_ASSIGNMENT), LineError(3, Reasons.GETENV)],
+            [
+                LineError('settings.py', 2, Reasons.STRAIGHT_ASSIGNMENT),
+                LineError('settings.py', 3, Reasons.GETENV),
+            ],
         ),
         (
             """
@@ -61,7 +68,7 @@ from hooks.validate_settings_variables import (
             'value',
             ]
         """,
-            [LineError(1, Reasons.STATIC_OBJECT)],
+            [LineError('settings.py', 1, Reasons.STATIC_OBJECT)],
         ),
         (
             """
@@ -78,14 +85,20 @@ from hooks.validate_settings_variables import (
             os.getenv('value', ''),
             ]
         """,
-            [LineError(2, Reasons.STRAIGHT_ASSIGNMENT), LineError(3, Reasons.GETENV)],
+            [
+                LineError('settings.py', 2, Reasons.STRAIGHT_ASSIGNMENT),
+                LineError('settings.py', 3, Reasons.GETENV),
+            ],
         ),
     ],
 )
 def test_get_numbers_of_wrong_lines(file_line, expected_result):
     content = ast.parse(file_line.strip()).body[0]
 
-    assert get_line_numbers_of_wrong_assignments(content, content, content) == expected_result
+    assert (
+        get_line_numbers_of_wrong_assignments(content, content, content, 'settings.py')
+        == expected_result
+    )
 
 
 @pytest.mark.parametrize(
@@ -110,10 +123,15 @@ def test_get_numbers_of_wrong_lines(file_line, expected_result):
         """,
             {4},
         ),
+        (
+            """
+        B = ['a']  # noqa: static object -- see docs
+        C = 'c'  # noqa: allowed straight assignment (legacy)
+        D = 'd'  # noqa: E501
+        """,
+            {2, 3},
+        ),
     ],
 )
-def test_exclude_lines_with_noqa(file_content, expected_result, tmpdir):
-    file_path = tmpdir.mkdir('sub').join('settings_file.txt')
-    file_path.write(file_content)
-
-    assert exclude_lines_with_noqa(file_path) == expected_result
+def test_get_lines_with_settings_noqa(file_content, expected_result):
+    assert get_lines_with_settings_noqa(build_noqa_index(file_content)) == expected_result
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import ast
+
+import pytest
+
+from hooks.validate_ajustable_complexity import (
+    ComplexityError,
+    get_file_errors,
+    get_max_complexity_for_path,
+)
+
+COMPLEX_FUNCTION = """
+def complex_function(items):
+    if items:
+        pass
+    if items:
+        pass
+    if items:
+        pass
+"""
+
+
+@pytest.mark.parametrize(
+    'file_content, expected_errors',
+    [
+        (COMPLEX_FUNCTION, [ComplexityError('/app/module.py', 2, 'complex_function', 4, 3)]),
+        (COMPLEX_FUNCTION.replace('(items):', '(items):  # noqa'), []),
+        (COMPLEX_FUNCTION.replace('items', 'orders'), []),
+    ],
+)
+def test__get_file_errors__penalizes_blacklisted_variable_names(file_content, expected_errors):
+    errors = get_file_errors('/app/module.py', ast.parse(file_content), file_content, 5)
+
+    assert errors == expected_errors
+
+
+def test__get_max_complexity_for_path__uses_per_path_override():
+    per_path_max_complexity = [('legacy.py', 13)]
+
+    assert get_max_complexity_for_path('/app/legacy.py', per_path_max_complexity, 9) == 13
+    assert get_max_complexity_for_path('/app/module.py', per_path_max_complexity, 9) == 9
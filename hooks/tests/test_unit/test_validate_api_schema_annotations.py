@@ -3,7 +3,10 @@ from __future__ import annotations
 import pytest
 
 from hooks.tests.helpers import get_class_def_node_body_from_string_definition
+from hooks.utils.class_hierarchy import ClassHierarchy
 from hooks.validate_api_schema_annotations import (
+    ApiClassKind,
+    ApiSchemaError,
     check_docstring,
     check_docstrings_for_api_action_handlers,
     check_docstrings_for_views_dispatch_methods,
@@ -13,6 +16,7 @@ from hooks.validate_api_schema_annotations import (
     check_schema_wrapper_for_serializer_method_field,
     check_viewset_has_serializer_class_map,
     check_viewset_lookup_field_has_valid_value,
+    describe_api_class,
     get_serializer_field_method,
     is_serializer,
     is_view,
@@ -20,6 +24,10 @@ from hooks.validate_api_schema_annotations import (
 )
 
 
+def _get_lines_and_reasons(errors):
+    return [(error.line, error.reason) for error in errors]
+
+
 @pytest.fixture()
 def serializers_file_path():
     return 'some_app/api/serializers/base.py'
@@ -51,7 +59,9 @@ def test__get_serializer_field_method__returns_matching_getter():
                 pass
         """)
 
-    method = get_serializer_field_method(node, 'visit')
+    method = get_serializer_field_method(
+        describe_api_class(node, 'some_app/api/serializers.py'), 'visit'
+    )
 
     assert method is not None
     assert method.name == 'get_visit'
@@ -62,7 +72,9 @@ def test__get_serializer_field_method__returns_none_when_getter_missing():
             visit = SerializerMethodField()
         """)
 
-    assert get_serializer_field_method(node, 'visit') is None
+    api_class = describe_api_class(node, 'some_app/api/serializers.py')
+
+    assert get_serializer_field_method(api_class, 'visit') is None
 
 
 @pytest.mark.parametrize(
@@ -140,7 +152,7 @@ def test_is_view_success_case(definition, expected_result):
             """,
             [],
         ),
-        ('class Test: pass', [':1 Test missed docstring']),
+        ('class Test: pass', [(1, 'Test missed docstring')]),
     ),
 )
 def test_check_docstring_success_case(definition, expected_errors):
@@ -148,7 +160,7 @@ def test_check_docstring_success_case(definition, expected_errors):
 
     errors = check_docstring(node)
 
-    assert errors == expected_errors
+    assert _get_lines_and_reasons(errors) == expected_errors
 
 
 @pytest.mark.parametrize(
@@ -206,7 +218,7 @@ def test_check_docstring_success_case(definition, expected_errors):
                     pass
                 """),
             'viewsets_file_path',
-            ['Test missed schema tags attribute'],
+            [(1, 'Test missed schema tags attribute')],
         ),
     ],
 )
@@ -216,7 +228,7 @@ def test_check_schema_tag_presence(request, definition, file_path_fixture, expec
 
     errors = check_schema_tags_presence_in_views_and_viewsets(node, file_path)
 
-    assert errors == expected_errors
+    assert _get_lines_and_reasons(errors) == expected_errors
 
 
 @pytest.mark.parametrize(
@@ -252,7 +264,7 @@ def test_check_schema_tag_presence(request, definition, file_path_fixture, expec
                     )
                 """),
             'serializers_file_path',
-            [':2 missing `help_text` attribute', ':5 missing `help_text` attribute'],
+            [(2, 'missing `help_text` attribute'), (5, 'missing `help_text` attribute')],
         ),
         (
             ("""class TestSerializer(ModelSerializer):
@@ -263,7 +275,7 @@ def test_check_schema_tag_presence(request, definition, file_path_fixture, expec
                     )
                 """),
             'serializers_file_path',
-            [':4 missing `help_text` attribute'],
+            [(4, 'missing `help_text` attribute')],
         ),
         (
             ("""class TestSerializer(Serializer):
@@ -274,7 +286,7 @@ def test_check_schema_tag_presence(request, definition, file_path_fixture, expec
                     )
                 """),
             'serializers_file_path',
-            [':4 missing `help_text` attribute'],
+            [(4, 'missing `help_text` attribute')],
         ),
         (
             ("""class TestSerializer(ModelSerializer):
@@ -297,7 +309,7 @@ def test_help_text_attribute_in_serializer_fields(
 
     errors = check_help_text_attribute_in_serializer_fields(node, file_path)
 
-    assert errors == expected_errors
+    assert _get_lines_and_reasons(errors) == expected_errors
 
 
 @pytest.mark.parametrize(
@@ -307,13 +319,13 @@ def test_help_text_attribute_in_serializer_fields(
             """class Test(GenericViewSet):
             pass
         """,
-            [':1 Test missed `serializer_class_map` attribute'],
+            [(1, 'Test missed `serializer_class_map` attribute')],
         ),
         (
             """class Test(GenericViewSet):
             some_field = 'some_value'
         """,
-            [':1 Test missed `serializer_class_map` attribute'],
+            [(1, 'Test missed `serializer_class_map` attribute')],
         ),
         (
             """class Test(GenericViewSet):
@@ -363,7 +375,7 @@ def test_check_viewset_has_serializer_class_map(definition, expected_errors):
 
     errors = check_viewset_has_serializer_class_map(node)
 
-    assert errors == expected_errors
+    assert _get_lines_and_reasons(errors) == expected_errors
 
 
 @pytest.mark.parametrize(
@@ -381,7 +393,7 @@ def test_check_viewset_has_serializer_class_map(definition, expected_errors):
             another_field = 'another_value'
             lookup_field = 'id'
         """,
-            [":1 Test viewset has forbidden `lookup_field`. Choose from: ['uuid']"],
+            [(1, "Test viewset has forbidden `lookup_field`. Choose from: ['uuid']")],
         ),
     ),
 )
@@ -390,7 +402,7 @@ def test_check_viewset_lookup_field_has_valid_value(definition, expected_errors)
 
     errors = check_viewset_lookup_field_has_valid_value(node)
 
-    assert errors == expected_errors
+    assert _get_lines_and_reasons(errors) == expected_errors
 
 
 @pytest.mark.parametrize(
@@ -413,9 +425,9 @@ def test_check_viewset_lookup_field_has_valid_value(definition, expected_errors)
             """,
             'serializers_file_path',
             [
-                ':2 Test serializer visit field missing SchemaWrapper',
-                ':3 Test serializer patient field missing SchemaWrapper',
-                ':4 Test serializer urls field missing SchemaWrapper',
+                (2, 'Test serializer visit field missing SchemaWrapper'),
+                (3, 'Test serializer patient field missing SchemaWrapper'),
+                (4, 'Test serializer urls field missing SchemaWrapper'),
             ],
         ),
         (
@@ -435,9 +447,9 @@ def test_check_viewset_lookup_field_has_valid_value(definition, expected_errors)
             """,
             'serializers_file_path',
             [
-                ':2 Test serializer visit field missing SchemaWrapper',
-                ':3 Test serializer patient field missing SchemaWrapper',
-                ':4 Test serializer urls field missing SchemaWrapper',
+                (2, 'Test serializer visit field missing SchemaWrapper'),
+                (3, 'Test serializer patient field missing SchemaWrapper'),
+                (4, 'Test serializer urls field missing SchemaWrapper'),
             ],
         ),
         (
@@ -542,9 +554,9 @@ def test_check_viewset_lookup_field_has_valid_value(definition, expected_errors)
             """,
             'serializers_file_path',
             [
-                ':2 Test serializer visit field missing SchemaWrapper',
-                ':3 Test serializer patient field missing SchemaWrapper',
-                ':4 Test serializer urls field missing SchemaWrapper',
+                (2, 'Test serializer visit field missing SchemaWrapper'),
+                (3, 'Test serializer patient field missing SchemaWrapper'),
+                (4, 'Test serializer urls field missing SchemaWrapper'),
             ],
         ),
     ],
@@ -557,7 +569,7 @@ def test_check_schema_wrapper_for_serializer_method_field(
 
     errors = check_schema_wrapper_for_serializer_method_field(node, file_path)
 
-    assert errors == expected_errors
+    assert _get_lines_and_reasons(errors) == expected_errors
 
 
 @pytest.mark.parametrize(
@@ -569,7 +581,7 @@ def test_check_schema_wrapper_for_serializer_method_field(
             def test_action(self):
                 pass
         """,
-            [':3 test_action missed docstring'],
+            [(3, 'test_action missed docstring')],
         ),
         (
             """class TestViewset(ModelViewSet):
@@ -586,7 +598,7 @@ def test_check_schema_wrapper_for_serializer_method_field(
             def test_action(self):
                 pass
         """,
-            [':3 test_action missed docstring'],
+            [(3, 'test_action missed docstring')],
         ),
         (
             """class TestViewset(ModelViewSet):
@@ -604,7 +616,7 @@ def test_check_docstrings_for_api_action_handlers(definition, expected_errors):
 
     errors = check_docstrings_for_api_action_handlers(node)
 
-    assert errors == expected_errors
+    assert _get_lines_and_reasons(errors) == expected_errors
 
 
 @pytest.mark.parametrize(
@@ -618,7 +630,7 @@ def test_check_docstrings_for_api_action_handlers(definition, expected_errors):
             def patch(self) -> None:
                 pass
         """,
-            [':2 get missed docstring', ':5 patch missed docstring'],
+            [(2, 'get missed docstring'), (5, 'patch missed docstring')],
         ),
         (
             """class TestView(GenericAPIView):
@@ -646,7 +658,7 @@ def test_check_docstrings_for_views_dispatch_methods(definition, expected_errors
 
     errors = check_docstrings_for_views_dispatch_methods(node)
 
-    assert errors == expected_errors
+    assert _get_lines_and_reasons(errors) == expected_errors
 
 
 @pytest.mark.parametrize(
@@ -660,7 +672,7 @@ def test_check_docstrings_for_views_dispatch_methods(definition, expected_errors
             def retrieve(self) -> None:
                 pass
         """,
-            [':2 list missed docstring', ':5 retrieve missed docstring'],
+            [(2, 'list missed docstring'), (5, 'retrieve missed docstring')],
         ),
         (
             """class TestViewset(ModelViewSet):
@@ -688,4 +700,49 @@ def test_check_doctstrings_viewsets_dispatch_methods(definition, expected_errors
 
     errors = check_doctstrings_viewsets_dispatch_methods(node)
 
-    assert errors == expected_errors
+    assert _get_lines_and_reasons(errors) == expected_errors
+
+
+def test__describe_api_class__classifies_class_once(serializers_file_path):
+    node = get_class_def_node_body_from_string_definition("""class TestViewSet(ModelViewSet):
+            lookup_field: str = 'uuid'
+            schema_tags = serializer_class_map = {}
+
+            def list(self):
+                pass
+        """)
+
+    api_class = describe_api_class(node, serializers_file_path)
+
+    assert api_class.kind == ApiClassKind.SERIALIZER | ApiClassKind.VIEWSET
+    assert sorted(api_class.assignments_by_name) == [
+        'lookup_field',
+        'schema_tags',
+        'serializer_class_map',
+    ]
+    assert list(api_class.methods_by_name) == ['list']
+    assert describe_api_class(node, serializers_file_path) is api_class
+    assert describe_api_class(node).kind == ApiClassKind.VIEWSET
+
+
+def test__describe_api_class__classifies_indirect_subclasses_with_hierarchy(tmp_path):
+    tmp_path.joinpath('core').mkdir()
+    tmp_path.joinpath('core', 'viewsets.py').write_text(
+        'from restdoctor.rest_framework.viewsets import ModelViewSet\n\n\n'
+        'class BaseViewSet(ModelViewSet):\n    pass\n',
+        encoding='utf-8',
+    )
+    viewsets_file = tmp_path / 'some_app' / 'api' / 'viewsets.py'
+    viewsets_file.parent.mkdir(parents=True)
+    definition = 'class OrderViewSet(BaseViewSet):\n    pass\n'
+    viewsets_file.write_text(f'from core.viewsets import BaseViewSet\n\n\n{definition}')
+    node = get_class_def_node_body_from_string_definition(definition)
+
+    api_class = describe_api_class(node, str(viewsets_file), ClassHierarchy(str(tmp_path)))
+
+    assert api_class.kind == ApiClassKind.VIEWSET
+    assert check_viewset_has_serializer_class_map(node, str(viewsets_file)) == [
+        ApiSchemaError(
+            str(viewsets_file), 1, 'OrderViewSet missed `serializer_class_map` attribute'
+        )
+    ]
@@ -1,8 +1,15 @@
 from __future__ import annotations
 
+import libcst
 import pytest
 
-from hooks.validate_celery_tasks_return_types import validate_return_types
+from hooks.validate_celery_tasks_return_types import (
+    DEFAULT_TASK_DECORATORS,
+    Error,
+    TaskDecorators,
+    build_task_registry,
+    validate_return_types,
+)
 
 VALID_CONTENT = """
 @app.task(name='foo')
@@ -33,3 +40,56 @@ def foo() -> int:
 def test_validate_return_types(file_content, errors_count):
     errors = validate_return_types(file_content)
     assert len(errors) == errors_count
+
+
+@pytest.mark.parametrize(
+    ['patterns', 'decorator', 'expected_result'],
+    [
+        (DEFAULT_TASK_DECORATORS, '@app.task', True),
+        (DEFAULT_TASK_DECORATORS, '@app.task(name="foo")', True),
+        (DEFAULT_TASK_DECORATORS, '@celery_app.task', False),
+        (DEFAULT_TASK_DECORATORS, '@app.tasks', False),
+        (DEFAULT_TASK_DECORATORS, '@task', False),
+        (DEFAULT_TASK_DECORATORS, '@app.task.foo', False),
+        (['shared_task', 'periodic_task'], '@shared_task', True),
+        (['shared_task', 'periodic_task'], '@periodic_task(run_every=60)', True),
+        (['shared_task', 'periodic_task'], '@celery.shared_task', False),
+        (['*.task'], '@celery_app.task', True),
+        (['*.task'], '@task', False),
+        (['*.task'], '@foo.bar.task', False),
+    ],
+)
+def test_task_decorators_is_task_decorator(patterns, decorator, expected_result):
+    function_def = libcst.parse_statement(f'{decorator}\ndef foo() -> None:\n    pass\n')
+
+    assert TaskDecorators(patterns).is_task_decorator(function_def.decorators[0]) == expected_result
+
+
+def test_validate_return_types_skips_files_without_tasks(mocker):
+    parse_mock = mocker.patch('hooks.validate_celery_tasks_return_types.parse_module')
+
+    assert validate_return_types(b'def foo() -> int:\n    return 1\n') == []
+    parse_mock.assert_not_called()
+
+
+def test_validate_return_types_reports_offending_task_line():
+    assert validate_return_types('\n\n' + INVALID_CONTENT) == [Error(line=5, function_name='foo')]
+
+
+def test_build_task_registry_collects_tasks_for_export(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'tasks.py').write_text(
+        '@shared_task\ndef foo() -> int:\n    return 1\n\n\n'
+        '@app.task\ndef bar() -> None:\n    pass\n',
+        encoding='utf-8',
+    )
+
+    task_registry = build_task_registry(
+        [str(tmp_path / 'tasks.py')], TaskDecorators(['shared_task', 'app.task'])
+    )
+
+    assert [
+        (task.module, task.name, task.line, task.return_annotation, task.has_valid_return_type)
+        for task in task_registry.get_module_tasks('tasks')
+    ] == [('tasks', 'foo', 2, 'int', False), ('tasks', 'bar', 7, 'None', True)]
+    assert '"return_annotation": "int"' in task_registry.to_json()
@@ -6,7 +6,7 @@ import libcst as cst
 import pytest
 from libcst.matchers import matches
 
-from hooks.tests.test_unit.test_validate_django_deprecated_model_field_comments.conftest import (
+from hooks.tests.model_field_sources import (
     MULTI_LINE_ANNOTATED_FIELD_WITH_LEADING_AND_TRAILING_COMMENTS,
     MULTI_LINE_ANNOTATED_FOREIGN_KEY_WITH_LEADING_AND_TRAILING_COMMENTS,
     MULTI_LINE_ANNOTATED_FOREIGN_KEY_WITH_LEADING_COMMENT,
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import ast
+import re
+import textwrap
+
+import libcst as cst
+import pytest
+
+from hooks.tests import model_field_sources
+from hooks.utils.django_models import extract_models_module
+from hooks.validate_django_deprecated_model_field_comments import (
+    DEFAULT_DEPRECATION_COMMENT_MARKER_REGEX,
+    DEFAULT_VALID_DEPRECATION_COMMENT_REGEX,
+    DeprecatedModelFieldValidator,
+    get_deprecated_model_field_comments_errors,
+)
+
+MODEL_FILE_PATH = 'some_app/models.py'
+FIELD_SOURCES = {
+    name: source for name, source in vars(model_field_sources).items() if name.isupper()
+}
+
+
+def _wrap_in_model(field_source: str) -> str:
+    return 'class TestModel(models.Model):\n' + textwrap.indent(field_source.strip(), '    ') + '\n'
+
+
+@pytest.mark.parametrize('marker_regex', [DEFAULT_DEPRECATION_COMMENT_MARKER_REGEX, 'null_'])
+@pytest.mark.parametrize('field_source_name', sorted(FIELD_SOURCES))
+def test__ast_and_libcst_parsers_report_same_errors(field_source_name, marker_regex):
+    source = _wrap_in_model(FIELD_SOURCES[field_source_name])
+    valid_pattern = re.compile(DEFAULT_VALID_DEPRECATION_COMMENT_REGEX)
+    marker_pattern = re.compile(marker_regex)
+
+    libcst_errors = (
+        DeprecatedModelFieldValidator(MODEL_FILE_PATH, valid_pattern, marker_pattern)
+        .run_for_module(cst.parse_module(source))
+        .errors
+    )
+    ast_errors = get_deprecated_model_field_comments_errors(
+        extract_models_module(MODEL_FILE_PATH, ast.parse(source), source),
+        valid_pattern,
+        marker_pattern,
+    )
+
+    assert ast_errors == libcst_errors
+
+
+@pytest.mark.parametrize(
+    'source',
+    [
+        '''
+        class Order(models.Model):
+            class Item(models.Model):
+                sku = models.CharField()  # deprecated sku
+        ''',
+        '''
+        if settings.FEATURE_ENABLED:
+            class Order(models.Model):
+                sku = models.CharField()  # deprecated sku
+        ''',
+        '''
+        def make_model():
+            class Order(models.Model):
+                sku = models.CharField()  # deprecated sku
+            return Order
+        ''',
+        '''
+        class Order(models.Model):
+            sku = models.CharField(); price = 1  # deprecated sku
+            price = 1; sku = models.CharField()  # deprecated sku
+            number = models.CharField()  # deprecated number
+        ''',
+    ],
+)
+def test__ast_and_libcst_parsers_report_same_errors_for_nested_classes(source):
+    source = textwrap.dedent(source)
+    valid_pattern = re.compile(DEFAULT_VALID_DEPRECATION_COMMENT_REGEX)
+    marker_pattern = re.compile(DEFAULT_DEPRECATION_COMMENT_MARKER_REGEX)
+
+    libcst_errors = (
+        DeprecatedModelFieldValidator(MODEL_FILE_PATH, valid_pattern, marker_pattern)
+        .run_for_module(cst.parse_module(source))
+        .errors
+    )
+    ast_errors = get_deprecated_model_field_comments_errors(
+        extract_models_module(MODEL_FILE_PATH, ast.parse(source), source),
+        valid_pattern,
+        marker_pattern,
+    )
+
+    assert ast_errors == libcst_errors
+    assert ast_errors
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import ast
+import itertools
+
+from hooks.utils.django_models import ModelClass, ModelField, ModelsModule
+from hooks.validate_django_model_field_names import (
+    check_assign,
+    get_validator,
+    validate_models_module,
+)
+
+FIELD_NAMES = [
+    'created_at',
+    'created',
+    'birth_date',
+    'date',
+    'is_active',
+    'active',
+    'user_has_access',
+    'has_',
+    'at',
+    '_at',
+    'Is_active',
+]
+FIELD_TYPES = [
+    'DateTimeField',
+    'DateField',
+    'BooleanField',
+    'NullBooleanField',
+    'MyDateTimeExtraField',
+    'CharField',
+    'DateSerializer',
+]
+
+
+def _build_field(field_name, field_type, lineno):
+    return ModelField(field_name, field_type, lineno, 4, (), None, None, False, True, True)
+
+
+def test__validate_models_module__matches_check_assign():
+    fields = []
+    expected_errors = []
+    for lineno, (field_name, field_type) in enumerate(
+        itertools.product(FIELD_NAMES, FIELD_TYPES), start=1
+    ):
+        fields.append(_build_field(field_name, field_type, lineno))
+        assign = ast.parse('\n' * (lineno - 1) + f'{field_name} = models.{field_type}()').body[0]
+        expected_errors.append(check_assign(assign, 'models.py'))
+    models_module = ModelsModule('models.py', (ModelClass('Foo', 1, True, tuple(fields)),), ())
+
+    errors = validate_models_module(models_module)
+
+    assert errors == [error for error in expected_errors if error]
+    assert {error.validator for error in errors} == {
+        get_validator('DateTimeField'),
+        get_validator('DateField'),
+        get_validator('BooleanField'),
+    }
+
+
+def test__validate_models_module__skips_fields_without_type():
+    field = _build_field('created', None, 1)
+    models_module = ModelsModule('models.py', (ModelClass('Foo', 1, True, (field,)),), ())
+
+    assert validate_models_module(models_module) == []
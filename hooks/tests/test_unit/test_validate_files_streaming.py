@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import pytest
+
+from hooks.utils.disk_cache import get_disk_cache
+from hooks.utils.mypy_api_helpers import _load_pyproject_toml
+from hooks.utils.source_file import get_parse_limits, get_read_ahead
+from hooks.utils.streaming import StreamingLimits
+from hooks.validate_files_streaming import main
+
+
+@pytest.fixture(autouse=True)
+def clear_config_caches() -> None:
+    _load_pyproject_toml.cache_clear()
+    get_disk_cache.cache_clear()
+    get_parse_limits.cache_clear()
+    get_read_ahead.cache_clear()
+    yield
+    _load_pyproject_toml.cache_clear()
+    get_disk_cache.cache_clear()
+    get_parse_limits.cache_clear()
+    get_read_ahead.cache_clear()
+
+
+@pytest.fixture()
+def project_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    tmp_path.joinpath('pyproject.toml').write_text(
+        '[tool.pre_commit_hooks]\nparse-timeout = 5\n', encoding='utf-8'
+    )
+    tmp_path.joinpath('module.py').write_text('VALUE = 1\n', encoding='utf-8')
+    return tmp_path
+
+
+def test__main__clamps_workers_to_memory_budget(project_dir, mocker, capsys):
+    get_limits_mock = mocker.patch(
+        'hooks.validate_files_streaming.get_limits_for_budget',
+        return_value=StreamingLimits(workers=1, max_parsed_files=1),
+    )
+    runner_mock = mocker.patch('hooks.validate_files_streaming.StreamingRunner')
+    runner_mock.return_value.iterate_errors.return_value = []
+
+    assert main(['--workers', '8', '--memory-budget', '64', 'module.py']) == 0
+
+    get_limits_mock.assert_called_once_with(64.0, 8, 16, None)
+    assert runner_mock.call_args.args[1:3] == (1, 1)
+    assert capsys.readouterr().err == ''
+
+
+def test__main__passes_parse_timeout_to_worker_processes(project_dir, mocker, capsys):
+    mocker.patch('hooks.validate_files_streaming.can_fork_workers', return_value=True)
+    runner_mock = mocker.patch('hooks.validate_files_streaming.StreamingRunner')
+    runner_mock.return_value.iterate_errors.return_value = []
+
+    assert main(['--workers', '2', '--rules', 'no-asserts', 'module.py']) == 0
+
+    assert runner_mock.call_args.args[4] == 5.0
+    assert capsys.readouterr().err == ''
+
+
+def test__main__warns_that_parse_timeout_needs_fork(project_dir, mocker, capsys):
+    mocker.patch('hooks.validate_files_streaming.can_fork_workers', return_value=False)
+
+    assert main(['--workers', '2', '--rules', 'no-asserts', 'module.py']) == 0
+
+    assert capsys.readouterr().err == (
+        'warning: parse-timeout is not applied with --workers > 1 on this platform\n'
+    )
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import textwrap
+
+import pytest
+
+from hooks.utils.disk_cache import get_disk_cache
+from hooks.utils.graphql_types import build_graphql_schema_index
+from hooks.utils.mypy_api_helpers import _load_pyproject_toml
+from hooks.utils.source_file import get_parse_limits
+from hooks.validate_graphql_model_fields_definition import main
+
+
+@pytest.fixture(autouse=True)
+def clear_config_caches() -> None:
+    _load_pyproject_toml.cache_clear()
+    get_disk_cache.cache_clear()
+    get_parse_limits.cache_clear()
+    yield
+    _load_pyproject_toml.cache_clear()
+    get_disk_cache.cache_clear()
+    get_parse_limits.cache_clear()
+
+
+@pytest.fixture()
+def schema_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    core_dir = tmp_path / 'core'
+    core_dir.mkdir()
+    core_dir.joinpath('types.py').write_text(
+        textwrap.dedent('''\
+            from graphene_django import DjangoObjectType as BaseDjangoType
+
+
+            class ProjectType(BaseDjangoType):
+                class Meta:
+                    abstract = True
+            '''),
+        encoding='utf-8',
+    )
+    schema_file = tmp_path / 'schema.py'
+    schema_file.write_text(
+        textwrap.dedent('''\
+            import graphene
+            import graphene_django
+
+            from core.types import ProjectType
+
+
+            class OrderType(ProjectType):
+                class Meta:
+                    model = Order
+                    only_fields = ('uuid', 'number')
+
+
+            class ClientType(graphene_django.DjangoObjectType):
+                class Meta:
+                    model = Client
+                    exclude = ['password']
+
+
+            class UserType(ProjectType):
+                class Meta:
+                    model = User
+                    fields = '__all__'
+
+
+            class Query(graphene.ObjectType):
+                only_fields = ('uuid',)
+
+
+            def get_payment_type():
+                class PaymentType(ProjectType):
+                    class Meta:
+                        model = Payment
+
+                return PaymentType
+            '''),
+        encoding='utf-8',
+    )
+    return tmp_path
+
+
+def test__graphql_schema_index__resolves_django_object_types_across_files(schema_dir):
+    schema_index = build_graphql_schema_index(['schema.py'])
+
+    graphql_types = {
+        graphql_type.name: graphql_type
+        for _, graphql_type in schema_index.iterate_django_object_types()
+    }
+
+    assert sorted(graphql_types) == ['ClientType', 'OrderType', 'PaymentType', 'UserType']
+    assert graphql_types['OrderType'].exposed_fields == ('uuid', 'number')
+    assert sorted(
+        name
+        for name, graphql_type in graphql_types.items()
+        if graphql_type.exposes_fields_implicitly
+    ) == ['ClientType', 'PaymentType', 'UserType']
+
+
+def test__main__reports_implicitly_exposed_fields(schema_dir, monkeypatch, capsys):
+    monkeypatch.setattr('sys.argv', ['validate_graphql_model_fields_definition', 'schema.py'])
+
+    assert main() == 1
+
+    assert capsys.readouterr().out.splitlines() == [
+        f'{schema_dir.resolve() / "schema.py"}:13 "ClientType" implicitly exposes all model\'s fields',
+        f'{schema_dir.resolve() / "schema.py"}:19 "UserType" implicitly exposes all model\'s fields',
+        f'{schema_dir.resolve() / "schema.py"}:30 "PaymentType" implicitly exposes all model\'s fields',
+    ]
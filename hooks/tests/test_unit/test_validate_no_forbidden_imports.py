@@ -4,7 +4,12 @@ import ast
 
 import pytest
 
-from hooks.validate_no_forbidden_imports import get_import_errors_in_ast_tree, is_import_in_list
+from hooks.utils.import_graph import DottedNameTrie, add_project_packages, build_import_graph
+from hooks.validate_no_forbidden_imports import (
+    get_import_errors_in_ast_tree,
+    get_transitive_import_errors,
+    is_import_in_list,
+)
 
 
 @pytest.mark.parametrize(
@@ -30,4 +35,26 @@ def test__get_import_errors_in_ast_tree__reports_forbidden_import():
 
     errors = get_import_errors_in_ast_tree('/app/module.py', ast_tree, forbidden_imports)
 
-    assert errors == ['/app/module.py:1 Forbidden import']
+    assert [error.format() for error in errors] == ['/app/module.py:1 Forbidden import']
+
+
+def test__get_transitive_import_errors__reports_forbidden_import_behind_internal_module(tmp_path):
+    (tmp_path / 'app').mkdir()
+    (tmp_path / 'app' / 'views.py').write_text(
+        'import json\nfrom app.db import connection\n', encoding='utf-8'
+    )
+    (tmp_path / 'app' / 'db.py').write_text('from app.raw import connection\n', encoding='utf-8')
+    (tmp_path / 'app' / 'raw.py').write_text(
+        'from django.db.backends import utils\nimport django.db.backends\n', encoding='utf-8'
+    )
+    views_path = str(tmp_path / 'app' / 'views.py')
+    import_graph = build_import_graph([views_path], str(tmp_path))
+    add_project_packages(import_graph, str(tmp_path), dirs_to_exclude=[])
+
+    errors = get_transitive_import_errors(
+        import_graph, ['app.views'], DottedNameTrie(['django.db.backends'])
+    )
+
+    assert [error.format() for error in errors] == [
+        f'{views_path}:2 Forbidden import django.db.backends is reachable through app.db'
+    ]
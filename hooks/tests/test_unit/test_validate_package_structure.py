@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import pytest
+
+from hooks.utils.layer_contracts import parse_layer_contracts
+from hooks.utils.mypy_api_helpers import _load_pyproject_toml
 from hooks.validate_package_structure import (
     all_enums_in_enums_py_module,
     has_no_empty_py_files,
     has_no_submodules_with_blacklisted_suffixes,
     has_only_models_in_models_submodule,
+    imports_respect_layer_contracts,
+    main,
     no_url_calls,
     urls_py_has_urlpatterns,
     views_py_has_only_class_views,
@@ -27,9 +33,9 @@ def test__has_no_submodules_with_blacklisted_suffixes__detects_all_forbidden_fil
     errors = has_no_submodules_with_blacklisted_suffixes('module', module_path, module_files)
 
     assert len(errors) == 2
-    assert all('should be moved to utils subdirectory' in error for error in errors)
-    assert f'{module_path}/foo_utils.py' in errors[0]
-    assert f'{module_path}/nested/bar_helpers.py' in errors[1]
+    assert all('should be moved to utils subdirectory' in error.format() for error in errors)
+    assert f'{module_path}/foo_utils.py' in errors[0].format()
+    assert f'{module_path}/nested/bar_helpers.py' in errors[1].format()
 
 
 def test__has_only_models_in_models_submodule__reports_module_level_function(tmp_path):
@@ -41,8 +47,8 @@ def test__has_only_models_in_models_submodule__reports_module_level_function(tmp
     errors = has_only_models_in_models_submodule('orders', str(module_path), [str(models_file)])
 
     assert len(errors) == 1
-    assert 'Wrong instruction for models' in errors[0]
-    assert str(models_file) in errors[0]
+    assert 'Wrong instruction for models' in errors[0].format()
+    assert str(models_file) in errors[0].format()
 
 
 def test__has_only_models_in_models_submodule__allows_django_model_only(tmp_path):
@@ -71,8 +77,8 @@ def test__views_py_has_only_class_views__reports_function_view(tmp_path):
     errors = views_py_has_only_class_views('orders', str(module_path), [str(views_file)])
 
     assert len(errors) == 1
-    assert 'Only class views allowed in views.py' in errors[0]
-    assert str(views_file) in errors[0]
+    assert 'Only class views allowed in views.py' in errors[0].format()
+    assert str(views_file) in errors[0].format()
 
 
 def test__views_py_has_only_class_views__allows_class_based_view(tmp_path):
@@ -99,8 +105,8 @@ def test__all_enums_in_enums_py_module__reports_enum_outside_enums_py(tmp_path):
     errors = all_enums_in_enums_py_module('orders', str(module_path), [str(models_file)])
 
     assert len(errors) == 1
-    assert 'enums.py' in errors[0]
-    assert str(models_file) in errors[0]
+    assert 'enums.py' in errors[0].format()
+    assert str(models_file) in errors[0].format()
 
 
 def test__all_enums_in_enums_py_module__allows_enum_in_enums_py(tmp_path):
@@ -124,7 +130,7 @@ def test__has_no_empty_py_files__reports_whitespace_only_file(tmp_path):
 
     errors = has_no_empty_py_files('orders', str(module_path), [str(empty_file)])
 
-    assert errors == [f'{empty_file} empty files are not allowed']
+    assert [error.format() for error in errors] == [f'{empty_file} empty files are not allowed']
 
 
 def test__urls_py_has_urlpatterns__reports_missing_urlpatterns(tmp_path):
@@ -135,7 +141,9 @@ def test__urls_py_has_urlpatterns__reports_missing_urlpatterns(tmp_path):
 
     errors = urls_py_has_urlpatterns('orders', str(module_path), [str(urls_file)])
 
-    assert errors == [f'{urls_file} does not contain "urlpatterns" assignment']
+    assert [error.format() for error in errors] == [
+        f'{urls_file} does not contain "urlpatterns" assignment'
+    ]
 
 
 def test__no_url_calls__reports_deprecated_url_call(tmp_path):
@@ -149,5 +157,78 @@ def test__no_url_calls__reports_deprecated_url_call(tmp_path):
     errors = no_url_calls('orders', str(module_path), [str(urls_file)])
 
     assert len(errors) == 1
-    assert 'url() call is deprecated' in errors[0]
-    assert str(urls_file) in errors[0]
+    assert 'url() call is deprecated' in errors[0].format()
+    assert str(urls_file) in errors[0].format()
+
+
+def test__imports_respect_layer_contracts__reports_import_from_upper_layer(tmp_path):
+    module_path = tmp_path / 'orders'
+    (module_path / 'api').mkdir(parents=True)
+    api_file = module_path / 'api' / 'views.py'
+    api_file.write_text('from orders.services import create_order\n', encoding='utf-8')
+    services_file = module_path / 'services.py'
+    services_file.write_text(
+        'import json\n\nfrom orders.api.views import OrderView\nfrom .models import Order\n',
+        encoding='utf-8',
+    )
+    models_file = module_path / 'models.py'
+    models_file.write_text('from rest_framework.api import x\n', encoding='utf-8')
+    layer_contracts = parse_layer_contracts(['api', 'services', 'models'], [])
+
+    errors = imports_respect_layer_contracts(
+        'orders',
+        str(module_path),
+        [str(api_file), str(services_file), str(models_file)],
+        layer_contracts=layer_contracts,
+    )
+
+    assert [error.format() for error in errors] == [
+        f'{services_file}:3 Layer "services" must not import layer "api" (orders.api.views.OrderView)'
+    ]
+
+
+def test__imports_respect_layer_contracts__does_nothing_without_layers(tmp_path):
+    module_path = tmp_path / 'orders'
+    module_path.mkdir()
+    services_file = module_path / 'services.py'
+    services_file.write_text('from orders.api import views\n', encoding='utf-8')
+
+    errors = imports_respect_layer_contracts(
+        'orders',
+        str(module_path),
+        [str(services_file)],
+        layer_contracts=parse_layer_contracts([], []),
+    )
+
+    assert errors == []
+
+
+@pytest.fixture()
+def layered_project(tmp_path, monkeypatch):
+    _load_pyproject_toml.cache_clear()
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'orders' / 'api').mkdir(parents=True)
+    (tmp_path / 'orders' / 'api' / 'views.py').write_text(
+        'from orders.services import create_order\n', encoding='utf-8'
+    )
+    (tmp_path / 'orders' / 'services.py').write_text('import json\n', encoding='utf-8')
+    (tmp_path / 'orders' / 'empty.py').write_text('\n', encoding='utf-8')
+    yield tmp_path
+    _load_pyproject_toml.cache_clear()
+
+
+def test__main__fails_only_on_layer_contract_violations(layered_project, monkeypatch, capsys):
+    monkeypatch.setattr('sys.argv', ['validate_package_structure', 'orders'])
+    layered_project.joinpath('pyproject.toml').write_text(
+        '[tool.project_structure]\nlayers = ["api", "services"]\n', encoding='utf-8'
+    )
+
+    assert main() is None
+    assert 'empty.py' in capsys.readouterr().out
+
+    (layered_project / 'orders' / 'services.py').write_text(
+        'from orders.api.views import OrderView\n', encoding='utf-8'
+    )
+
+    assert main() == 1
+    assert 'Layer "services" must not import layer "api"' in capsys.readouterr().out
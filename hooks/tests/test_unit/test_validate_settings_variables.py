@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import ast
+
+import pytest
+
+from hooks.validate_settings_variables import (
+    GETENV_MATCHER,
+    GETENV_RULES,
+    AstRule,
+    Reasons,
+    build_settings_ast_index,
+    find_node_with_getenv_call,
+    get_line_numbers_of_wrong_assignments,
+    is_node_static,
+)
+
+
+def _check_rule(rule: AstRule, node: ast.AST) -> bool:
+    """Эталонная интерпретация AstRule для сверки со скомпилированными предикатами."""
+    if not isinstance(node, rule.ast_type):
+        return False
+    for name, value in rule.attrs.items():
+        child_node = getattr(node, name, None)
+        if isinstance(value, AstRule):
+            if child_node is None or not _check_rule(value, child_node):
+                return False
+        elif value != child_node:
+            return False
+    return True
+
+
+@pytest.mark.parametrize(
+    'expression',
+    [
+        "os.environ['foo']",
+        "getenv('foo', '')",
+        "os.getenv('foo', '')",
+        "os.environ.get('foo', '')",
+        "environ['foo']",
+        "sys.getenv('foo')",
+        "os.environ",
+        "values.Value('foo')",
+    ],
+)
+def test__getenv_matcher__agrees_with_check_rule(expression):
+    for node in ast.walk(ast.parse(expression)):
+        assert GETENV_MATCHER.matches(node) == any(_check_rule(rule, node) for rule in GETENV_RULES)
+
+
+def test__find_node_with_getenv_call__uses_first_getenv_in_walk_order():
+    assign = ast.parse("VAR = foo(bar(os.getenv('deep')), getenv('shallow'))").body[0]
+    settings_index = build_settings_ast_index(assign)
+
+    indexed_node = find_node_with_getenv_call(assign, assign, 0, settings_index)
+    walked_node = find_node_with_getenv_call(assign, assign, 0)
+
+    assert indexed_node is walked_node
+    assert indexed_node.args[0].value == 'shallow'
+
+
+def test__build_settings_ast_index__marks_static_nodes_in_single_pass():
+    ast_tree = ast.parse(
+        "STATIC = ['a', ('b', 1), {'c': [1, 2]}]\n"
+        "DYNAMIC = ['a', os.getenv('b')]\n"
+        "NESTED = {'a': {'b': 'c'}, 'd': foo()}\n"
+    )
+
+    settings_index = build_settings_ast_index(ast_tree)
+
+    static_containers = [
+        node for node in ast.walk(ast_tree) if isinstance(node, (ast.List, ast.Tuple, ast.Dict))
+    ]
+    assert [settings_index.is_static(node) for node in static_containers] == [
+        is_node_static(node) for node in static_containers
+    ]
+    assert [settings_index.is_static(node) for node in static_containers] == [
+        True,
+        False,
+        False,
+        True,
+        True,
+        True,
+        True,
+    ]
+
+
+def test__get_line_numbers_of_wrong_assignments__handles_huge_settings_dict():
+    entries_count = 5000
+    entries = [
+        f"    'KEY_{idx}': os.getenv('KEY_{idx}')," if idx % 2 else f"    'KEY_{idx}': 'value',"
+        for idx in range(entries_count)
+    ]
+    ast_tree = ast.parse('\n'.join(['SETTINGS = {', *entries, '}']))
+
+    errors = get_line_numbers_of_wrong_assignments(ast_tree, None, ast_tree)
+
+    assert len(errors) == entries_count
+    assert [error.reason for error in errors[:2]] == [Reasons.STRAIGHT_ASSIGNMENT, Reasons.GETENV]
@@ -3,11 +3,30 @@ from __future__ import annotations
 import ast
 import itertools
 import os
-from typing import Any, Callable, Iterable, Iterator, List, Optional, Set, Tuple, Type, Union
+from typing import (
+    AbstractSet,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
 from hooks.utils.common_types import AssignOrAnnAssign
 from hooks.utils.list_utils import flat
 from hooks.utils.mypy_api_helpers import is_path_should_be_skipped
+from hooks.utils.source_file import (
+    SourceFile,
+    call_with_parse_guard,
+    iterate_prefetched_source_files,
+    read_source_file_for_parsing,
+)
 
 AnyFuncdef = Union[ast.FunctionDef, ast.AsyncFunctionDef]
 
@@ -63,13 +82,35 @@ def iterate_files_in(path: str, dirs_to_exclude: List[str], file_extension: str)
 
 
 def get_ast_tree_with_content(pyfilepath: str) -> Tuple[Optional[ast.Module], Optional[str]]:
-    with open(pyfilepath, 'r') as file_handler:
-        try:
-            file_content = file_handler.read()
-        except UnicodeDecodeError:
-            return None, None
-    ast_tree = ast.parse(file_content)
-    return ast_tree, file_content
+    return parse_source_file(pyfilepath, read_source_file_for_parsing(pyfilepath))
+
+
+def parse_source_file(
+    pyfilepath: str, source_file: Optional[SourceFile]
+) -> Tuple[Optional[ast.Module], Optional[str]]:
+    if source_file is None:
+        return None, None
+    ast_tree = call_with_parse_guard(pyfilepath, lambda: parse_ast_tree(source_file.text))
+    if ast_tree is None:
+        return None, None
+    return ast_tree, source_file.text
+
+
+def iterate_ast_trees_with_content(
+    pyfilepaths: Iterable[str], read_ahead: Optional[int] = None
+) -> Iterator[Tuple[str, ast.Module, str]]:
+    """Разобранные файлы по порядку; чтение следующих идет заранее, пока разбираются текущие."""
+    for pyfilepath, source_file in iterate_prefetched_source_files(pyfilepaths, read_ahead):
+        ast_tree, file_content = parse_source_file(pyfilepath, source_file)
+        if ast_tree is not None and file_content is not None:
+            yield pyfilepath, ast_tree, file_content
+
+
+def parse_ast_tree(file_content: str) -> ast.Module:
+    try:
+        return ast.parse(file_content)
+    except ValueError as exc:  # null-байты в исходнике до python 3.12
+        raise SyntaxError(str(exc)) from exc
 
 
 def get_ast_tree(pyfilepath: str) -> Optional[ast.Module]:
@@ -132,6 +173,38 @@ def extract_all_variable_names(ast_tree: ast.AST) -> List[Tuple[str, ast.AST]]:
     return var_info
 
 
+def _get_node_variable_names(node: ast.AST) -> List[Tuple[str, ast.AST]]:
+    if isinstance(node, (ast.Assign, ast.AnnAssign)):
+        return get_var_names_from_assignment(node)
+    if isinstance(node, ast.FunctionDef):
+        return list(get_var_names_from_funcdef(node))
+    if isinstance(node, ast.For):
+        return get_var_names_from_for(node)
+    return []
+
+
+def _collect_funcdefs_variable_names(
+    node: ast.AST,
+    var_info: List[Tuple[str, ast.AST]],
+    funcdefs_var_info: Dict[AnyFuncdef, List[Tuple[str, ast.AST]]],
+) -> None:
+    funcdef_var_info_start = len(var_info)
+    var_info += _get_node_variable_names(node)
+    for child_node in ast.iter_child_nodes(node):
+        _collect_funcdefs_variable_names(child_node, var_info, funcdefs_var_info)
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        funcdefs_var_info[node] = var_info[funcdef_var_info_start:]
+
+
+def extract_variable_names_by_funcdef(
+    ast_tree: ast.AST,
+) -> Dict[AnyFuncdef, List[Tuple[str, ast.AST]]]:
+    """То же, что extract_all_variable_names для каждой функции, но за один обход дерева."""
+    funcdefs_var_info: Dict[AnyFuncdef, List[Tuple[str, ast.AST]]] = {}
+    _collect_funcdefs_variable_names(ast_tree, [], funcdefs_var_info)
+    return funcdefs_var_info
+
+
 def iterate_over_expressions(node: ast.AST) -> Iterable[ast.AST]:
     nodes_with_subnodes = (
         ast.AsyncFunctionDef,
@@ -234,7 +307,7 @@ def has_import_of_function_from_package(
 
 
 def _is_classdef_has_base_classes(
-    classdef_node: ast.ClassDef, base_classess: Set[str], module_name: Optional[str]
+    classdef_node: ast.ClassDef, base_classess: AbstractSet[str], module_name: Optional[str]
 ) -> bool:
     if not classdef_node.bases:
         return False
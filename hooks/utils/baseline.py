@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import argparse
+import array
+import bisect
+import hashlib
+import mmap
+import os
+import sys
+from functools import lru_cache
+from typing import Final, Iterable, Iterator, Optional, Sequence, Tuple
+
+from hooks.utils.diagnostics import Diagnostic, report_diagnostics
+from hooks.utils.source_file import read_source_file
+
+BASELINE_MAGIC = b'PCHBL001'
+FINGERPRINT_TYPECODE: Final = 'Q'
+SOURCE_LINES_CACHE_SIZE = 256
+PROJECT_ROOT_MARKERS = ('pyproject.toml', 'setup.cfg', 'setup.py', '.git')
+
+
+@lru_cache(maxsize=SOURCE_LINES_CACHE_SIZE)
+def _get_source_lines(path: str) -> Tuple[str, ...]:
+    try:
+        source_file = read_source_file(path)
+    except OSError:
+        return ()
+    return () if source_file is None else tuple(source_file.text.split('\n'))
+
+
+@lru_cache(maxsize=None)
+def get_project_root(start_dir: str) -> str:
+    """Ближайший вверх от `start_dir` каталог с pyproject.toml, setup.cfg, setup.py или .git."""
+    current_dir = os.path.abspath(start_dir)
+    while True:
+        if any(
+            os.path.exists(os.path.join(current_dir, marker)) for marker in PROJECT_ROOT_MARKERS
+        ):
+            return current_dir
+        parent_dir = os.path.dirname(current_dir)
+        if parent_dir == current_dir:
+            return os.path.abspath(start_dir)
+        current_dir = parent_dir
+
+
+def get_normalized_snippet(path: str, line: int) -> str:
+    source_lines = _get_source_lines(path)
+    if not 0 < line <= len(source_lines):
+        return ''
+    return ' '.join(source_lines[line - 1].split())
+
+
+def get_fingerprint(diagnostic: Diagnostic, base_dir: Optional[str] = None) -> int:
+    """
+    Отпечаток находки: правило, путь от корня проекта и нормализованная строка исходника.
+
+    Корень по умолчанию ищется вверх от текущего каталога, так что запуск из подкаталога
+    даёт те же отпечатки. Номер строки в отпечаток не входит: сдвиги кода выше находки
+    его не меняют.
+    """
+    if base_dir is None:
+        base_dir = get_project_root(os.getcwd())
+    fingerprint_parts = (
+        diagnostic.rule,
+        os.path.relpath(os.path.abspath(diagnostic.path), base_dir).replace(os.sep, '/'),
+        get_normalized_snippet(diagnostic.path, diagnostic.line),
+        *(str(getattr(diagnostic, field)) for field in diagnostic.fingerprint_fields),
+    )
+    digest = hashlib.blake2b('\0'.join(fingerprint_parts).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+class Baseline:
+    """
+    Известные находки: отсортированный массив uint64-отпечатков.
+
+    Файл - заголовок BASELINE_MAGIC и little-endian uint64 подряд; читается через mmap
+    без разбора, поиск - двоичный, так что и 200k отпечатков не тормозят запуск.
+    """
+
+    def __init__(self, fingerprints: Sequence[int]) -> None:
+        self.fingerprints = fingerprints
+
+    def __len__(self) -> int:
+        return len(self.fingerprints)
+
+    def __contains__(self, fingerprint: int) -> bool:
+        index = bisect.bisect_left(self.fingerprints, fingerprint)
+        return index < len(self.fingerprints) and self.fingerprints[index] == fingerprint
+
+    def is_known(self, diagnostic: Diagnostic) -> bool:
+        return get_fingerprint(diagnostic) in self
+
+    def iterate_new(self, diagnostics: Iterable[Diagnostic]) -> Iterator[Diagnostic]:
+        for diagnostic in diagnostics:
+            if not self.is_known(diagnostic):
+                yield diagnostic
+
+    @classmethod
+    def load(cls, path: str) -> Baseline:
+        if not os.path.isfile(path):
+            return cls(())
+        header_size = len(BASELINE_MAGIC)
+        with open(path, 'rb') as baseline_file:
+            file_size = os.fstat(baseline_file.fileno()).st_size
+            if file_size <= header_size:
+                return cls(())
+            if (file_size - header_size) % array.array(FINGERPRINT_TYPECODE).itemsize:
+                raise ValueError(f'{path} is truncated: rebuild it with --update-baseline')
+            mapped_file = mmap.mmap(baseline_file.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapped_file[:header_size] != BASELINE_MAGIC:
+            raise ValueError(f'{path} is not a baseline file')
+        fingerprints_view = memoryview(mapped_file)[header_size:]
+        if sys.byteorder == 'little':
+            return cls(fingerprints_view.cast(FINGERPRINT_TYPECODE))
+        fingerprints = array.array(FINGERPRINT_TYPECODE, fingerprints_view)
+        fingerprints.byteswap()
+        return cls(fingerprints)
+
+
+def write_baseline(path: str, diagnostics: Iterable[Diagnostic]) -> int:
+    fingerprints = array.array(
+        FINGERPRINT_TYPECODE, sorted({get_fingerprint(diagnostic) for diagnostic in diagnostics})
+    )
+    if sys.byteorder != 'little':
+        fingerprints.byteswap()
+    with open(path, 'wb') as baseline_file:
+        baseline_file.write(BASELINE_MAGIC)
+        baseline_file.write(fingerprints.tobytes())
+    return len(fingerprints)
+
+
+def add_baseline_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        '--baseline', metavar='FILE', help='Report only findings missing from the baseline file'
+    )
+    parser.add_argument(
+        '--update-baseline',
+        action='store_true',
+        help='Record all current findings to the --baseline file instead of reporting them',
+    )
+
+
+def validate_baseline_arguments(
+    parser: argparse.ArgumentParser, known_args: argparse.Namespace
+) -> None:
+    if known_args.update_baseline and known_args.baseline is None:
+        parser.error('--update-baseline requires --baseline')
+
+
+def report_new_diagnostics(
+    diagnostics: Iterable[Diagnostic],
+    baseline_path: Optional[str] = None,
+    update_baseline: bool = False,
+) -> int:
+    """Печатает находки, которых нет в baseline; с `update_baseline` перезаписывает его."""
+    if baseline_path is None:
+        return report_diagnostics(diagnostics)
+    if update_baseline:
+        fingerprints_count = write_baseline(baseline_path, diagnostics)
+        print(  # noqa: T001
+            f'{baseline_path}: {fingerprints_count} baseline fingerprints written', file=sys.stderr
+        )
+        return 0
+    return report_diagnostics(Baseline.load(baseline_path).iterate_new(diagnostics))
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import ast
+import os
+from typing import Collection, Dict, FrozenSet, NamedTuple, Optional, Set, Tuple
+
+from hooks.utils.ast_helpers import parse_ast_tree
+from hooks.utils.disk_cache import get_content_digest, get_disk_cache
+from hooks.utils.pre_commit import get_module_name_from_path
+from hooks.utils.source_file import call_with_parse_guard, read_source_file_for_parsing
+
+MAX_REEXPORT_DEPTH = 10
+CLASS_HIERARCHY_CACHE_SCHEMA_VERSION = 1
+
+
+class ClassDefinition(NamedTuple):
+    name: str
+    lineno: int
+    # базы как они записаны в файле: `BaseView`, `views.GenericAPIView`
+    bases: Tuple[str, ...]
+
+
+class ModuleSymbols(NamedTuple):
+    classes: Tuple[ClassDefinition, ...]
+    # локальное имя -> импортированное имя и уровень относительного импорта
+    imports: Tuple[Tuple[str, str, int], ...]
+
+
+def get_dotted_name(node: ast.expr) -> Optional[str]:
+    if isinstance(node, ast.Subscript):  # Generic[T], ListAPIView[Model]
+        node = node.value
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        value_name = get_dotted_name(node.value)
+        return None if value_name is None else f'{value_name}.{node.attr}'
+    return None
+
+
+def extract_module_symbols(ast_tree: ast.Module) -> ModuleSymbols:
+    classes = []
+    imports = []
+    for node in ast_tree.body:
+        if isinstance(node, ast.ClassDef):
+            bases = (get_dotted_name(base) for base in node.bases)
+            classes.append(
+                ClassDefinition(node.name, node.lineno, tuple(base for base in bases if base))
+            )
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname:
+                    imports.append((alias.asname, alias.name, 0))
+                else:
+                    root_name = alias.name.split('.')[0]
+                    imports.append((root_name, root_name, 0))
+        elif isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                if alias.name == '*':
+                    continue
+                imported_name = f'{node.module}.{alias.name}' if node.module else alias.name
+                imports.append((alias.asname or alias.name, imported_name, node.level))
+    return ModuleSymbols(tuple(classes), tuple(imports))
+
+
+def get_module_symbols(pyfilepath: str) -> Optional[ModuleSymbols]:
+    source_file = read_source_file_for_parsing(pyfilepath)
+    if source_file is None:
+        return None
+    symbols_cache = get_disk_cache('class_hierarchy', CLASS_HIERARCHY_CACHE_SCHEMA_VERSION)
+    cache_key = get_content_digest(source_file.content)
+    if symbols_cache is not None:
+        cached_symbols = symbols_cache.load(cache_key)
+        if isinstance(cached_symbols, ModuleSymbols):
+            return cached_symbols
+
+    ast_tree = call_with_parse_guard(pyfilepath, lambda: parse_ast_tree(source_file.text))
+    if ast_tree is None:
+        return None
+    module_symbols = extract_module_symbols(ast_tree)
+    if symbols_cache is not None:
+        symbols_cache.store(cache_key, module_symbols)
+    return module_symbols
+
+
+class _Module(NamedTuple):
+    classes: Dict[str, ClassDefinition]
+    # локальное имя -> абсолютное импортированное имя
+    aliases: Dict[str, str]
+
+
+def _get_absolute_name(module_name: str, is_package: bool, imported_name: str, level: int) -> str:
+    if not level:
+        return imported_name
+    package_parts = module_name.split('.')
+    if not is_package:
+        package_parts.pop()
+    package_parts = package_parts[: max(len(package_parts) - level + 1, 0)]
+    return '.'.join([*package_parts, imported_name])
+
+
+class ClassHierarchy:
+    """
+    Иерархия классов проекта с разрешением баз через импорты других модулей.
+
+    Модули проекта подгружаются лениво, когда до них доходит разрешение базового класса,
+    а их классы и импорты кешируются на диске по дайджесту содержимого.
+    """
+
+    def __init__(self, base_dir: str | None = None) -> None:
+        self.base_dir = base_dir or os.getcwd()
+        self._modules: Dict[str, Optional[_Module]] = {}
+        self._ancestors: Dict[str, FrozenSet[str]] = {}
+
+    def add_file(self, pyfilepath: str) -> str:
+        module_name = get_module_name_from_path(pyfilepath, self.base_dir)
+        if module_name not in self._modules:
+            self._modules[module_name] = self._load_module(module_name, pyfilepath)
+        return module_name
+
+    def get_qualified_name(self, pyfilepath: str, class_name: str) -> str:
+        return f'{self.add_file(pyfilepath)}.{class_name}'
+
+    def _find_module_file(self, module_name: str) -> Optional[str]:
+        module_path = os.path.join(self.base_dir, *module_name.split('.'))
+        for candidate in (f'{module_path}.py', os.path.join(module_path, '__init__.py')):
+            if os.path.isfile(candidate):
+                return candidate
+        return None
+
+    def _load_module(self, module_name: str, pyfilepath: str) -> Optional[_Module]:
+        module_symbols = get_module_symbols(pyfilepath)
+        if module_symbols is None:
+            return None
+        is_package = os.path.basename(pyfilepath) == '__init__.py'
+        return _Module(
+            classes={class_def.name: class_def for class_def in module_symbols.classes},
+            aliases={
+                local_name: _get_absolute_name(module_name, is_package, imported_name, level)
+                for local_name, imported_name, level in module_symbols.imports
+            },
+        )
+
+    def get_module(self, module_name: str) -> Optional[_Module]:
+        if module_name not in self._modules:
+            module_file = self._find_module_file(module_name) if module_name else None
+            self._modules[module_name] = (
+                None if module_file is None else self._load_module(module_name, module_file)
+            )
+        return self._modules[module_name]
+
+    def resolve_name(self, module_name: str, dotted_name: str, depth: int = 0) -> str:
+        """Абсолютное имя для имени из модуля; реэкспорты из `__init__.py` прослеживаются."""
+        module = self.get_module(module_name)
+        head, _, tail = dotted_name.partition('.')
+        if module is not None and head in module.aliases:
+            resolved_name = module.aliases[head] + (f'.{tail}' if tail else '')
+        elif module is not None and head in module.classes:
+            return f'{module_name}.{dotted_name}'
+        else:
+            return dotted_name
+
+        if depth < MAX_REEXPORT_DEPTH and '.' in resolved_name:
+            owner_module_name, name = resolved_name.rsplit('.', 1)
+            owner_module = self.get_module(owner_module_name)
+            if owner_module is not None and name in owner_module.aliases:
+                return self.resolve_name(owner_module_name, name, depth + 1)
+        return resolved_name
+
+    def get_ancestors(self, qualified_name: str) -> FrozenSet[str]:
+        """Абсолютные имена всех баз класса, включая непрямые; циклы не зацикливают."""
+        if qualified_name in self._ancestors:
+            return self._ancestors[qualified_name]
+        self._ancestors[qualified_name] = frozenset()
+        module_name, _, class_name = qualified_name.rpartition('.')
+        module = self.get_module(module_name)
+        if module is not None and class_name in module.aliases:
+            resolved_name = self.resolve_name(module_name, class_name)
+            self._ancestors[qualified_name] = self.get_ancestors(resolved_name) | {resolved_name}
+            return self._ancestors[qualified_name]
+        class_def = module.classes.get(class_name) if module is not None else None
+        ancestors: Set[str] = set()
+        if class_def is not None:
+            for base in class_def.bases:
+                base_name = self.resolve_name(module_name, base)
+                ancestors.add(base_name)
+                ancestors.update(self.get_ancestors(base_name))
+        self._ancestors[qualified_name] = frozenset(ancestors)
+        return self._ancestors[qualified_name]
+
+    def is_subclass_of(self, qualified_name: str, base_class_names: Collection[str]) -> bool:
+        return any(
+            ancestor.rsplit('.', 1)[-1] in base_class_names
+            for ancestor in self.get_ancestors(qualified_name)
+        )
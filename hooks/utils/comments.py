@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import ast
+import io
+import tokenize
+from typing import Dict, List, Optional, Tuple
+
+
+class CommentIndex:
+    """
+    Комментарии файла по строкам, привязанные к узлам ast по их координатам.
+
+    Так stdlib-парсер видит те же комментарии, что libcst держит в whitespace-узлах:
+    ведущий (сразу после открывающей скобки вызова) и завершающий (в конце последней строки узла).
+    Колонки в байтах UTF-8, как col_offset в ast.
+    """
+
+    def __init__(self, comments_by_line: Dict[int, List[Tuple[int, str]]]) -> None:
+        self.comments_by_line = comments_by_line
+
+    def get_comment_after(self, lineno: int, col_offset: int) -> Optional[str]:
+        for comment_col, comment in self.comments_by_line.get(lineno, []):
+            if comment_col >= col_offset:
+                return comment
+        return None
+
+    def get_leading_comment(self, call: ast.Call) -> Optional[str]:
+        """`foo = Field(  # comment` при условии, что аргументы начинаются со следующей строки."""
+        paren_lineno = call.func.end_lineno
+        if paren_lineno is None or call.func.end_col_offset is None:
+            return None
+        if call.end_lineno == paren_lineno:
+            return None
+        if any(arg.lineno <= paren_lineno for arg in call.args) or any(
+            keyword.lineno <= paren_lineno for keyword in call.keywords
+        ):
+            return None
+        return self.get_comment_after(paren_lineno, call.func.end_col_offset)
+
+    def get_trailing_comment(self, node: ast.stmt) -> Optional[str]:
+        if node.end_lineno is None or node.end_col_offset is None:
+            return None
+        return self.get_comment_after(node.end_lineno, node.end_col_offset)
+
+
+def get_byte_offset(line: str, col: int) -> int:
+    """Колонка tokenize в символах -> смещение в байтах UTF-8, как считает ast."""
+    if line.isascii():
+        return col
+    return len(line[:col].encode('utf-8', 'surrogatepass'))
+
+
+def build_comment_index(file_content: str) -> CommentIndex:
+    comments_by_line: Dict[int, List[Tuple[int, str]]] = {}
+    if '#' not in file_content:
+        return CommentIndex(comments_by_line)
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(file_content).readline):
+            if token.type == tokenize.COMMENT:
+                line, col = token.start
+                comments_by_line.setdefault(line, []).append(
+                    (get_byte_offset(token.line, col), token.string.strip())
+                )
+    except (tokenize.TokenError, SyntaxError):
+        pass
+    return CommentIndex(comments_by_line)
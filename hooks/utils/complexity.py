@@ -1,11 +1,102 @@
 from __future__ import annotations
 
 import ast
+from typing import Any, Dict, List, NamedTuple
 
 import mccabe
 
+from hooks.utils.ast_helpers import AnyFuncdef
+
+
+class FunctionComplexity(NamedTuple):
+    complexity: int
+    branches: int
+
 
 def get_node_mccabe_complexity(ast_node: ast.AST) -> int:
     visitor = mccabe.PathGraphingAstVisitor()
     visitor.preorder(ast_node, visitor)
     return list(visitor.graphs.values())[0].complexity()
+
+
+class _PathGraphsFanout:
+    """Пишет ребра сразу во все графы вложенных друг в друга функций."""
+
+    def __init__(self, graphs: List[Any]) -> None:
+        self.graphs = graphs
+
+    def connect(self, n1: Any, n2: Any) -> None:
+        for graph in self.graphs:
+            graph.connect(n1, n2)
+
+
+class FileComplexityVisitor(mccabe.PathGraphingAstVisitor):
+    """
+    Строит графы mccabe для всех функций файла за один обход.
+
+    Вложенная функция получает собственный граф и одновременно,
+    как и в mccabe, остается замыканием в графе внешней функции.
+    """
+
+    graph: Any
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.functions_graphs: Dict[AnyFuncdef, Any] = {}
+        self.functions_branches: Dict[AnyFuncdef, int] = {}
+        self._functions_stack: List[AnyFuncdef] = []
+
+    def visitFunctionDef(self, node: AnyFuncdef) -> None:  # noqa: N802
+        entity = f'{self.classname}{node.name}'
+        name = '%d:%d: %r' % (node.lineno, node.col_offset, entity)
+        function_graph = mccabe.PathGraph(name, entity, node.lineno, node.col_offset)
+        self.functions_graphs[node] = function_graph
+        self.functions_branches[node] = 0
+
+        outer_graph = self.graph
+        pathnode = None
+        if outer_graph is not None:
+            pathnode = self.appendPathNode(name)
+        if pathnode is None:
+            pathnode = mccabe.PathNode(name)
+        outer_graphs = [] if outer_graph is None else _get_fanout_graphs(outer_graph)
+
+        self.graph = _PathGraphsFanout([*outer_graphs, function_graph])
+        self._functions_stack.append(node)
+        self.tail = pathnode
+        self.dispatch_list(node.body)
+        self._functions_stack.pop()
+        self.graph = outer_graph
+
+        if outer_graph is None:
+            self.reset()
+            return
+        bottom = mccabe.PathNode('', look='point')
+        outer_graph.connect(self.tail, bottom)
+        outer_graph.connect(pathnode, bottom)
+        self.tail = bottom
+
+    visitAsyncFunctionDef = visitFunctionDef  # noqa: N815
+
+    def _subgraph(self, node: ast.AST, name: str, extra_blocks: Any = ()) -> None:
+        for function_node in self._functions_stack:
+            self.functions_branches[function_node] += 1
+        super()._subgraph(node, name, extra_blocks)
+
+    def get_functions_complexity(self) -> Dict[AnyFuncdef, FunctionComplexity]:
+        return {
+            node: FunctionComplexity(graph.complexity(), self.functions_branches[node])
+            for node, graph in self.functions_graphs.items()
+        }
+
+
+def _get_fanout_graphs(graph: Any) -> List[Any]:
+    if isinstance(graph, _PathGraphsFanout):
+        return graph.graphs
+    return [graph]
+
+
+def get_functions_complexity(ast_tree: ast.AST) -> Dict[AnyFuncdef, FunctionComplexity]:
+    visitor = FileComplexityVisitor()
+    visitor.preorder(ast_tree, visitor)
+    return visitor.get_functions_complexity()
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import copy
+import sys
+from typing import IO, Any, ClassVar, Iterable, Optional, Tuple, TypeVar
+
+D = TypeVar('D', bound='Diagnostic')
+
+
+class Diagnostic:
+    """
+    Находка хука: путь, строка и колонка плюс поля конкретного правила.
+
+    Хуки объявляют тонких наследников: id правила, шаблон сообщения и свои поля в `__slots__`.
+    Текст собирается только при выводе, путь и id правила интернируются: на сотнях тысяч
+    находок это экономит и память, и форматирование. Строка 0 - находка на весь файл.
+    """
+
+    __slots__ = ('path', 'line', 'col')
+
+    rule_id: ClassVar[str] = ''
+    # поля наследника по порядку, в шаблоне доступны как {0}, {1}...
+    fields: ClassVar[Tuple[str, ...]] = ()
+    message_template: ClassVar[str] = '{path}:{line}'
+    # поля, отличающие находку в baseline помимо правила, пути и строки исходника
+    fingerprint_fields: ClassVar[Tuple[str, ...]] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.rule_id = sys.intern(cls.rule_id)
+
+    def __init__(self, path: str, line: int, col: Optional[int] = None) -> None:
+        self.path = sys.intern(path)
+        self.line = line
+        self.col = col
+
+    @property
+    def rule(self) -> str:
+        return self.rule_id
+
+    @property
+    def args(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, field) for field in self.fields)
+
+    def format(self) -> str:
+        return self.message_template.format(
+            *self.args, path=self.path, line=self.line, col=self.col
+        )
+
+    def with_path(self: D, path: str) -> D:
+        diagnostic = copy.copy(self)
+        diagnostic.path = sys.intern(path)
+        return diagnostic
+
+    def _key(self) -> Tuple[Any, ...]:
+        return (self.path, self.line, self.col, self.args)
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash((type(self), self._key()))
+
+    def __lt__(self, other: Diagnostic) -> bool:
+        return (self.path, self.line, self.col or 0) < (other.path, other.line, other.col or 0)
+
+    def __repr__(self) -> str:
+        fields = ''.join(f', {field}={getattr(self, field)!r}' for field in self.fields)
+        return (
+            f'{type(self).__name__}(path={self.path!r}, line={self.line!r}, col={self.col!r}'
+            f'{fields})'
+        )
+
+    __str__ = format
+
+
+def report_diagnostics(diagnostics: Iterable[Diagnostic], stream: Optional[IO[str]] = None) -> int:
+    """Форматирует и печатает находки по мере вывода; возвращает их количество."""
+    if stream is None:
+        stream = sys.stdout
+    count = 0
+    for diagnostic in diagnostics:
+        stream.write(f'{diagnostic.format()}\n')
+        count += 1
+    return count
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import importlib.metadata
+import mmap
+import os
+import pickle
+import sys
+import tempfile
+import time
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
+
+from hooks.utils.mypy_api_helpers import get_param_from_configs
+
+CACHE_CONFIG_SECTION = 'pre_commit_hooks'
+DEFAULT_CACHE_MAX_SIZE_MB = 256
+# after eviction the cache shrinks below the cap, so that eviction doesn't run on every store
+_EVICTION_TARGET_RATIO = 0.8
+_ENTRY_SUFFIX = '.pickle'
+_TEMP_SUFFIX = '.tmp'
+# temp files of stores killed by a timeout or a terminated worker are removed after this age
+_STALE_TEMP_SECONDS = 3600
+_PACKAGE_NAME = 'pre-commit-hooks'
+
+
+def get_content_digest(content: bytes) -> str:
+    return hashlib.blake2b(content, digest_size=20).hexdigest()
+
+
+def get_python_version_tag() -> str:
+    return f'py{sys.version_info.major}{sys.version_info.minor}'
+
+
+@lru_cache(maxsize=None)
+def get_package_version() -> str:
+    try:
+        return importlib.metadata.version(_PACKAGE_NAME)
+    except importlib.metadata.PackageNotFoundError:
+        return 'dev'
+
+
+def get_cache_version_tag(schema_version: int = 1) -> str:
+    """Python version, package version and namespace schema version."""
+    return f'{get_python_version_tag()}-{get_package_version()}-s{schema_version}'
+
+
+def _write_entry(entry_path: str, payload: bytes) -> bool:
+    """Writes atomically via a temp file, which is removed whatever interrupts the write."""
+    try:
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(
+            suffix=_TEMP_SUFFIX, dir=os.path.dirname(entry_path)
+        )
+    except OSError:
+        return False
+    try:
+        with os.fdopen(file_descriptor, 'wb') as temp_file:
+            temp_file.write(payload)
+        os.replace(temp_path, entry_path)
+    except BaseException as exc:  # the parse timeout alarm may fire mid-store too
+        with contextlib.suppress(OSError):
+            os.remove(temp_path)
+        if isinstance(exc, OSError):
+            return False
+        raise
+    return True
+
+
+class DiskCache:
+    """
+    Content-addressed pickle storage with LRU eviction by file mtime.
+
+    Namespaces store small derived NamedTuple indexes, not ASTs: unpickling an ast.Module
+    costs about as much as parsing the source again. Each namespace passes its own
+    schema version; bump it whenever any NamedTuple it pickles changes shape, so entries
+    written by older code are never loaded.
+    """
+
+    def __init__(
+        self, cache_dir: str, namespace: str, max_size_bytes: int, schema_version: int = 1
+    ) -> None:
+        self.path = os.path.join(cache_dir, namespace, get_cache_version_tag(schema_version))
+        self.max_size_bytes = max_size_bytes
+        self._size_bytes: Optional[int] = None
+
+    def _get_entry_path(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], f'{key}{_ENTRY_SUFFIX}')
+
+    def load(self, key: str) -> Any | None:
+        entry_path = self._get_entry_path(key)
+        try:
+            with open(entry_path, 'rb') as entry_file:
+                with mmap.mmap(entry_file.fileno(), 0, access=mmap.ACCESS_READ) as entry_map:
+                    value = pickle.loads(entry_map)
+            os.utime(entry_path)
+        except Exception:  # broken or foreign entry is just a cache miss
+            return None
+        return value
+
+    def store(self, key: str, value: Any) -> None:
+        entry_path = self._get_entry_path(key)
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        size_bytes = self._get_size_bytes()
+        try:
+            replaced_size_bytes = os.stat(entry_path).st_size
+        except OSError:
+            replaced_size_bytes = 0
+        if not _write_entry(entry_path, payload):
+            return
+        self._size_bytes = size_bytes - replaced_size_bytes + len(payload)
+        if self._size_bytes > self.max_size_bytes:
+            self.evict()
+
+    def _iterate_entries(self) -> List[Tuple[float, int, str]]:
+        entries = []
+        stale_before = time.time() - _STALE_TEMP_SECONDS
+        for root, _, files in os.walk(self.path):
+            for filename in files:
+                entry_path = os.path.join(root, filename)
+                try:
+                    entry_stat = os.stat(entry_path)
+                except OSError:
+                    continue
+                if filename.endswith(_ENTRY_SUFFIX):
+                    entries.append((entry_stat.st_mtime, entry_stat.st_size, entry_path))
+                elif filename.endswith(_TEMP_SUFFIX) and entry_stat.st_mtime < stale_before:
+                    with contextlib.suppress(OSError):
+                        os.remove(entry_path)
+        return entries
+
+    def _get_size_bytes(self) -> int:
+        if self._size_bytes is None:
+            self._size_bytes = sum(size for _, size, _ in self._iterate_entries())
+        return self._size_bytes
+
+    def evict(self) -> None:
+        entries = sorted(self._iterate_entries())
+        size_bytes = sum(size for _, size, _ in entries)
+        target_size_bytes = self.max_size_bytes * _EVICTION_TARGET_RATIO
+        for _, entry_size, entry_path in entries:
+            if size_bytes <= target_size_bytes:
+                break
+            try:
+                os.remove(entry_path)
+            except OSError:
+                continue
+            size_bytes -= entry_size
+        self._size_bytes = size_bytes
+
+
+@lru_cache(maxsize=None)
+def get_disk_cache(namespace: str, schema_version: int = 1) -> Optional[DiskCache]:
+    cache_dir = get_param_from_configs(CACHE_CONFIG_SECTION, 'cache-dir')
+    if not cache_dir:
+        return None
+    max_size_mb = int(
+        get_param_from_configs(CACHE_CONFIG_SECTION, 'cache-max-size-mb')
+        or DEFAULT_CACHE_MAX_SIZE_MB
+    )
+    return DiskCache(
+        os.path.abspath(cache_dir), namespace, max_size_mb * 1024 * 1024, schema_version
+    )
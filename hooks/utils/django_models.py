@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import ast
+import itertools
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Type
+
+from hooks.utils.ast_helpers import (
+    get_check_decorators_includes,
+    get_not_ok_base_nodes_from,
+    is_django_model_definition,
+    logger_ast_nodes_conditional,
+    parse_ast_tree,
+)
+from hooks.utils.comments import CommentIndex, build_comment_index
+from hooks.utils.disk_cache import get_content_digest, get_disk_cache
+from hooks.utils.source_file import call_with_parse_guard, read_source_file_for_parsing
+
+MODELS_MODULE_ALLOWED_NODES = {ast.Import, ast.ImportFrom, ast.If}
+DJANGO_MODELS_CACHE_SCHEMA_VERSION = 4
+LINE_BREAK_REGEX = re.compile(r'\r\n?|\n')
+MODELS_MODULE_CONDITIONAL_NODES: List[Tuple[Type, Callable[[Any], Any]]] = [
+    *logger_ast_nodes_conditional('logger'),
+    (ast.ClassDef, is_django_model_definition),  # определения моделей
+    (  # пропуск определений классов по декоратору
+        ast.ClassDef,
+        get_check_decorators_includes({'pass_check_is_django_model_definition'}),
+    ),
+    (  # определения депрекейтед функций
+        ast.FunctionDef,
+        get_check_decorators_includes({'deprecated'}),
+    ),
+]
+
+
+class ModelField(NamedTuple):
+    name: str
+    field_type: Optional[str]
+    lineno: int
+    col_offset: int
+    kwargs: Tuple[Tuple[str, str], ...]
+    # комментарий сразу после открывающей скобки вызова: `foo = Field(  # comment`
+    leading_comment: Optional[str]
+    # комментарий в конце последней строки присваивания: `)  # comment`
+    trailing_comment: Optional[str]
+    is_annotated: bool
+    # присваивание прямо в теле класса, а не в методе или под if
+    is_class_attribute: bool
+    # присваивание занимает строку целиком, без соседей через `;`, как SimpleStatementLine в libcst
+    is_line_statement: bool
+
+    def get_kwarg(self, name: str) -> Optional[str]:
+        return dict(self.kwargs).get(name)
+
+
+class ModelClass(NamedTuple):
+    name: str
+    lineno: int
+    is_django_model: bool
+    fields: Tuple[ModelField, ...]
+
+
+class ModelsModule(NamedTuple):
+    path: str
+    # все классы файла, включая вложенные, условные и объявленные в функциях
+    classes: Tuple[ModelClass, ...]
+    # инструкции верхнего уровня, которым не место в models.py
+    misplaced_statement_linenos: Tuple[int, ...]
+
+    def iterate_fields(self) -> Iterator[ModelField]:
+        for model_class in self.classes:
+            yield from model_class.fields
+
+
+def _get_call_func_name(call: ast.Call) -> Optional[str]:
+    if isinstance(call.func, ast.Name):
+        return call.func.id
+    if isinstance(call.func, ast.Attribute):
+        return call.func.attr
+    return None
+
+
+def extract_model_field(
+    assign: ast.stmt,
+    comment_index: CommentIndex,
+    is_class_attribute: bool = True,
+    is_line_statement: bool = True,
+) -> Optional[ModelField]:
+    if isinstance(assign, ast.Assign):
+        target = assign.targets[0]
+    elif isinstance(assign, ast.AnnAssign):
+        target = assign.target
+    else:
+        return None
+    if not isinstance(target, ast.Name) or not isinstance(assign.value, ast.Call):
+        return None
+    call = assign.value
+    return ModelField(
+        name=target.id,
+        field_type=_get_call_func_name(call),
+        lineno=assign.lineno,
+        col_offset=assign.col_offset,
+        kwargs=tuple(
+            (keyword.arg, ast.unparse(keyword.value))
+            for keyword in call.keywords
+            if keyword.arg is not None
+        ),
+        leading_comment=comment_index.get_leading_comment(call),
+        trailing_comment=comment_index.get_trailing_comment(assign),
+        is_annotated=isinstance(assign, ast.AnnAssign),
+        is_class_attribute=is_class_attribute,
+        is_line_statement=is_line_statement,
+    )
+
+
+def iterate_statement_lists(node: ast.AST) -> Iterator[List[ast.stmt]]:
+    """Тела узла: body, orelse, finalbody, тела except и case."""
+    for _, value in ast.iter_fields(node):
+        if isinstance(value, list) and value and isinstance(value[0], ast.stmt):
+            yield value
+        elif isinstance(value, list):
+            yield from itertools.chain.from_iterable(
+                iterate_statement_lists(item) for item in value if isinstance(item, ast.AST)
+            )
+
+
+def iterate_line_statements(
+    statements: List[ast.stmt], line_indents: List[int]
+) -> Iterator[ast.stmt]:
+    """Инструкции, занимающие строку целиком, как SimpleStatementLine в libcst."""
+    for statement, next_statement in zip(statements, [*statements[1:], None]):
+        if next_statement is not None and next_statement.lineno == statement.end_lineno:
+            continue  # `foo = Field(); bar = 1`
+        if line_indents[statement.lineno - 1] != statement.col_offset:
+            continue  # `bar = 1; foo = Field()` или `if x: foo = Field()`
+        yield statement
+
+
+def get_line_indents(file_content: str) -> List[int]:
+    return [len(line) - len(line.lstrip(' \t\f')) for line in LINE_BREAK_REGEX.split(file_content)]
+
+
+class ModelClassesCollector:
+    """Классы на любой глубине и поля из всех их инструкций - как libcst-визиторы хуков."""
+
+    def __init__(self, comment_index: CommentIndex, line_indents: List[int]) -> None:
+        self.comment_index = comment_index
+        self.line_indents = line_indents
+        self.classes: List[ModelClass] = []
+
+    def visit_statements(
+        self,
+        statements: List[ast.stmt],
+        fields: Optional[List[ModelField]] = None,
+        is_class_body: bool = False,
+    ) -> None:
+        line_statements = set(iterate_line_statements(statements, self.line_indents))
+        for statement in statements:
+            if fields is not None:
+                field = extract_model_field(
+                    statement, self.comment_index, is_class_body, statement in line_statements
+                )
+                if field is not None:
+                    fields.append(field)
+            if isinstance(statement, ast.ClassDef):
+                self.visit_classdef(statement)
+                continue
+            for child_statements in iterate_statement_lists(statement):
+                self.visit_statements(child_statements, fields)
+
+    def visit_classdef(self, classdef: ast.ClassDef) -> None:
+        class_index = len(self.classes)
+        fields: List[ModelField] = []
+        self.visit_statements(classdef.body, fields, is_class_body=True)
+        self.classes.insert(
+            class_index,
+            ModelClass(
+                name=classdef.name,
+                lineno=classdef.lineno,
+                is_django_model=is_django_model_definition(classdef),
+                fields=tuple(fields),
+            ),
+        )
+
+
+def extract_models_module(path: str, ast_tree: ast.Module, file_content: str) -> ModelsModule:
+    classes_collector = ModelClassesCollector(
+        build_comment_index(file_content), get_line_indents(file_content)
+    )
+    classes_collector.visit_statements(ast_tree.body)
+    misplaced_nodes = get_not_ok_base_nodes_from(
+        ast_tree, MODELS_MODULE_ALLOWED_NODES, MODELS_MODULE_CONDITIONAL_NODES
+    )
+    return ModelsModule(
+        path=path,
+        classes=tuple(classes_collector.classes),
+        misplaced_statement_linenos=tuple(
+            node.lineno for node in misplaced_nodes if isinstance(node, ast.stmt)
+        ),
+    )
+
+
+def get_models_module(pyfilepath: str) -> Optional[ModelsModule]:
+    source_file = read_source_file_for_parsing(pyfilepath)
+    if source_file is None:
+        return None
+    models_cache = get_disk_cache('django_models', DJANGO_MODELS_CACHE_SCHEMA_VERSION)
+    cache_key = get_content_digest(source_file.content)
+    if models_cache is not None:
+        cached_module = models_cache.load(cache_key)
+        if isinstance(cached_module, ModelsModule):
+            return cached_module._replace(path=pyfilepath)
+
+    ast_tree = call_with_parse_guard(pyfilepath, lambda: parse_ast_tree(source_file.text))
+    if ast_tree is None:
+        return None
+    models_module = extract_models_module(pyfilepath, ast_tree, source_file.text)
+    if models_cache is not None:
+        models_cache.store(cache_key, models_module)
+    return models_module
+
+
+class DjangoModelIndex:
+    """Модели, поля и комментарии к полям из всех models-файлов; каждый файл разбирается один раз."""
+
+    def __init__(self) -> None:
+        self.modules_by_path: Dict[str, Optional[ModelsModule]] = {}
+
+    def get_module(self, filepath: str) -> Optional[ModelsModule]:
+        if filepath not in self.modules_by_path:
+            self.modules_by_path[filepath] = get_models_module(filepath)
+        return self.modules_by_path[filepath]
+
+    def add_files(self, filepaths: Iterable[str]) -> None:
+        for filepath in filepaths:
+            self.get_module(filepath)
+
+    def iterate_modules(self) -> Iterator[ModelsModule]:
+        for models_module in self.modules_by_path.values():
+            if models_module is not None:
+                yield models_module
+
+
+def build_django_model_index(filepaths: Iterable[str]) -> DjangoModelIndex:
+    model_index = DjangoModelIndex()
+    model_index.add_files(str(filepath) for filepath in filepaths)
+    return model_index
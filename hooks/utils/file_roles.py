@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import enum
+import re
+from functools import lru_cache
+from typing import Dict
+
+CLASSIFIED_PATHS_CACHE_SIZE = 2**16
+
+
+class FileRole(enum.Flag):
+    NONE = 0
+    MODELS = enum.auto()
+    SETTINGS = enum.auto()
+    API = enum.auto()
+    API_SCHEMA = enum.auto()
+    SERIALIZERS = enum.auto()
+    VIEWS = enum.auto()
+    URLS = enum.auto()
+    MIGRATIONS = enum.auto()
+    TESTS = enum.auto()
+
+
+_ROLE_PATTERNS: Dict[FileRole, str] = {
+    FileRole.MODELS: r'(?:.*/)?(?:models\.py|models/.*\.py)$',
+    FileRole.SETTINGS: r'(?!.*/__init__\.py$).*settings/',
+    FileRole.API: r'(?!.*/rest_in_peace/).*/api/',
+    FileRole.API_SCHEMA: (
+        r'(?!.*/rest_in_peace/)(?=.*/api/)(?=.*\.py$)'
+        r'.*/(?:serializers|views|viewsets)(?:/|\.py$)'
+    ),
+    FileRole.SERIALIZERS: r'(?=.*\.py$).*/serializers(?:/|\.py$)',
+    FileRole.VIEWS: r'(?=.*\.py$).*/(?:views|viewsets)(?:/|\.py$)',
+    FileRole.URLS: r'(?:.*/)?(?:urls\.py|urls/[^/]*\.py)$',
+    FileRole.MIGRATIONS: r'.*/migrations/[^/]*\.py$',
+    FileRole.TESTS: r'.*/tests/(?:.*/)?(?:test_[^/]*|[^/]*_test)$',
+}
+
+# каждая роль - необязательный lookahead со своей группой: путь проходит regex один раз
+_ROLES_REGEX = re.compile(
+    ''.join(f'(?=(?P<{role.name}>{pattern}))?' for role, pattern in _ROLE_PATTERNS.items())
+)
+
+
+@lru_cache(maxsize=CLASSIFIED_PATHS_CACHE_SIZE)
+def classify_path(filepath: str) -> FileRole:
+    """Роли файла по пути: модели, настройки, api, тесты и т.д."""
+    roles = FileRole.NONE
+    roles_match = _ROLES_REGEX.match(filepath)
+    if roles_match is None:
+        return roles
+    for role_name, role_path in roles_match.groupdict().items():
+        if role_path is not None:
+            roles |= FileRole[role_name]
+    return roles
+
+
+def has_any_role(filepath: str, roles: FileRole) -> bool:
+    return bool(classify_path(filepath) & roles)
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import ast
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+from hooks.utils.ast_helpers import get_var_names_from_assignment, parse_ast_tree
+from hooks.utils.class_hierarchy import ClassHierarchy, get_dotted_name
+from hooks.utils.disk_cache import get_content_digest, get_disk_cache
+from hooks.utils.source_file import call_with_parse_guard, read_source_file_for_parsing
+
+DJANGO_OBJECT_TYPE_BASE_CLASSES = frozenset({'DjangoObjectType'})
+EXPOSED_FIELDS_OPTIONS = ('only_fields', 'fields')
+GRAPHQL_TYPES_CACHE_SCHEMA_VERSION = 2
+
+
+class GraphQLType(NamedTuple):
+    name: str
+    lineno: int
+    # базы как они записаны в файле: вложенных классов нет в иерархии классов проекта
+    bases: Tuple[str, ...]
+    # Meta.only_fields / Meta.fields, если заданы списком или кортежем
+    exposed_fields: Optional[Tuple[str, ...]]
+    is_abstract: bool
+
+    @property
+    def exposes_fields_implicitly(self) -> bool:
+        return not self.is_abstract and not self.exposed_fields
+
+
+class GraphQLModule(NamedTuple):
+    path: str
+    types: Tuple[GraphQLType, ...]
+
+
+def _get_meta_options(classdef: ast.ClassDef) -> Dict[str, ast.expr]:
+    meta = next(
+        (node for node in classdef.body if isinstance(node, ast.ClassDef) and node.name == 'Meta'),
+        None,
+    )
+    if meta is None:
+        return {}
+    options = {}
+    for node in meta.body:
+        if isinstance(node, (ast.Assign, ast.AnnAssign)) and node.value is not None:
+            for name, _ in get_var_names_from_assignment(node):
+                options[name] = node.value
+    return options
+
+
+def _get_names_sequence(node: Optional[ast.expr]) -> Optional[Tuple[str, ...]]:
+    if not isinstance(node, (ast.List, ast.Tuple)):
+        return None
+    return tuple(
+        (
+            elt.value
+            if isinstance(elt, ast.Constant) and isinstance(elt.value, str)
+            else ast.unparse(elt)
+        )
+        for elt in node.elts
+    )
+
+
+def extract_graphql_type(classdef: ast.ClassDef) -> GraphQLType:
+    options = _get_meta_options(classdef)
+    exposed_fields_option = next(
+        (option for option in EXPOSED_FIELDS_OPTIONS if option in options), None
+    )
+    abstract_option = options.get('abstract')
+    bases = (get_dotted_name(base) for base in classdef.bases)
+    return GraphQLType(
+        name=classdef.name,
+        lineno=classdef.lineno,
+        bases=tuple(base for base in bases if base),
+        exposed_fields=(
+            _get_names_sequence(options[exposed_fields_option]) if exposed_fields_option else None
+        ),
+        is_abstract=isinstance(abstract_option, ast.Constant) and abstract_option.value is True,
+    )
+
+
+def extract_graphql_module(path: str, ast_tree: ast.Module) -> GraphQLModule:
+    return GraphQLModule(
+        path=path,
+        types=tuple(
+            extract_graphql_type(node)
+            for node in ast.walk(ast_tree)
+            if isinstance(node, ast.ClassDef)
+        ),
+    )
+
+
+def get_graphql_module(pyfilepath: str) -> Optional[GraphQLModule]:
+    source_file = read_source_file_for_parsing(pyfilepath)
+    if source_file is None:
+        return None
+    graphql_cache = get_disk_cache('graphql_types', GRAPHQL_TYPES_CACHE_SCHEMA_VERSION)
+    cache_key = get_content_digest(source_file.content)
+    if graphql_cache is not None:
+        cached_module = graphql_cache.load(cache_key)
+        if isinstance(cached_module, GraphQLModule):
+            return cached_module._replace(path=pyfilepath)
+
+    ast_tree = call_with_parse_guard(pyfilepath, lambda: parse_ast_tree(source_file.text))
+    if ast_tree is None:
+        return None
+    graphql_module = extract_graphql_module(pyfilepath, ast_tree)
+    if graphql_cache is not None:
+        graphql_cache.store(cache_key, graphql_module)
+    return graphql_module
+
+
+class GraphQLSchemaIndex:
+    """
+    Классы схемы GraphQL и опции их Meta; каждый файл разбирается один раз.
+
+    Наследники `DjangoObjectType` определяются через иерархию классов проекта,
+    так что учитываются алиасы импорта и промежуточные базовые типы из других модулей.
+    """
+
+    def __init__(self, class_hierarchy: ClassHierarchy | None = None) -> None:
+        self.class_hierarchy = class_hierarchy or ClassHierarchy()
+        self.modules_by_path: Dict[str, Optional[GraphQLModule]] = {}
+
+    def get_module(self, filepath: str) -> Optional[GraphQLModule]:
+        if filepath not in self.modules_by_path:
+            self.modules_by_path[filepath] = get_graphql_module(filepath)
+        return self.modules_by_path[filepath]
+
+    def add_files(self, filepaths: Iterable[str]) -> None:
+        for filepath in filepaths:
+            self.get_module(filepath)
+
+    def is_django_object_type(self, filepath: str, graphql_type: GraphQLType) -> bool:
+        module_name = self.class_hierarchy.add_file(filepath)
+        base_names = (
+            self.class_hierarchy.resolve_name(module_name, base) for base in graphql_type.bases
+        )
+        return any(
+            base_name.rsplit('.', 1)[-1] in DJANGO_OBJECT_TYPE_BASE_CLASSES
+            or self.class_hierarchy.is_subclass_of(base_name, DJANGO_OBJECT_TYPE_BASE_CLASSES)
+            for base_name in base_names
+        )
+
+    def iterate_django_object_types(self) -> Iterator[Tuple[str, GraphQLType]]:
+        for graphql_module in self.modules_by_path.values():
+            if graphql_module is None:
+                continue
+            for graphql_type in graphql_module.types:
+                if self.is_django_object_type(graphql_module.path, graphql_type):
+                    yield graphql_module.path, graphql_type
+
+
+def build_graphql_schema_index(
+    filepaths: Iterable[str], class_hierarchy: ClassHierarchy | None = None
+) -> GraphQLSchemaIndex:
+    schema_index = GraphQLSchemaIndex(class_hierarchy)
+    schema_index.add_files(str(filepath) for filepath in filepaths)
+    return schema_index
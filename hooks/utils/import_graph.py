@@ -0,0 +1,387 @@
+from __future__ import annotations
+
+import ast
+import os
+import sys
+from collections import defaultdict
+from typing import (
+    Callable,
+    DefaultDict,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from hooks.utils.ast_helpers import get_full_imported_name, iterate_files_in, parse_ast_tree
+from hooks.utils.disk_cache import get_content_digest, get_disk_cache
+from hooks.utils.mypy_api_helpers import get_exclude_dirs_from_config
+from hooks.utils.pre_commit import get_module_name_from_path, get_modules_files
+from hooks.utils.source_file import call_with_parse_guard, read_source_file_for_parsing
+
+IMPORTS_CACHE_SCHEMA_VERSION = 2
+
+
+class ImportedName(NamedTuple):
+    name: str
+    lineno: int
+    level: int = 0
+
+
+class DottedNameTrie:
+    """
+    Префиксное дерево по сегментам имен через точку.
+
+    Имя совпадает, если оно равно одному из добавленных имен или является его префиксом
+    по сегментам: для `django.db.backends` совпадут `django`, `django.db` и `django.db.backends`.
+    """
+
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        self.root: Dict[str, dict] = {}
+        for name in names:
+            self.add(name)
+
+    def add(self, name: str) -> None:
+        node = self.root
+        for segment in name.split('.'):
+            node = node.setdefault(segment, {})
+
+    def matches(self, name: str) -> bool:
+        if not self.root:
+            return False
+        node = self.root
+        for segment in name.split('.'):
+            next_node = node.get(segment)
+            if next_node is None:
+                return False
+            node = next_node
+        return True
+
+
+def extract_imports(ast_tree: ast.AST) -> List[ImportedName]:
+    return [
+        ImportedName(
+            import_name,
+            import_node.lineno,
+            import_node.level if isinstance(import_node, ast.ImportFrom) else 0,
+        )
+        for import_node in ast.walk(ast_tree)
+        if isinstance(import_node, (ast.Import, ast.ImportFrom))
+        for import_name in get_full_imported_name(import_node)
+    ]
+
+
+def get_file_imports(pyfilepath: str) -> Optional[List[ImportedName]]:
+    source_file = read_source_file_for_parsing(pyfilepath)
+    if source_file is None:
+        return None
+    imports_cache = get_disk_cache('imports', IMPORTS_CACHE_SCHEMA_VERSION)
+    cache_key = get_content_digest(source_file.content)
+    if imports_cache is not None:
+        cached_imports = imports_cache.load(cache_key)
+        if isinstance(cached_imports, list):
+            return [ImportedName(*imported_name) for imported_name in cached_imports]
+
+    ast_tree = call_with_parse_guard(pyfilepath, lambda: parse_ast_tree(source_file.text))
+    if ast_tree is None:
+        return None
+    imports = extract_imports(ast_tree)
+    if imports_cache is not None:
+        imports_cache.store(cache_key, [tuple(imported_name) for imported_name in imports])
+    return imports
+
+
+class ModuleNameCollision(NamedTuple):
+    module_name: str
+    filepath: str
+    added_filepath: str
+
+
+class ImportGraph:
+    """Модуль -> импортированные им имена, плюс обратный индекс "кто импортирует X"."""
+
+    def __init__(self) -> None:
+        self.imports_by_module: Dict[str, List[ImportedName]] = {}
+        self.filepath_by_module: Dict[str, str] = {}
+        self.collisions: List[ModuleNameCollision] = []
+        self._importers_by_name: DefaultDict[str, List[Tuple[str, int]]] = defaultdict(list)
+
+    def has_module(self, module_name: str, filepath: str) -> bool:
+        """Занято ли имя модуля; другой файл с тем же именем запоминается как коллизия."""
+        added_filepath = self.filepath_by_module.get(module_name)
+        if added_filepath is None:
+            return False
+        if not _is_same_file(added_filepath, filepath):
+            self.collisions.append(ModuleNameCollision(module_name, filepath, added_filepath))
+        return True
+
+    def add_module(self, module_name: str, filepath: str, imports: List[ImportedName]) -> None:
+        """Повторное добавление того же файла обновляет импорты, файл-двойник пропускается."""
+        added_filepath = self.filepath_by_module.get(module_name)
+        if added_filepath is not None:
+            if not _is_same_file(added_filepath, filepath):
+                self.collisions.append(ModuleNameCollision(module_name, filepath, added_filepath))
+                return
+            self.remove_module(module_name)
+        self.imports_by_module[module_name] = imports
+        self.filepath_by_module[module_name] = filepath
+        for imported_name in imports:
+            for name_prefix in _iterate_dotted_prefixes(imported_name.name):
+                self._importers_by_name[name_prefix].append((module_name, imported_name.lineno))
+
+    def remove_module(self, module_name: str) -> None:
+        imports = self.imports_by_module.pop(module_name, [])
+        self.filepath_by_module.pop(module_name, None)
+        for imported_name in imports:
+            for name_prefix in _iterate_dotted_prefixes(imported_name.name):
+                importers = self._importers_by_name[name_prefix]
+                importers[:] = [importer for importer in importers if importer[0] != module_name]
+
+    def get_importers(self, name: str) -> List[Tuple[str, int]]:
+        """Модули (и строки), импортирующие `name` или что-то внутри него."""
+        return list(self._importers_by_name.get(name, []))
+
+    def is_package(self, module_name: str) -> bool:
+        return os.path.basename(self.filepath_by_module[module_name]) == '__init__.py'
+
+    def get_absolute_name(self, module_name: str, imported_name: ImportedName) -> str:
+        if not imported_name.level:
+            return imported_name.name
+        package_parts = module_name.split('.')
+        if not self.is_package(module_name):
+            package_parts.pop()
+        package_parts = package_parts[: max(len(package_parts) - imported_name.level + 1, 0)]
+        relative_name = imported_name.name
+        if relative_name.startswith('None.'):  # `from . import name`
+            relative_name = relative_name.split('.', 1)[1]
+        return '.'.join([*package_parts, relative_name])
+
+    def resolve_local_module(self, name: str) -> Optional[str]:
+        """Самый длинный префикс имени, который является модулем проекта."""
+        candidate = name
+        while candidate not in self.imports_by_module:
+            if '.' not in candidate:
+                return None
+            candidate = candidate.rsplit('.', 1)[0]
+        return candidate
+
+    def get_local_dependencies(self, module_name: str) -> List[Tuple[str, int]]:
+        dependencies = []
+        for imported_name in self.imports_by_module[module_name]:
+            local_module = self.resolve_local_module(
+                self.get_absolute_name(module_name, imported_name)
+            )
+            if local_module is not None and local_module != module_name:
+                dependencies.append((local_module, imported_name.lineno))
+        return dependencies
+
+
+def _is_same_file(filepath: str, other_filepath: str) -> bool:
+    return os.path.realpath(filepath) == os.path.realpath(other_filepath)
+
+
+def _iterate_dotted_prefixes(name: str) -> Iterable[str]:
+    segments = name.split('.')
+    for segments_amount in range(1, len(segments) + 1):
+        yield '.'.join(segments[:segments_amount])
+
+
+def build_import_graph(pyfilepaths: Iterable[str], base_dir: str | None = None) -> ImportGraph:
+    import_graph = ImportGraph()
+    for pyfilepath in pyfilepaths:
+        imports = get_file_imports(pyfilepath)
+        if imports is None:
+            continue
+        import_graph.add_module(
+            get_module_name_from_path(pyfilepath, base_dir), pyfilepath, imports
+        )
+    return import_graph
+
+
+def is_project_root(root: str) -> bool:
+    """Корневой пакет внутри base_dir: `..`, пустые и прочие не-идентификаторы отбрасываются."""
+    return root.isidentifier()
+
+
+def report_module_name_collisions(import_graph: ImportGraph) -> None:
+    for collision in import_graph.collisions:
+        print(  # noqa: T001
+            f'{collision.filepath}: skipped: module {collision.module_name} '
+            f'is already defined by {collision.added_filepath}',
+            file=sys.stderr,
+        )
+
+
+def _iterate_new_import_roots(
+    import_graph: ImportGraph, module_name: str, base_dir: str, seen_roots: Set[str]
+) -> Iterator[str]:
+    for imported_name in import_graph.imports_by_module[module_name]:
+        root = import_graph.get_absolute_name(module_name, imported_name).split('.')[0]
+        if (
+            root not in seen_roots
+            and is_project_root(root)
+            and os.path.isdir(os.path.join(base_dir, root))
+        ):
+            seen_roots.add(root)
+            yield root
+
+
+def _add_root_modules(
+    import_graph: ImportGraph, root: str, base_dir: str, dirs_to_exclude: List[str]
+) -> List[str]:
+    """Добавляет в граф модули корневого пакета; возвращает имена добавленных."""
+    added_modules = []
+    for pyfilepath in iterate_files_in(os.path.join(base_dir, root), dirs_to_exclude, 'py'):
+        module_name = get_module_name_from_path(pyfilepath, base_dir)
+        if import_graph.has_module(module_name, pyfilepath):
+            continue
+        imports = get_file_imports(pyfilepath)
+        if imports is None:
+            continue
+        import_graph.add_module(module_name, pyfilepath, imports)
+        added_modules.append(module_name)
+    return added_modules
+
+
+def add_project_packages(
+    import_graph: ImportGraph, base_dir: str | None = None, dirs_to_exclude: List[str] | None = None
+) -> None:
+    """
+    Дополняет граф модулями проекта, до которых можно дойти по импортам.
+
+    Корневые пакеты берутся из группировки get_modules_files по уже добавленным файлам,
+    затем из импортов: `orders.models` тянет за собой каталог `<base_dir>/orders`.
+    """
+    if base_dir is None:
+        base_dir = os.getcwd()
+    if dirs_to_exclude is None:
+        dirs_to_exclude = get_exclude_dirs_from_config('flake8', 'exclude')
+
+    seen_roots = {
+        module_name
+        for module_name, _, _ in get_modules_files(
+            import_graph.filepath_by_module.values(), base_dir
+        )
+        if is_project_root(module_name)
+    }
+    pending_roots = list(seen_roots)
+    pending_modules = list(import_graph.imports_by_module)
+    while pending_roots or pending_modules:
+        while pending_modules:
+            pending_roots.extend(
+                _iterate_new_import_roots(import_graph, pending_modules.pop(), base_dir, seen_roots)
+            )
+        if pending_roots:
+            pending_modules = _add_root_modules(
+                import_graph, pending_roots.pop(), base_dir, dirs_to_exclude
+            )
+
+
+class _StronglyConnectedComponents:
+    """Состояние итеративного алгоритма Тарьяна."""
+
+    def __init__(self, get_successors: Callable[[str], Iterable[str]]) -> None:
+        self.get_successors = get_successors
+        self.index_by_node: Dict[str, int] = {}
+        self.lowlink_by_node: Dict[str, int] = {}
+        self.stack: List[str] = []
+        self.on_stack: Set[str] = set()
+        self.components: List[List[str]] = []
+
+    def _push(self, node: str) -> Tuple[str, Iterator[str]]:
+        self.index_by_node[node] = self.lowlink_by_node[node] = len(self.index_by_node)
+        self.stack.append(node)
+        self.on_stack.add(node)
+        return node, iter(self.get_successors(node))
+
+    def _pop_component(self, node: str) -> None:
+        component = []
+        while True:
+            component_node = self.stack.pop()
+            self.on_stack.discard(component_node)
+            component.append(component_node)
+            if component_node == node:
+                break
+        self.components.append(component)
+
+    def _get_unvisited_successor(self, node: str, successors: Iterator[str]) -> Optional[str]:
+        for successor in successors:
+            if successor not in self.index_by_node:
+                return successor
+            if successor in self.on_stack:
+                self.lowlink_by_node[node] = min(
+                    self.lowlink_by_node[node], self.index_by_node[successor]
+                )
+        return None
+
+    def visit(self, root: str) -> None:
+        if root in self.index_by_node:
+            return
+        work_stack = [self._push(root)]
+        while work_stack:
+            node, successors = work_stack[-1]
+            successor = self._get_unvisited_successor(node, successors)
+            if successor is not None:
+                work_stack.append(self._push(successor))
+                continue
+            work_stack.pop()
+            if work_stack:
+                parent = work_stack[-1][0]
+                self.lowlink_by_node[parent] = min(
+                    self.lowlink_by_node[parent], self.lowlink_by_node[node]
+                )
+            if self.lowlink_by_node[node] == self.index_by_node[node]:
+                self._pop_component(node)
+
+
+def get_strongly_connected_components(
+    nodes: Iterable[str], get_successors: Callable[[str], Iterable[str]]
+) -> List[List[str]]:
+    """
+    Итеративный алгоритм Тарьяна.
+
+    Компоненты возвращаются в обратном топологическом порядке: компонента идет
+    после всех компонент, достижимых из нее.
+    """
+    strongly_connected_components = _StronglyConnectedComponents(get_successors)
+    for root in nodes:
+        strongly_connected_components.visit(root)
+    return strongly_connected_components.components
+
+
+def get_reachable_names(
+    import_graph: ImportGraph, names_by_module: Mapping[str, Iterable[str]]
+) -> Dict[str, FrozenSet[str]]:
+    """
+    Для каждого модуля собирает имена из names_by_module, достижимые по локальным импортам.
+
+    Граф сжимается по компонентам сильной связности, после чего множества
+    протягиваются по получившемуся DAG за один проход.
+    """
+    dependencies_by_module = {
+        module_name: {
+            dependency for dependency, _ in import_graph.get_local_dependencies(module_name)
+        }
+        for module_name in import_graph.imports_by_module
+    }
+    reachable_names_by_module: Dict[str, FrozenSet[str]] = {}
+    for component in get_strongly_connected_components(
+        dependencies_by_module, dependencies_by_module.__getitem__
+    ):
+        component_modules = set(component)
+        reachable_names: Set[str] = set()
+        for module_name in component:
+            reachable_names.update(names_by_module.get(module_name, ()))
+            for dependency in dependencies_by_module[module_name]:
+                if dependency not in component_modules:
+                    reachable_names.update(reachable_names_by_module[dependency])
+        frozen_reachable_names = frozenset(reachable_names)
+        for module_name in component:
+            reachable_names_by_module[module_name] = frozen_reachable_names
+    return reachable_names_by_module
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from hooks.utils.mypy_api_helpers import get_list_param_from_configs
+
+CONTRACT_RE = re.compile(
+    r'^\s*(?P<importer>[\w.]+)\s+(?P<verb>may|must not)\s+import\s+(?P<imported>[\w.]+)\s*$'
+)
+
+
+class LayerContractsError(ValueError):
+    pass
+
+
+class LayerContracts:
+    """
+    Слои и контракты между ними.
+
+    `layers` перечисляются сверху вниз: верхний слой может импортировать нижние, но не наоборот.
+    Контракты `a may import b` / `a must not import b` уточняют или заменяют это правило.
+    Модуль относится к слою, если имя слоя совпадает с префиксом его имени (`orders.api`)
+    или с одним из его сегментов (`api`); при нескольких совпадениях побеждает самый левый сегмент.
+    """
+
+    def __init__(
+        self,
+        layers: Sequence[str],
+        allowed_imports: FrozenSet[Tuple[str, str]] = frozenset(),
+        forbidden_imports: FrozenSet[Tuple[str, str]] = frozenset(),
+    ) -> None:
+        self.layer_positions: Dict[str, int] = {layer: idx for idx, layer in enumerate(layers)}
+        self.allowed_imports = allowed_imports
+        self.forbidden_imports = forbidden_imports
+        self.layer_names: FrozenSet[str] = frozenset(
+            [
+                *layers,
+                *(layer for contract in allowed_imports for layer in contract),
+                *(layer for contract in forbidden_imports for layer in contract),
+            ]
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.layer_names)
+
+    def get_layer(self, module_name: str) -> Optional[str]:
+        segments = module_name.split('.')
+        for segments_amount in range(1, len(segments) + 1):
+            if '.'.join(segments[:segments_amount]) in self.layer_names:
+                return '.'.join(segments[:segments_amount])
+            if segments[segments_amount - 1] in self.layer_names:
+                return segments[segments_amount - 1]
+        return None
+
+    def is_import_allowed(self, importer_layer: str, imported_layer: str) -> bool:
+        if importer_layer == imported_layer:
+            return True
+        if (importer_layer, imported_layer) in self.forbidden_imports:
+            return False
+        if (importer_layer, imported_layer) in self.allowed_imports:
+            return True
+        importer_position = self.layer_positions.get(importer_layer)
+        imported_position = self.layer_positions.get(imported_layer)
+        if importer_position is None or imported_position is None:
+            return True
+        return importer_position < imported_position
+
+
+def parse_layer_contracts(layers: Sequence[str], contracts: Sequence[str]) -> LayerContracts:
+    allowed_imports = set()
+    forbidden_imports = set()
+    for contract in contracts:
+        match = CONTRACT_RE.match(contract)
+        if match is None:
+            raise LayerContractsError(
+                f'Invalid contract "{contract}", expected "a may import b" or "a must not import b"'
+            )
+        rule = (match.group('importer'), match.group('imported'))
+        if match.group('verb') == 'may':
+            allowed_imports.add(rule)
+        else:
+            forbidden_imports.add(rule)
+    return LayerContracts(layers, frozenset(allowed_imports), frozenset(forbidden_imports))
+
+
+def get_layer_contracts_from_configs() -> LayerContracts:
+    layers: List[str] = get_list_param_from_configs('project_structure', 'layers')
+    contracts: List[str] = get_list_param_from_configs('project_structure', 'contracts')
+    return parse_layer_contracts(layers, contracts)
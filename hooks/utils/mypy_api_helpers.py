@@ -7,9 +7,11 @@ from pathlib import Path
 from typing import Any, List, Mapping, Optional, Set, Tuple
 
 _PYPROJECT_SECTION_PATHS: dict[str, Tuple[str, ...]] = {
+    'celery_tasks': ('tool', 'celery_tasks'),
     'flake8': ('tool', 'flake8'),
     'project_structure': ('tool', 'project_structure'),
     'mypy': ('tool', 'mypy'),
+    'pre_commit_hooks': ('tool', 'pre_commit_hooks'),
 }
 
 _SETUP_CFG_FALLBACK = 'setup.cfg'
@@ -80,7 +82,9 @@ def _get_raw_from_pyproject(section_name: str, param_name: str) -> Any | None:
     section_mapping = _get_nested_mapping(_load_pyproject_toml(), section_path)
     if section_mapping is None:
         return None
-    return section_mapping.get(param_name) or section_mapping.get(param_name.replace('-', '_'))
+    if param_name in section_mapping:
+        return section_mapping[param_name]
+    return section_mapping.get(param_name.replace('-', '_'))
 
 
 def get_param_from_configs(section_name: str, param_name: str) -> Optional[str]:
@@ -101,6 +105,13 @@ def get_list_param_from_configs(section_name: str, param_name: str) -> List[str]
     return get_list_param_from_config(_SETUP_CFG_FALLBACK, section_name, param_name)
 
 
+def get_bool_param_from_configs(section_name: str, param_name: str, default: bool = False) -> bool:
+    raw_value = get_param_from_configs(section_name, param_name)
+    if raw_value is None:
+        return default
+    return raw_value.strip().lower() in {'1', 'true', 'yes', 'on'}
+
+
 def get_exclude_dirs_from_config(
     section_name: str = 'flake8', param_name: str = 'exclude'
 ) -> List[str]:
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import io
+import re
+import tokenize
+from typing import Dict, FrozenSet, Set
+
+NOQA_MARKER = '# noqa'
+NOQA_COMMENT_RE = re.compile(r'# noqa(?::\s*(?P<tags>[^#]*))?')
+BLANKET_NOQA: FrozenSet[str] = frozenset()
+
+
+def parse_noqa_tags(comment: str) -> FrozenSet[str] | None:
+    """
+    Разбирает комментарий с `# noqa`.
+
+    Возвращает None, если noqa в комментарии нет, пустое множество для голого `# noqa`
+    и множество кодов или текстовых пометок для `# noqa: C901, E501` / `# noqa: static object`.
+    """
+    match = NOQA_COMMENT_RE.search(comment)
+    if match is None:
+        return None
+    tags = match.group('tags') or ''
+    return frozenset(tag.strip() for tag in tags.split(',') if tag.strip())
+
+
+class NoqaIndex:
+    """Индекс `# noqa` комментариев файла: номер строки -> коды/пометки."""
+
+    def __init__(self, tags_by_line: Dict[int, FrozenSet[str]]) -> None:
+        self.tags_by_line = tags_by_line
+
+    def has_noqa(self, lineno: int) -> bool:
+        return lineno in self.tags_by_line
+
+    def get_tags(self, lineno: int) -> FrozenSet[str] | None:
+        return self.tags_by_line.get(lineno)
+
+    def has_tag(self, lineno: int, tag: str) -> bool:
+        return tag in self.tags_by_line.get(lineno, BLANKET_NOQA)
+
+    def get_lines_with_tags(self, tags: FrozenSet[str] | Set[str]) -> Set[int]:
+        return {
+            lineno
+            for lineno, line_tags in self.tags_by_line.items()
+            if not line_tags.isdisjoint(tags)
+        }
+
+    def get_lines_with_tag_prefixes(self, prefixes: FrozenSet[str] | Set[str]) -> Set[int]:
+        """Строки, где пометка начинается с одного из префиксов: `# noqa: static object -- ...`."""
+        prefixes_tuple = tuple(prefixes)
+        return {
+            lineno
+            for lineno, line_tags in self.tags_by_line.items()
+            if any(tag.startswith(prefixes_tuple) for tag in line_tags)
+        }
+
+
+def build_noqa_index(file_content: str) -> NoqaIndex:
+    tags_by_line: Dict[int, FrozenSet[str]] = {}
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(file_content).readline):
+            if token.type != tokenize.COMMENT or NOQA_MARKER not in token.string:
+                continue
+            tags = parse_noqa_tags(token.string)
+            if tags is not None:
+                tags_by_line[token.start[0]] = tags
+    except (tokenize.TokenError, SyntaxError):
+        pass
+    return NoqaIndex(tags_by_line)
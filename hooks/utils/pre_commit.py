@@ -3,16 +3,79 @@ from __future__ import annotations
 import os
 import sys
 from collections import defaultdict
-from typing import Any, DefaultDict, Iterable, Iterator, List, Tuple
+from typing import Any, BinaryIO, DefaultDict, Iterable, Iterator, List, Tuple
 
 from hooks.utils.ast_helpers import iterate_files_in
+from hooks.utils.file_roles import FileRole, classify_path
 from hooks.utils.mypy_api_helpers import get_exclude_dirs_from_config, is_path_should_be_skipped
 
+FILES_FROM_OPTION = '--files-from'
+FILES_FROM_CHUNK_SIZE_BYTES = 64 * 1024
+
+
+def _iterate_delimited_paths(stream: BinaryIO, chunk_size: int) -> Iterator[str]:
+    delimiter = None
+    tail = b''
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        tail += chunk
+        if delimiter is None:
+            if b'\0' in chunk:
+                delimiter = b'\0'
+            elif b'\n' in chunk:
+                delimiter = b'\n'
+            else:
+                continue
+        *raw_paths, tail = tail.split(delimiter)
+        for raw_path in raw_paths:
+            path = os.fsdecode(raw_path.rstrip(b'\r\n') if delimiter == b'\n' else raw_path)
+            if path:
+                yield path
+    path = os.fsdecode(tail.rstrip(b'\r\n'))
+    if path:
+        yield path
+
+
+def iterate_paths_from(source: str, chunk_size: int = FILES_FROM_CHUNK_SIZE_BYTES) -> Iterator[str]:
+    """Лениво читает NUL- или newline-разделенный список путей из файла или stdin (`-`)."""
+    if source == '-':
+        yield from _iterate_delimited_paths(sys.stdin.buffer, chunk_size)
+        return
+    with open(source, 'rb') as paths_file:
+        yield from _iterate_delimited_paths(paths_file, chunk_size)
+
+
+def iterate_input_args(args: Iterable[str]) -> Iterator[str]:
+    """Разворачивает `--files-from FILE|-` в пути, остальные аргументы отдает как есть."""
+    args_iterator = iter(args)
+    for item in args_iterator:
+        if item == FILES_FROM_OPTION:
+            source = next(args_iterator, None)
+            if source is not None:
+                yield from iterate_paths_from(source)
+        elif item.startswith(f'{FILES_FROM_OPTION}='):
+            yield from iterate_paths_from(item.split('=', 1)[1])
+        else:
+            yield item
+
 
 def get_input_files(
     args: list[str] | None = None,
     dirs_to_exclude: list[str] | None = None,
     extension: str | None = None,
+    roles: FileRole | None = None,
+) -> Iterator[str]:
+    """Входные файлы; с `roles` - только файлы хотя бы с одной из этих ролей."""
+    input_files = _iterate_input_files(args, dirs_to_exclude, extension)
+    if roles is None:
+        return input_files
+    return (filepath for filepath in input_files if classify_path(filepath) & roles)
+
+
+def _iterate_input_files(
+    args: list[str] | None, dirs_to_exclude: list[str] | None, extension: str | None
 ) -> Iterator[str]:
     if args is None:
         args = sys.argv[1:] if len(sys.argv) > 1 else ['.']
@@ -23,7 +86,7 @@ def get_input_files(
     if dirs_to_exclude is None:
         dirs_to_exclude = get_exclude_dirs_from_config('flake8', 'exclude')
 
-    for item in args:
+    for item in iterate_input_args(args):
         path = os.path.realpath(os.path.abspath(item))
 
         if (
@@ -38,17 +101,7 @@ def get_input_files(
 
 
 def get_input_test_files(args: list[str] | None = None) -> Iterator[str]:
-    return (
-        filepath
-        for filepath in get_input_files(args)
-        if (
-            '/tests/' in filepath
-            and (
-                os.path.basename(filepath).startswith('test_')
-                or os.path.basename(filepath).endswith('_test')
-            )
-        )
-    )
+    return get_input_files(args, roles=FileRole.TESTS)
 
 
 def get_modules_files(
@@ -74,7 +127,18 @@ def get_modules_files(
     ]
 
 
+def get_module_name_from_path(filepath: str, base_dir: str | None = None) -> str:
+    if base_dir is None:
+        base_dir = os.getcwd()
+    module_path = os.path.splitext(os.path.relpath(filepath, base_dir))[0]
+    module_parts = module_path.split(os.sep)
+    if len(module_parts) > 1 and module_parts[-1] == '__init__':
+        module_parts.pop()
+    return '.'.join(module_parts)
+
+
 def is_django_model_file(file_path: str) -> bool:
+    """models.py или модуль прямо в пакете models: тут допустимы только определения моделей."""
     return os.path.basename(file_path) == 'models.py' or (
         os.path.basename(os.path.dirname(file_path)) == 'models' and file_path.endswith('.py')
     )
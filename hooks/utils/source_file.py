@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import collections
+import contextlib
+import dataclasses
+import enum
+import io
+import os
+import signal
+import sys
+import threading
+import time
+import tokenize
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from hooks.utils.mypy_api_helpers import get_param_from_configs
+
+HOOKS_CONFIG_SECTION = 'pre_commit_hooks'
+# лимит размера включается явно: пропущенный большой модуль не должен прятать ошибки
+DEFAULT_MAX_FILE_SIZE_KB = 0
+DEFAULT_PARSE_TIMEOUT_SECONDS = 10.0
+DEFAULT_READ_AHEAD = 8
+MIN_TIMER_DELAY_SECONDS = 1e-6
+UNPARSABLE_ERRORS: Tuple[Type[BaseException], ...] = (SyntaxError, RecursionError)
+
+T = TypeVar('T')
+
+
+class SkipReason(enum.Enum):
+    TOO_LARGE = 'too large'
+    UNDECODABLE = 'undecodable'
+    UNPARSABLE = 'unparsable'
+    TIMED_OUT = 'timed out'
+
+
+class ParseTimeoutError(Exception):
+    pass
+
+
+class ParseLimits(NamedTuple):
+    max_file_size_bytes: Optional[int]
+    timeout_seconds: Optional[float]
+
+
+@dataclasses.dataclass(frozen=True)
+class SourceFile:
+    path: str
+    content: bytes
+    encoding: str
+    text: str
+
+    @property
+    def lines_count(self) -> int:
+        if not self.text:
+            return 0
+        return self.text.count('\n') + (not self.text.endswith('\n'))
+
+
+_reported_skips: Set[Tuple[str, SkipReason]] = set()
+
+
+def report_skipped_file(path: str, reason: SkipReason, details: str = '') -> None:
+    """Сообщает в stderr о пропущенном файле; проверку это не валит."""
+    if (path, reason) in _reported_skips:
+        return
+    _reported_skips.add((path, reason))
+    message = f'{path}: skipped: {reason.value}'
+    if details:
+        message = f'{message} ({details})'
+    print(message, file=sys.stderr)  # noqa: T001
+
+
+@lru_cache(maxsize=None)
+def get_parse_limits() -> ParseLimits:
+    max_file_size_kb = float(
+        get_param_from_configs(HOOKS_CONFIG_SECTION, 'max-file-size-kb') or DEFAULT_MAX_FILE_SIZE_KB
+    )
+    timeout_seconds = float(
+        get_param_from_configs(HOOKS_CONFIG_SECTION, 'parse-timeout')
+        or DEFAULT_PARSE_TIMEOUT_SECONDS
+    )
+    return ParseLimits(
+        max_file_size_bytes=int(max_file_size_kb * 1024) if max_file_size_kb > 0 else None,
+        timeout_seconds=timeout_seconds if timeout_seconds > 0 else None,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_read_ahead() -> int:
+    read_ahead = get_param_from_configs(HOOKS_CONFIG_SECTION, 'read-ahead')
+    return DEFAULT_READ_AHEAD if read_ahead is None else max(0, int(read_ahead))
+
+
+def decode_source(content: bytes) -> Tuple[str, str]:
+    """Декодирует исходник с учетом PEP 263 cookie и BOM, переводы строк как в текстовом режиме."""
+    encoding, _ = tokenize.detect_encoding(io.BytesIO(content).readline)
+    text = content.decode(encoding)
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text, encoding
+
+
+def read_source_file(path: str, max_size_bytes: Optional[int] = None) -> Optional[SourceFile]:
+    with open(path, 'rb') as file_handler:
+        file_size = os.fstat(file_handler.fileno()).st_size
+        if max_size_bytes is not None and file_size > max_size_bytes:
+            report_skipped_file(path, SkipReason.TOO_LARGE, f'{file_size} > {max_size_bytes} bytes')
+            return None
+        content = file_handler.read()
+    try:
+        text, encoding = decode_source(content)
+    except (SyntaxError, LookupError, ValueError) as exc:
+        report_skipped_file(path, SkipReason.UNDECODABLE, str(exc))
+        return None
+    return SourceFile(path=path, content=content, encoding=encoding, text=text)
+
+
+def read_source_file_for_parsing(path: str) -> Optional[SourceFile]:
+    return read_source_file(path, max_size_bytes=get_parse_limits().max_file_size_bytes)
+
+
+def iterate_prefetched_source_files(
+    paths: Iterable[str], read_ahead: Optional[int] = None
+) -> Iterator[Tuple[str, Optional[SourceFile]]]:
+    """
+    Файлы для разбора в порядке `paths`, прочитанные заранее в потоках.
+
+    Одновременно читается не больше `read_ahead` файлов: на сетевой ФС ожидание open/read
+    идет параллельно с разбором уже прочитанных, а в памяти лежит ограниченное число исходников.
+    """
+    if read_ahead is None:
+        read_ahead = get_read_ahead()
+    if read_ahead < 1:
+        for path in paths:
+            yield path, read_source_file_for_parsing(path)
+        return
+
+    with ThreadPoolExecutor(max_workers=read_ahead, thread_name_prefix='read-ahead') as executor:
+        pending: Deque[Tuple[str, Future[Optional[SourceFile]]]] = collections.deque()
+        for path in paths:
+            pending.append((path, executor.submit(read_source_file_for_parsing, path)))
+            if len(pending) > read_ahead:
+                ready_path, source_file = pending.popleft()
+                yield ready_path, source_file.result()
+        while pending:
+            ready_path, source_file = pending.popleft()
+            yield ready_path, source_file.result()
+
+
+def _can_use_alarm() -> bool:
+    return hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread()
+
+
+@contextlib.contextmanager
+def time_budget(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Прерывает блок через `seconds` секунд с ParseTimeoutError.
+
+    Работает на SIGALRM, поэтому только в главном потоке и только на Unix,
+    в остальных случаях ограничения нет. Сигнал обрабатывается между байткодами,
+    долгий вызов внутри C-кода (сам ast.parse) прерван не будет: жесткий предел
+    на файл ставит StreamingRunner, убивая зависший процесс-воркер.
+    Вложенный бюджет по выходе восстанавливает таймер внешнего.
+    """
+    if not seconds or not _can_use_alarm():
+        yield
+        return
+
+    def _on_timeout(signum: int, frame: Any) -> None:
+        raise ParseTimeoutError(f'exceeded {seconds:g}s')
+
+    previous_handler = signal.signal(signal.SIGALRM, _on_timeout)
+    previous_delay, previous_interval = signal.setitimer(signal.ITIMER_REAL, seconds)
+    started_at = time.monotonic()
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+        if previous_delay:
+            # внешний бюджет продолжает идти; истекший срабатывает сразу
+            remaining_delay = previous_delay - (time.monotonic() - started_at)
+            signal.setitimer(
+                signal.ITIMER_REAL, max(remaining_delay, MIN_TIMER_DELAY_SECONDS), previous_interval
+            )
+
+
+def call_with_parse_guard(
+    path: str,
+    parse: Callable[[], T],
+    unparsable_errors: Tuple[Type[BaseException], ...] = UNPARSABLE_ERRORS,
+) -> Optional[T]:
+    """Вызывает parse в рамках бюджета времени; битый или зависший файл пропускается."""
+    try:
+        with time_budget(get_parse_limits().timeout_seconds):
+            return parse()
+    except ParseTimeoutError as exc:
+        report_skipped_file(path, SkipReason.TIMED_OUT, str(exc))
+    except unparsable_errors as exc:
+        report_skipped_file(path, SkipReason.UNPARSABLE, str(exc).split('\n')[0])
+    return None
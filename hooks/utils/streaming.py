@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import ast
+import collections
+import multiprocessing
+import sys
+import threading
+import tracemalloc
+from concurrent.futures import Future, ThreadPoolExecutor
+from multiprocessing.pool import AsyncResult, Pool
+from typing import (
+    Callable,
+    Deque,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from hooks.utils.ast_helpers import parse_source_file
+from hooks.utils.diagnostics import Diagnostic
+from hooks.utils.source_file import (
+    SkipReason,
+    SourceFile,
+    get_parse_limits,
+    get_read_ahead,
+    iterate_prefetched_source_files,
+    read_source_file_for_parsing,
+    report_skipped_file,
+)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore
+
+DEFAULT_MAX_PARSED_FILES = 16
+DEFAULT_MEMORY_REPORT_TOP = 10
+# ast-дерево в памяти занимает примерно во столько раз больше исходника
+AST_MEMORY_FACTOR = 30
+# исходник в памяти: байты файла и декодированный текст
+SOURCE_MEMORY_FACTOR = 2
+# худший размер файла для оценки, если max-file-size-kb не задан
+ESTIMATED_MAX_FILE_SIZE_KB = 1024
+
+FileRuleCheck = Callable[[str, ast.Module, str], Sequence[Diagnostic]]
+SelectedFile = Tuple[str, Optional[SourceFile], List['FileRule']]
+
+
+class FileRule(NamedTuple):
+    name: str
+    applies_to: Callable[[str], bool]
+    check: FileRuleCheck
+
+
+class StreamingLimits(NamedTuple):
+    workers: int
+    max_parsed_files: int
+
+
+class MemoryReport(NamedTuple):
+    peak_rss_bytes: Optional[int]
+    traced_current_bytes: int
+    traced_peak_bytes: int
+    top_allocations: Tuple[str, ...]
+
+
+def get_peak_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def get_memory_report(top: int = DEFAULT_MEMORY_REPORT_TOP) -> MemoryReport:
+    if not tracemalloc.is_tracing():
+        return MemoryReport(get_peak_rss_bytes(), 0, 0, ())
+    traced_current_bytes, traced_peak_bytes = tracemalloc.get_traced_memory()
+    statistics = tracemalloc.take_snapshot().statistics('lineno')[:top]
+    return MemoryReport(
+        peak_rss_bytes=get_peak_rss_bytes(),
+        traced_current_bytes=traced_current_bytes,
+        traced_peak_bytes=traced_peak_bytes,
+        top_allocations=tuple(str(statistic) for statistic in statistics),
+    )
+
+
+def _format_megabytes(size_bytes: Optional[int]) -> str:
+    return 'n/a' if size_bytes is None else f'{size_bytes / 2 ** 20:.1f} MiB'
+
+
+def get_limits_for_budget(
+    memory_budget_mb: float,
+    workers: int,
+    max_parsed_files: int,
+    read_ahead: Optional[int] = None,
+    max_file_size_bytes: Optional[int] = None,
+) -> StreamingLimits:
+    """
+    Потоки и число разобранных файлов, которые укладываются в бюджет памяти.
+
+    Из бюджета вычитаются уже занятая процессом память и исходники, прочитанные заранее
+    (`read_ahead + 1` файлов). Каждое место в очереди заданий держит исходник и дерево
+    худшего случая: предельный размер файла, умноженный на AST_MEMORY_FACTOR.
+    Потоков не больше, чем мест в очереди.
+    """
+    if read_ahead is None:
+        read_ahead = get_read_ahead()
+    if max_file_size_bytes is None:
+        max_file_size_bytes = get_parse_limits().max_file_size_bytes
+    if max_file_size_bytes is None:
+        max_file_size_bytes = ESTIMATED_MAX_FILE_SIZE_KB * 1024
+    source_bytes = max_file_size_bytes * SOURCE_MEMORY_FACTOR
+    available_bytes = (
+        int(memory_budget_mb * 2**20)
+        - (get_peak_rss_bytes() or 0)
+        - (max(0, read_ahead) + 1) * source_bytes
+    )
+    budget_parsed_files = available_bytes // (
+        max_file_size_bytes * AST_MEMORY_FACTOR + source_bytes
+    )
+    max_parsed_files = max(1, min(max_parsed_files, budget_parsed_files))
+    return StreamingLimits(max(1, min(workers, max_parsed_files)), max_parsed_files)
+
+
+def can_fork_workers() -> bool:
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+
+# раннер в процессе-воркере: правила с лямбдами не сериализуются и достаются ему через fork
+_worker_runner: Optional[StreamingRunner] = None
+
+
+def _init_worker(runner: StreamingRunner) -> None:
+    global _worker_runner
+    _worker_runner = runner
+
+
+def _check_file_in_worker(
+    filepath: str, source_file: Optional[SourceFile], rule_names: Tuple[str, ...]
+) -> List[Diagnostic]:
+    if _worker_runner is None:
+        return []
+    file_rules = [rule for rule in _worker_runner.rules if rule.name in rule_names]
+    return _worker_runner.check_source_file(filepath, source_file, file_rules)
+
+
+class StreamingRunner:
+    """
+    Прогоняет набор правил по потоку файлов, разбирая каждый файл один раз.
+
+    Разобранными одновременно держатся не больше `max_parsed_files` файлов:
+    дерево отпускается, как только по нему отработали все выбранные правила.
+    Следующие `read_ahead` файлов читаются заранее, пока разбираются текущие.
+    С `timeout_seconds` и несколькими воркерами файлы проверяются в процессах:
+    зависший на файле процесс убивается, файл пропускается, остальные доделываются.
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[FileRule],
+        workers: int = 1,
+        max_parsed_files: int = DEFAULT_MAX_PARSED_FILES,
+        read_ahead: Optional[int] = None,
+        timeout_seconds: Optional[float] = None,
+    ) -> None:
+        self.rules = rules
+        self.read_ahead = read_ahead
+        self.timeout_seconds = timeout_seconds
+        self.max_parsed_files = max(1, max_parsed_files)
+        self.workers = max(1, min(workers, self.max_parsed_files))
+        self.checked_files = 0
+        self.parsed_files = 0
+        self.peak_parsed_files = 0
+        self._parsed_files_slots = threading.BoundedSemaphore(self.max_parsed_files)
+        self._stats_lock = threading.Lock()
+
+    def _update_parsed_files(self, delta: int) -> None:
+        with self._stats_lock:
+            self.parsed_files += delta
+            self.peak_parsed_files = max(self.peak_parsed_files, self.parsed_files)
+
+    def check_file(self, filepath: str, file_rules: Sequence[FileRule]) -> List[Diagnostic]:
+        return self.check_source_file(filepath, read_source_file_for_parsing(filepath), file_rules)
+
+    def check_source_file(
+        self, filepath: str, source_file: Optional[SourceFile], file_rules: Sequence[FileRule]
+    ) -> List[Diagnostic]:
+        with self._parsed_files_slots:
+            self._update_parsed_files(1)
+            try:
+                ast_tree, file_content = parse_source_file(filepath, source_file)
+                if ast_tree is None or file_content is None:
+                    return []
+                errors: List[Diagnostic] = []
+                for rule in file_rules:
+                    errors += rule.check(filepath, ast_tree, file_content)
+                return errors
+            finally:
+                self._update_parsed_files(-1)
+                with self._stats_lock:
+                    self.checked_files += 1
+
+    def _get_file_rules(self, filepath: str) -> List[FileRule]:
+        return [rule for rule in self.rules if rule.applies_to(filepath)]
+
+    def _iterate_selected_files(self, filepaths: Iterable[str]) -> Iterator[SelectedFile]:
+        selected_filepaths = (filepath for filepath in filepaths if self._get_file_rules(filepath))
+        for filepath, source_file in iterate_prefetched_source_files(
+            selected_filepaths, self.read_ahead
+        ):
+            yield filepath, source_file, self._get_file_rules(filepath)
+
+    @property
+    def uses_worker_processes(self) -> bool:
+        return self.workers > 1 and bool(self.timeout_seconds) and can_fork_workers()
+
+    def iterate_errors(self, filepaths: Iterable[str]) -> Iterator[Diagnostic]:
+        """Ошибки в порядке входных файлов; очередь заданий тоже ограничена `max_parsed_files`."""
+        selected_files = self._iterate_selected_files(filepaths)
+        if self.uses_worker_processes:
+            yield from self._iterate_errors_in_processes(selected_files)
+        elif self.workers > 1:
+            yield from self._iterate_errors_in_threads(selected_files)
+        else:
+            for filepath, source_file, file_rules in selected_files:
+                yield from self.check_source_file(filepath, source_file, file_rules)
+
+    def _iterate_errors_in_threads(
+        self, selected_files: Iterable[SelectedFile]
+    ) -> Iterator[Diagnostic]:
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending: Deque[Future[List[Diagnostic]]] = collections.deque()
+            for filepath, source_file, file_rules in selected_files:
+                pending.append(
+                    executor.submit(self.check_source_file, filepath, source_file, file_rules)
+                )
+                if len(pending) >= self.max_parsed_files:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    def _start_pool(self) -> Pool:
+        return multiprocessing.get_context('fork').Pool(
+            self.workers, initializer=_init_worker, initargs=(self,)
+        )
+
+    @staticmethod
+    def _submit(pool: Pool, selected_file: SelectedFile) -> AsyncResult[List[Diagnostic]]:
+        filepath, source_file, file_rules = selected_file
+        rule_names = tuple(rule.name for rule in file_rules)
+        return pool.apply_async(_check_file_in_worker, (filepath, source_file, rule_names))
+
+    def _iterate_errors_in_processes(
+        self, selected_files: Iterable[SelectedFile]
+    ) -> Iterator[Diagnostic]:
+        pending: Deque[Tuple[SelectedFile, AsyncResult[List[Diagnostic]]]] = collections.deque()
+        pool = self._start_pool()
+        try:
+            for selected_file in selected_files:
+                pending.append((selected_file, self._submit(pool, selected_file)))
+                with self._stats_lock:
+                    self.peak_parsed_files = max(
+                        self.peak_parsed_files, min(len(pending), self.workers)
+                    )
+                if len(pending) >= self.max_parsed_files:
+                    pool = yield from self._pop_process_result(pool, pending)
+            while pending:
+                pool = yield from self._pop_process_result(pool, pending)
+        finally:
+            pool.terminate()
+
+    def _pop_process_result(
+        self, pool: Pool, pending: Deque[Tuple[SelectedFile, AsyncResult[List[Diagnostic]]]]
+    ) -> Generator[Diagnostic, None, Pool]:
+        """
+        Ждет первое задание очереди не дольше `timeout_seconds`.
+
+        Все задания до него уже забраны, а пул берет их по порядку, так что отсчет
+        с этого момента не короче реального времени проверки файла.
+        Зависшее задание не прервать, поэтому пул пересоздается, а незавершенные
+        задания отправляются заново.
+        """
+        selected_file, async_result = pending.popleft()
+        with self._stats_lock:
+            self.checked_files += 1
+        try:
+            errors = async_result.get(self.timeout_seconds)
+        except multiprocessing.TimeoutError:
+            report_skipped_file(
+                selected_file[0], SkipReason.TIMED_OUT, f'exceeded {self.timeout_seconds:g}s'
+            )
+            pool.terminate()
+            pool = self._start_pool()
+            for index, (pending_file, pending_result) in enumerate(pending):
+                if not pending_result.ready():
+                    pending[index] = (pending_file, self._submit(pool, pending_file))
+            return pool
+        yield from errors
+        return pool
+
+    def format_memory_report(self, memory_report: MemoryReport) -> str:
+        lines = [
+            f'checked files: {self.checked_files}, workers: {self.workers}, '
+            f'peak parsed files: {self.peak_parsed_files}/{self.max_parsed_files}',
+            f'peak RSS: {_format_megabytes(memory_report.peak_rss_bytes)}',
+        ]
+        if memory_report.top_allocations:
+            lines.append(
+                f'tracemalloc: current {_format_megabytes(memory_report.traced_current_bytes)}, '
+                f'peak {_format_megabytes(memory_report.traced_peak_bytes)}'
+            )
+            lines.extend(f'  {allocation}' for allocation in memory_report.top_allocations)
+        return '\n'.join(lines)
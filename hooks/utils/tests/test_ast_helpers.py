@@ -6,6 +6,9 @@ import pytest
 
 from hooks.utils.ast_helpers import (
     _is_classdef_has_base_classes,
+    extract_all_variable_names,
+    extract_variable_names_by_funcdef,
+    get_all_funcdefs,
     get_assign_name,
     get_ast_node_lineno,
     get_full_imported_name,
@@ -99,3 +102,27 @@ def test__is_classdef_has_base_classes_success_case(
     actual_result = _is_classdef_has_base_classes(classdef_node, base_classess, module_name)
 
     assert actual_result == classdef_check
+
+
+def test__extract_variable_names_by_funcdef__matches_per_funcdef_extraction():
+    ast_tree = ast.parse(
+        'def outer(a, b=1):\n'
+        '    c: int = 1\n'
+        '    for d, e in []:\n'
+        '        pass\n'
+        '    async def inner(f):\n'
+        '        g = 1\n'
+        '        def innermost(h):\n'
+        '            i = 1\n'
+        'class Foo:\n'
+        '    def method(self, j):\n'
+        '        k = 1\n'
+    )
+
+    var_names_by_funcdef = extract_variable_names_by_funcdef(ast_tree)
+
+    assert set(var_names_by_funcdef) == set(get_all_funcdefs(ast_tree))
+    for funcdef, var_names in var_names_by_funcdef.items():
+        assert sorted(var_names, key=lambda v: (v[0], id(v[1]))) == sorted(
+            extract_all_variable_names(funcdef), key=lambda v: (v[0], id(v[1]))
+        )
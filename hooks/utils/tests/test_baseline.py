@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import argparse
+
+import pytest
+
+from hooks.utils.baseline import (
+    BASELINE_MAGIC,
+    Baseline,
+    _get_source_lines,
+    add_baseline_arguments,
+    get_fingerprint,
+    get_project_root,
+    report_new_diagnostics,
+    validate_baseline_arguments,
+    write_baseline,
+)
+from hooks.validate_ajustable_complexity import ComplexityError
+from hooks.validate_api_schema_annotations import ApiClassSchemaError, ApiSchemaError
+
+
+@pytest.fixture(autouse=True)
+def clear_source_lines_cache():
+    _get_source_lines.cache_clear()
+    get_project_root.cache_clear()
+    yield
+    _get_source_lines.cache_clear()
+    get_project_root.cache_clear()
+
+
+def test__get_fingerprint__survives_line_shifts_but_not_code_changes(tmp_path):
+    module_path = tmp_path / 'module.py'
+    module_path.write_text('def process(a, b):\n    pass\n')
+    error = ComplexityError(str(module_path), 1, 'process', 12, 9)
+    fingerprint = get_fingerprint(error, base_dir=str(tmp_path))
+
+    module_path.write_text('import os\n\n\ndef  process(a, b):\n    pass\n')
+    _get_source_lines.cache_clear()
+    shifted_error = ComplexityError(str(module_path), 4, 'process', 13, 9)
+    assert get_fingerprint(shifted_error, base_dir=str(tmp_path)) == fingerprint
+
+    module_path.write_text('def process(a, b, c):\n    pass\n')
+    _get_source_lines.cache_clear()
+    changed_error = ComplexityError(str(module_path), 1, 'process', 12, 9)
+    assert get_fingerprint(changed_error, base_dir=str(tmp_path)) != fingerprint
+
+
+def test__get_fingerprint__is_relative_to_project_root(tmp_path, monkeypatch):
+    (tmp_path / 'pyproject.toml').write_text('')
+    package_path = tmp_path / 'package'
+    package_path.mkdir()
+    module_path = package_path / 'module.py'
+    module_path.write_text('def process(a, b):\n    pass\n')
+    error = ComplexityError(str(module_path), 1, 'process', 12, 9)
+
+    monkeypatch.chdir(tmp_path)
+    root_fingerprint = get_fingerprint(error)
+    monkeypatch.chdir(package_path)
+
+    assert get_project_root(str(package_path)) == str(tmp_path)
+    assert get_fingerprint(error) == root_fingerprint == get_fingerprint(error, str(tmp_path))
+
+
+def test__api_schema_error__formats_line_only_for_member_errors(tmp_path):
+    views_path = str(tmp_path / 'views.py')
+    line_error = ApiSchemaError(views_path, 5, 'get missed docstring')
+    class_error = ApiClassSchemaError(views_path, 4, 'FooView missed schema tags attribute')
+
+    assert line_error.format() == f'{views_path}::5 get missed docstring'
+    assert class_error.format() == f'{views_path}:FooView missed schema tags attribute'
+    assert (class_error.line, class_error.reason) == (4, 'FooView missed schema tags attribute')
+
+
+def test__baseline__is_mmapped_sorted_fingerprints(tmp_path):
+    module_path = tmp_path / 'module.py'
+    module_path.write_text('def first():\n    pass\n\n\ndef second():\n    pass\n')
+    known_error = ComplexityError(str(module_path), 1, 'first', 12, 9)
+    new_error = ComplexityError(str(module_path), 5, 'second', 12, 9)
+    baseline_path = str(tmp_path / '.hooks-baseline')
+
+    assert write_baseline(baseline_path, [known_error, known_error]) == 1
+    with open(baseline_path, 'rb') as baseline_file:
+        assert baseline_file.read().startswith(BASELINE_MAGIC)
+
+    baseline = Baseline.load(baseline_path)
+    assert len(baseline) == 1
+    assert baseline.is_known(known_error)
+    assert list(baseline.iterate_new([known_error, new_error])) == [new_error]
+
+
+def test__baseline__missing_file_is_empty_and_foreign_file_fails(tmp_path):
+    assert len(Baseline.load(str(tmp_path / 'missing'))) == 0
+
+    foreign_path = tmp_path / 'foreign'
+    foreign_path.write_bytes(b'not a baseline file at all')
+    with pytest.raises(ValueError):
+        Baseline.load(str(foreign_path))
+
+
+def test__baseline__truncated_file_fails(tmp_path):
+    truncated_path = tmp_path / 'truncated'
+    truncated_path.write_bytes(BASELINE_MAGIC + bytes(12))
+
+    with pytest.raises(ValueError, match='is truncated'):
+        Baseline.load(str(truncated_path))
+
+
+def test__validate_baseline_arguments__update_requires_baseline(capsys):
+    parser = argparse.ArgumentParser()
+    add_baseline_arguments(parser)
+
+    validate_baseline_arguments(parser, parser.parse_args(['--baseline', 'b', '--update-baseline']))
+    with pytest.raises(SystemExit):
+        validate_baseline_arguments(parser, parser.parse_args(['--update-baseline']))
+    assert '--update-baseline requires --baseline' in capsys.readouterr().err
+
+
+def test__report_new_diagnostics__updates_then_filters_baseline(tmp_path, capsys):
+    module_path = tmp_path / 'module.py'
+    module_path.write_text('def process():\n    pass\n')
+    errors = [ComplexityError(str(module_path), 1, 'process', 12, 9)]
+    baseline_path = str(tmp_path / '.hooks-baseline')
+
+    assert report_new_diagnostics(errors, baseline_path, update_baseline=True) == 0
+    assert report_new_diagnostics(errors, baseline_path) == 0
+    assert report_new_diagnostics(errors) == 1
+    assert capsys.readouterr().out == f'{module_path}:1 process is too complex (12 > 9)\n'
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import textwrap
+
+import pytest
+
+from hooks.utils.class_hierarchy import ClassHierarchy
+from hooks.utils.disk_cache import get_disk_cache
+from hooks.utils.mypy_api_helpers import _load_pyproject_toml
+from hooks.utils.source_file import get_parse_limits
+
+
+@pytest.fixture(autouse=True)
+def clear_config_caches() -> None:
+    _load_pyproject_toml.cache_clear()
+    get_disk_cache.cache_clear()
+    get_parse_limits.cache_clear()
+    yield
+    _load_pyproject_toml.cache_clear()
+    get_disk_cache.cache_clear()
+    get_parse_limits.cache_clear()
+
+
+def _write_module(base_dir, relative_path: str, source: str) -> str:
+    module_file = base_dir / relative_path
+    module_file.parent.mkdir(parents=True, exist_ok=True)
+    module_file.write_text(textwrap.dedent(source), encoding='utf-8')
+    return str(module_file)
+
+
+@pytest.fixture()
+def project_dir(tmp_path):
+    _write_module(tmp_path, 'core/__init__.py', 'from .views import BaseView\n')
+    _write_module(
+        tmp_path,
+        'core/views.py',
+        '''\
+        from restdoctor.rest_framework import views
+
+
+        class BaseView(views.GenericAPIView):
+            pass
+        ''',
+    )
+    _write_module(
+        tmp_path,
+        'core/cycle.py',
+        '''\
+        class First(Second):
+            pass
+
+
+        class Second(First):
+            pass
+        ''',
+    )
+    return tmp_path
+
+
+def test__get_ancestors__resolves_bases_through_other_modules_and_reexports(project_dir):
+    api_views = _write_module(
+        project_dir,
+        'app/api/views.py',
+        '''\
+        from core import BaseView as ProjectBaseView
+
+
+        class OrderView(ProjectBaseView):
+            pass
+        ''',
+    )
+    class_hierarchy = ClassHierarchy(str(project_dir))
+
+    qualified_name = class_hierarchy.get_qualified_name(api_views, 'OrderView')
+
+    assert qualified_name == 'app.api.views.OrderView'
+    assert class_hierarchy.get_ancestors(qualified_name) == {
+        'core.views.BaseView',
+        'restdoctor.rest_framework.views.GenericAPIView',
+    }
+    assert class_hierarchy.is_subclass_of(qualified_name, {'GenericAPIView'})
+    assert not class_hierarchy.is_subclass_of(qualified_name, {'GenericViewSet'})
+
+
+def test__get_ancestors__survives_inheritance_cycles(project_dir):
+    class_hierarchy = ClassHierarchy(str(project_dir))
+
+    assert class_hierarchy.get_ancestors('core.cycle.First') == {
+        'core.cycle.First',
+        'core.cycle.Second',
+    }
+    assert class_hierarchy.get_ancestors('unknown.module.Class') == frozenset()
+
+
+def test__class_hierarchy__reuses_cached_module_symbols(project_dir, monkeypatch, mocker):
+    monkeypatch.chdir(project_dir)
+    project_dir.joinpath('pyproject.toml').write_text(
+        '[tool.pre_commit_hooks]\ncache-dir = ".hooks_cache"\n', encoding='utf-8'
+    )
+    expected_ancestors = ClassHierarchy().get_ancestors('core.BaseView')
+
+    parse_mock = mocker.patch('hooks.utils.class_hierarchy.parse_ast_tree')
+    cached_ancestors = ClassHierarchy().get_ancestors('core.BaseView')
+
+    parse_mock.assert_not_called()
+    assert cached_ancestors == expected_ancestors
+    assert 'restdoctor.rest_framework.views.GenericAPIView' in cached_ancestors
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import ast
+import textwrap
+
+from hooks.utils.comments import build_comment_index
+
+SOURCE = textwrap.dedent('''\
+    first = Field(  # leading
+        null=True,  # argument comment
+    )  # trailing
+    second = Field(null=True)  # trailing only
+    third = Field(
+        null=True,
+    )
+    fourth = Field(  # leading only
+    )
+    ''')
+
+
+def test__comment_index__attaches_leading_and_trailing_comments():
+    comment_index = build_comment_index(SOURCE)
+    assigns = ast.parse(SOURCE).body
+
+    assert [
+        (
+            comment_index.get_leading_comment(assign.value),
+            comment_index.get_trailing_comment(assign),
+        )
+        for assign in assigns
+    ] == [
+        ('# leading', '# trailing'),
+        (None, '# trailing only'),
+        (None, None),
+        ('# leading only', None),
+    ]
+
+
+def test__build_comment_index__survives_broken_source():
+    comment_index = build_comment_index('x = (  # comment\n')
+
+    assert comment_index.get_comment_after(1, 0) == '# comment'
+
+
+def test__comment_index__matches_ast_byte_offsets_after_non_ascii_text():
+    source = "name = Field(verbose_name='Имя', null=True)  # null_by_design\n"
+    assign = ast.parse(source).body[0]
+
+    assert build_comment_index(source).get_trailing_comment(assign) == '# null_by_design'
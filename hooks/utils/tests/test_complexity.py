@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import ast
+
+from hooks.utils.ast_helpers import get_all_funcdefs
+from hooks.utils.complexity import (
+    FunctionComplexity,
+    get_functions_complexity,
+    get_node_mccabe_complexity,
+)
+
+SOURCE = """
+def outer(a):
+    if a:
+        return 1
+
+    def inner(b):
+        for c in b:
+            if c:
+                continue
+        return b
+
+    return inner
+
+
+class Foo:
+    async def method(self, d):
+        try:
+            pass
+        except ValueError:
+            pass
+        while d:
+            d -= 1
+
+
+if True:
+    def conditional():
+        with open('x'):
+            pass
+"""
+
+
+def test__get_functions_complexity__matches_per_function_mccabe_complexity():
+    ast_tree = ast.parse(SOURCE)
+
+    functions_complexity = get_functions_complexity(ast_tree)
+
+    assert set(functions_complexity) == set(get_all_funcdefs(ast_tree))
+    for funcdef, function_complexity in functions_complexity.items():
+        assert function_complexity.complexity == get_node_mccabe_complexity(funcdef)
+
+
+def test__get_functions_complexity__counts_branches_including_nested_functions():
+    ast_tree = ast.parse(SOURCE)
+
+    complexity_by_name = {
+        funcdef.name: complexity
+        for funcdef, complexity in get_functions_complexity(ast_tree).items()
+    }
+
+    assert complexity_by_name == {
+        'outer': FunctionComplexity(complexity=5, branches=3),
+        'inner': FunctionComplexity(complexity=3, branches=2),
+        'method': FunctionComplexity(complexity=4, branches=2),
+        'conditional': FunctionComplexity(complexity=1, branches=0),
+    }
@@ -4,6 +4,7 @@ import pytest
 
 from hooks.utils.mypy_api_helpers import (
     _load_pyproject_toml,
+    get_bool_param_from_configs,
     get_exclude_dirs_from_config,
     get_list_param_from_config,
     get_list_param_from_configs,
@@ -245,3 +246,22 @@ def test__get_list_param_from_configs__returns_empty_list_when_missing(
     tmp_path.joinpath('setup.cfg').write_text('[flake8]\nmax-line-length = 120\n', encoding='utf-8')
 
     assert get_list_param_from_configs('flake8', 'per-path-max-complexity') == []
+
+
+@pytest.mark.parametrize(
+    'config_source, config_content, expected_value',
+    [
+        ('pyproject.toml', '[tool.project_structure]\nflag = true\n', True),
+        ('pyproject.toml', '[tool.project_structure]\nflag = false\n', False),
+        ('setup.cfg', '[project_structure]\nflag = yes\n', True),
+        ('setup.cfg', '[project_structure]\nflag = 0\n', False),
+        ('setup.cfg', '[project_structure]\nother = 1\n', False),
+    ],
+)
+def test__get_bool_param_from_configs__parses_both_formats(
+    tmp_path, monkeypatch: pytest.MonkeyPatch, config_source, config_content, expected_value
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    tmp_path.joinpath(config_source).write_text(config_content, encoding='utf-8')
+
+    assert get_bool_param_from_configs('project_structure', 'flag') == expected_value
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import io
+import sys
+
+from hooks.utils.diagnostics import Diagnostic, report_diagnostics
+
+
+class FieldError(Diagnostic):
+    __slots__ = ('field',)
+
+    rule_id = 'field-error'
+    fields = __slots__
+    message_template = '{path}:{line}:{col} Field "{0}" is invalid'
+
+    def __init__(self, path: str, line: int, col: int, field: str) -> None:
+        super().__init__(path, line, col)
+        self.field = field
+
+
+def test__diagnostic__is_compact_and_interns_path_and_rule_id():
+    first_error = FieldError(''.join(['app/', 'models.py']), 3, 4, 'uuid')
+    second_error = FieldError(''.join(['app/', 'models.py']), 5, 4, 'name')
+
+    assert not hasattr(first_error, '__dict__')
+    assert first_error.path is second_error.path
+    assert first_error.rule == 'field-error'
+    assert first_error.rule is sys.intern(''.join(['field-', 'error']))
+
+
+def test__diagnostic__formats_on_demand_and_compares_by_value():
+    error = FieldError('', 3, 4, 'uuid')
+    located_error = error.with_path('app/models.py')
+
+    assert located_error.format() == 'app/models.py:3:4 Field "uuid" is invalid'
+    assert str(located_error) == located_error.format()
+    assert located_error == FieldError('app/models.py', 3, 4, 'uuid')
+    assert located_error != error
+    assert error.path == ''
+    assert sorted([located_error, error]) == [error, located_error]
+    assert repr(error) == "FieldError(path='', line=3, col=4, field='uuid')"
+
+
+def test__report_diagnostics__writes_messages_and_counts_them():
+    stream = io.StringIO()
+
+    count = report_diagnostics(
+        [Diagnostic('app/views.py', 7), FieldError('app/models.py', 3, 4, 'uuid')], stream
+    )
+
+    assert count == 2
+    assert stream.getvalue() == 'app/views.py:7\napp/models.py:3:4 Field "uuid" is invalid\n'
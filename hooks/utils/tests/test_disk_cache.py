@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import os
+import time
+
+import pytest
+
+from hooks.utils.disk_cache import DiskCache, get_cache_version_tag, get_disk_cache
+from hooks.utils.mypy_api_helpers import _load_pyproject_toml
+from hooks.utils.source_file import ParseTimeoutError
+
+
+@pytest.fixture(autouse=True)
+def clear_config_caches() -> None:
+    _load_pyproject_toml.cache_clear()
+    get_disk_cache.cache_clear()
+    yield
+    _load_pyproject_toml.cache_clear()
+    get_disk_cache.cache_clear()
+
+
+def test__disk_cache__stores_entries_per_python_version(tmp_path):
+    cache = DiskCache(str(tmp_path), 'imports', max_size_bytes=1024 * 1024)
+
+    cache.store('abcdef', {'answer': 42})
+
+    assert cache.load('abcdef') == {'answer': 42}
+    assert (tmp_path / 'imports' / get_cache_version_tag() / 'ab' / 'abcdef.pickle').is_file()
+
+
+def test__disk_cache__separates_schema_versions(tmp_path):
+    old_cache = DiskCache(str(tmp_path), 'imports', max_size_bytes=1024 * 1024)
+    new_cache = DiskCache(str(tmp_path), 'imports', max_size_bytes=1024 * 1024, schema_version=2)
+
+    old_cache.store('abcdef', ('name', 1))
+
+    assert new_cache.load('abcdef') is None
+    assert get_cache_version_tag(2).endswith('-s2')
+
+
+def test__disk_cache__counts_overwritten_entry_once(tmp_path):
+    cache = DiskCache(str(tmp_path), 'imports', max_size_bytes=1024 * 1024)
+
+    cache.store('abcdef', 'x' * 1000)
+    size_bytes = cache._get_size_bytes()
+    cache.store('abcdef', 'x' * 1000)
+
+    assert cache._get_size_bytes() == size_bytes
+
+
+def test__disk_cache__returns_none_for_missing_and_broken_entries(tmp_path):
+    cache = DiskCache(str(tmp_path), 'imports', max_size_bytes=1024 * 1024)
+    cache.store('broken', 'value')
+    broken_entry = tmp_path / 'imports' / get_cache_version_tag() / 'br' / 'broken.pickle'
+    broken_entry.write_bytes(b'not a pickle')
+
+    assert cache.load('missing') is None
+    assert cache.load('broken') is None
+
+
+def test__disk_cache__evicts_least_recently_used_entries(tmp_path):
+    payload = 'x' * 1000
+    cache = DiskCache(str(tmp_path), 'imports', max_size_bytes=3000)
+    cache.store('aa_old', payload)
+    cache.store('bb_used', payload)
+    entries_dir = tmp_path / 'imports' / get_cache_version_tag()
+    os.utime(entries_dir / 'aa' / 'aa_old.pickle', (1, 1))
+    os.utime(entries_dir / 'bb' / 'bb_used.pickle', (2, 2))
+    cache.load('bb_used')
+
+    cache.store('cc_new', payload)
+
+    assert cache.load('aa_old') is None
+    assert cache.load('bb_used') == payload
+    assert cache.load('cc_new') == payload
+
+
+def test__disk_cache__removes_temp_file_when_store_is_interrupted(tmp_path, mocker):
+    cache = DiskCache(str(tmp_path), 'imports', max_size_bytes=1024 * 1024)
+    mocker.patch('hooks.utils.disk_cache.os.replace', side_effect=ParseTimeoutError('exceeded 1s'))
+
+    with pytest.raises(ParseTimeoutError):
+        cache.store('abcdef', 'value')
+
+    assert list((tmp_path / 'imports' / get_cache_version_tag() / 'ab').iterdir()) == []
+
+
+def test__disk_cache__removes_stale_temp_files(tmp_path):
+    cache = DiskCache(str(tmp_path), 'imports', max_size_bytes=1024 * 1024)
+    entries_dir = tmp_path / 'imports' / get_cache_version_tag() / 'ab'
+    entries_dir.mkdir(parents=True)
+    stale_temp = entries_dir / 'stale.tmp'
+    fresh_temp = entries_dir / 'fresh.tmp'
+    stale_temp.write_bytes(b'partial')
+    fresh_temp.write_bytes(b'partial')
+    stale_mtime = time.time() - 2 * 3600
+    os.utime(stale_temp, (stale_mtime, stale_mtime))
+
+    cache.store('abcdef', 'value')
+
+    assert not stale_temp.exists()
+    assert fresh_temp.exists()
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import textwrap
+
+import pytest
+
+from hooks.utils.disk_cache import get_disk_cache
+from hooks.utils.django_models import get_models_module
+from hooks.utils.mypy_api_helpers import _load_pyproject_toml
+from hooks.utils.source_file import get_parse_limits
+
+MODELS_SOURCE = textwrap.dedent('''\
+    import logging
+
+    from django.db import models
+
+    logger = logging.getLogger(__name__)
+
+
+    class Order(models.Model):
+        uuid = models.UUIDField(  # null_for_compatibility
+            default=uuid4, unique=True, null=True
+        )
+        number: str = models.CharField(max_length=10)  # deprecated TICKET-1 01.01.2021
+        status = models.CharField(
+            max_length=10, null=True,  # not a leading comment
+        )
+        created = models.DateTimeField(auto_now_add=True)
+        ordering = ['id']
+
+        class Meta:
+            ordering = ['id']
+
+
+    def helper():
+        pass
+    ''')
+
+
+@pytest.fixture(autouse=True)
+def clear_config_caches() -> None:
+    _load_pyproject_toml.cache_clear()
+    get_disk_cache.cache_clear()
+    get_parse_limits.cache_clear()
+    yield
+    _load_pyproject_toml.cache_clear()
+    get_disk_cache.cache_clear()
+    get_parse_limits.cache_clear()
+
+
+def test__get_models_module__collects_fields_with_comments(tmp_path):
+    models_file = tmp_path / 'models.py'
+    models_file.write_text(MODELS_SOURCE, encoding='utf-8')
+
+    models_module = get_models_module(str(models_file))
+
+    assert models_module is not None
+    assert [(model.name, model.is_django_model) for model in models_module.classes] == [
+        ('Order', True),
+        ('Meta', False),
+    ]
+    uuid_field, number_field, status_field, created_field = models_module.iterate_fields()
+    assert (uuid_field.name, uuid_field.field_type, uuid_field.lineno) == ('uuid', 'UUIDField', 9)
+    assert uuid_field.get_kwarg('null') == 'True'
+    assert uuid_field.leading_comment == '# null_for_compatibility'
+    assert uuid_field.trailing_comment is None
+    assert number_field.is_annotated
+    assert number_field.trailing_comment == '# deprecated TICKET-1 01.01.2021'
+    assert status_field.leading_comment is None
+    assert status_field.trailing_comment is None
+    assert created_field.kwargs == (('auto_now_add', 'True'),)
+    assert models_module.misplaced_statement_linenos == (23,)
+
+
+def test__get_models_module__marks_fields_sharing_line_with_semicolon(tmp_path):
+    models_file = tmp_path / 'models.py'
+    models_file.write_text(
+        'class Order(models.Model):\n'
+        '    created = models.DateTimeField(); updated = models.DateTimeField()\n'
+        '    number = models.IntegerField()\n',
+        encoding='utf-8',
+    )
+
+    models_module = get_models_module(str(models_file))
+
+    assert models_module is not None
+    assert [(field.name, field.is_line_statement) for field in models_module.iterate_fields()] == [
+        ('created', False),
+        ('updated', False),
+        ('number', True),
+    ]
+
+
+def test__get_models_module__reuses_cached_index(tmp_path, monkeypatch, mocker):
+    monkeypatch.chdir(tmp_path)
+    tmp_path.joinpath('pyproject.toml').write_text(
+        '[tool.pre_commit_hooks]\ncache-dir = ".hooks_cache"\n', encoding='utf-8'
+    )
+    models_file = tmp_path / 'models.py'
+    models_file.write_text(MODELS_SOURCE, encoding='utf-8')
+    other_models_file = tmp_path / 'other' / 'models.py'
+    other_models_file.parent.mkdir()
+    other_models_file.write_text(MODELS_SOURCE, encoding='utf-8')
+
+    expected_module = get_models_module(str(models_file))
+    parse_mock = mocker.patch('hooks.utils.django_models.parse_ast_tree')
+    cached_module = get_models_module(str(other_models_file))
+
+    parse_mock.assert_not_called()
+    assert expected_module is not None and cached_module is not None
+    assert cached_module.path == str(other_models_file)
+    assert cached_module.classes == expected_module.classes
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import pytest
+
+from hooks.utils.file_roles import FileRole, classify_path, has_any_role
+from hooks.utils.pre_commit import get_input_files
+
+
+@pytest.mark.parametrize(
+    'filepath, expected_roles',
+    [
+        ('/app/models.py', FileRole.MODELS),
+        ('/app/models/patient.py', FileRole.MODELS),
+        ('/app/models/clinic/patient.py', FileRole.MODELS),
+        ('/app/models/patient.html', FileRole.NONE),
+        ('/app/settings/base.py', FileRole.SETTINGS),
+        ('/app/settings/__init__.py', FileRole.NONE),
+        ('/app/api/v1/views.py', FileRole.API | FileRole.API_SCHEMA | FileRole.VIEWS),
+        (
+            '/app/api/serializers/patient.py',
+            FileRole.API | FileRole.API_SCHEMA | FileRole.SERIALIZERS,
+        ),
+        ('/app/rest_in_peace/api/views.py', FileRole.VIEWS),
+        ('/app/api/urls.py', FileRole.API | FileRole.URLS),
+        ('/app/migrations/0001_initial.py', FileRole.MIGRATIONS),
+        ('/app/tests/test_models.py', FileRole.TESTS),
+        ('/app/tests/helpers.py', FileRole.NONE),
+    ],
+)
+def test__classify_path__tags_path_with_roles(filepath, expected_roles):
+    assert classify_path(filepath) == expected_roles
+
+
+def test__has_any_role__matches_any_of_subscribed_roles():
+    assert has_any_role('/app/models.py', FileRole.MODELS | FileRole.SETTINGS)
+    assert not has_any_role('/app/services.py', FileRole.MODELS | FileRole.SETTINGS)
+
+
+def test__get_input_files__yields_only_files_with_subscribed_roles(tmp_path):
+    settings_directory = tmp_path / 'app' / 'settings'
+    settings_directory.mkdir(parents=True)
+    settings_file = settings_directory / 'base.py'
+    settings_file.write_text('DEBUG = False\n', encoding='utf-8')
+    (settings_directory / '__init__.py').write_text('', encoding='utf-8')
+    (tmp_path / 'app' / 'models.py').write_text('', encoding='utf-8')
+
+    result = list(get_input_files([str(tmp_path)], dirs_to_exclude=[], roles=FileRole.SETTINGS))
+
+    assert result == [str(settings_file.resolve())]
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import pytest
+
+from hooks.utils.disk_cache import get_disk_cache
+from hooks.utils.import_graph import (
+    DottedNameTrie,
+    ImportedName,
+    ImportGraph,
+    ModuleNameCollision,
+    add_project_packages,
+    build_import_graph,
+    get_file_imports,
+    get_reachable_names,
+    get_strongly_connected_components,
+    is_project_root,
+    report_module_name_collisions,
+)
+from hooks.utils.mypy_api_helpers import _load_pyproject_toml
+from hooks.utils.source_file import get_parse_limits
+
+
+@pytest.fixture(autouse=True)
+def clear_config_caches() -> None:
+    _load_pyproject_toml.cache_clear()
+    get_disk_cache.cache_clear()
+    get_parse_limits.cache_clear()
+    yield
+    _load_pyproject_toml.cache_clear()
+    get_disk_cache.cache_clear()
+    get_parse_limits.cache_clear()
+
+
+@pytest.mark.parametrize(
+    'name, expected_result',
+    [
+        ('django', True),
+        ('django.db', True),
+        ('django.db.backends', True),
+        ('django.db.backends.utils', False),
+        ('django.dbx', False),
+        ('requests', True),
+        ('requests.adapters', False),
+        ('flask', False),
+    ],
+)
+def test__dotted_name_trie__matches_names_and_their_prefixes(name, expected_result):
+    trie = DottedNameTrie(['django.db.backends', 'requests'])
+
+    assert trie.matches(name) == expected_result
+
+
+def test__dotted_name_trie__empty_trie_matches_nothing():
+    assert not DottedNameTrie().matches('django')
+
+
+def test__build_import_graph__answers_who_imports_queries(tmp_path):
+    (tmp_path / 'orders').mkdir()
+    (tmp_path / 'orders' / '__init__.py').write_text('', encoding='utf-8')
+    (tmp_path / 'orders' / 'models.py').write_text(
+        'from django.db import models\nimport json\n', encoding='utf-8'
+    )
+    (tmp_path / 'orders' / 'views.py').write_text(
+        'import json\n\nfrom orders.models import Order\n', encoding='utf-8'
+    )
+
+    import_graph = build_import_graph(
+        [str(path) for path in sorted((tmp_path / 'orders').iterdir())], base_dir=str(tmp_path)
+    )
+
+    assert import_graph.get_importers('json') == [('orders.models', 2), ('orders.views', 1)]
+    assert import_graph.get_importers('orders.models') == [('orders.views', 3)]
+    assert import_graph.get_importers('django') == [('orders.models', 1)]
+    assert import_graph.imports_by_module['orders'] == []
+
+
+def test__get_file_imports__reuses_cached_imports(tmp_path, monkeypatch, mocker):
+    monkeypatch.chdir(tmp_path)
+    tmp_path.joinpath('pyproject.toml').write_text(
+        '[tool.pre_commit_hooks]\ncache-dir = ".hooks_cache"\n', encoding='utf-8'
+    )
+    py_file = tmp_path / 'module.py'
+    py_file.write_text('import os\nfrom json import loads\n', encoding='utf-8')
+
+    expected_imports = get_file_imports(str(py_file))
+    parse_mock = mocker.patch('hooks.utils.import_graph.parse_ast_tree')
+
+    assert (
+        get_file_imports(str(py_file)) == expected_imports == [('os', 1, 0), ('json.loads', 2, 0)]
+    )
+    parse_mock.assert_not_called()
+
+
+def test__get_strongly_connected_components__returns_components_in_reverse_topological_order():
+    successors = {'a': ['b'], 'b': ['c', 'a'], 'c': ['d'], 'd': ['c'], 'e': []}
+
+    components = get_strongly_connected_components(successors, successors.__getitem__)
+
+    assert [sorted(component) for component in components] == [['c', 'd'], ['a', 'b'], ['e']]
+
+
+def _write_modules(base_dir, modules_content):
+    for relative_path, content in modules_content.items():
+        module_path = base_dir / relative_path
+        module_path.parent.mkdir(parents=True, exist_ok=True)
+        module_path.write_text(content, encoding='utf-8')
+
+
+def test__add_project_packages__resolves_reachable_names_through_cycles(tmp_path):
+    _write_modules(
+        tmp_path,
+        {
+            'orders/__init__.py': '',
+            'orders/views.py': 'from orders.services import create_order\n',
+            'orders/services.py': 'from . import models\nfrom billing.api import charge\n',
+            'orders/models.py': 'from orders.services import create_order\n',
+            'billing/__init__.py': '',
+            'billing/api.py': 'import requests\n',
+            'billing/unused.py': 'import django.db.backends\n',
+        },
+    )
+    import_graph = build_import_graph([str(tmp_path / 'orders' / 'views.py')], str(tmp_path))
+
+    add_project_packages(import_graph, str(tmp_path), dirs_to_exclude=[])
+    reachable_names = get_reachable_names(
+        import_graph, {'billing.api': ['requests'], 'billing.unused': ['django.db.backends']}
+    )
+
+    assert import_graph.get_local_dependencies('orders.services') == [
+        ('orders.models', 1),
+        ('billing.api', 2),
+    ]
+    assert reachable_names['orders.views'] == {'requests'}
+    assert reachable_names['orders.models'] == {'requests'}
+    assert reachable_names['billing.unused'] == {'django.db.backends'}
+    assert reachable_names['billing'] == frozenset()
+
+
+def test__build_import_graph__reports_module_name_collisions(tmp_path, capsys):
+    _write_modules(
+        tmp_path,
+        {'first/orders/models.py': 'import os\n', 'second/orders/models.py': 'import sys\n'},
+    )
+    first_path = str(tmp_path / 'first' / 'orders' / 'models.py')
+    second_path = str(tmp_path / 'second' / 'orders' / 'models.py')
+
+    import_graph = ImportGraph()
+    import_graph.add_module('orders.models', first_path, [ImportedName('os', 1)])
+    import_graph.add_module('orders.models', second_path, [ImportedName('sys', 1)])
+    report_module_name_collisions(import_graph)
+
+    assert import_graph.filepath_by_module['orders.models'] == first_path
+    assert import_graph.collisions == [
+        ModuleNameCollision('orders.models', second_path, first_path)
+    ]
+    assert f'{second_path}: skipped: module orders.models' in capsys.readouterr().err
+
+
+def test__add_project_packages__skips_roots_outside_base_dir(tmp_path):
+    _write_modules(
+        tmp_path,
+        {
+            'project/orders/views.py': 'from ..outside import helpers\n',
+            'outside/helpers.py': 'import requests\n',
+            'outside/unused.py': 'import django\n',
+        },
+    )
+    base_dir = str(tmp_path / 'project')
+    import_graph = build_import_graph(
+        [
+            str(tmp_path / 'project' / 'orders' / 'views.py'),
+            str(tmp_path / 'outside' / 'helpers.py'),
+        ],
+        base_dir,
+    )
+
+    add_project_packages(import_graph, base_dir, dirs_to_exclude=[])
+
+    assert len(import_graph.filepath_by_module) == 2
+    assert not is_project_root('..')
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import pytest
+
+from hooks.utils.layer_contracts import LayerContractsError, parse_layer_contracts
+
+
+@pytest.mark.parametrize(
+    'module_name, expected_layer',
+    [
+        ('orders.api.views', 'api'),
+        ('orders.services', 'services'),
+        ('orders.services.api', 'services'),
+        ('billing.models', 'billing.models'),
+        ('orders.utils', None),
+    ],
+)
+def test__layer_contracts__get_layer(module_name, expected_layer):
+    layer_contracts = parse_layer_contracts(['api', 'services', 'billing.models'], [])
+
+    assert layer_contracts.get_layer(module_name) == expected_layer
+
+
+@pytest.mark.parametrize(
+    'importer_layer, imported_layer, expected_result',
+    [
+        ('api', 'services', True),
+        ('services', 'api', False),
+        ('models', 'services', True),
+        ('services', 'models', True),
+        ('tasks', 'api', False),
+        ('tasks', 'services', True),
+    ],
+)
+def test__layer_contracts__is_import_allowed(importer_layer, imported_layer, expected_result):
+    layer_contracts = parse_layer_contracts(
+        ['api', 'services', 'models'], ['models may import services', 'tasks must not import api']
+    )
+
+    assert layer_contracts.is_import_allowed(importer_layer, imported_layer) == expected_result
+
+
+def test__parse_layer_contracts__rejects_unknown_contract_format():
+    with pytest.raises(LayerContractsError):
+        parse_layer_contracts([], ['api -> services'])
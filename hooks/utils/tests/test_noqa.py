@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import pytest
+
+from hooks.utils.noqa import build_noqa_index, parse_noqa_tags
+
+
+def test__build_noqa_index__marks_only_lines_with_noqa_comment():
+    file_content = 'a = 1  # noqa\nb = "# noqa"\nc = 1  # some # noqa: C901\n'
+
+    noqa_index = build_noqa_index(file_content)
+
+    assert sorted(noqa_index.tags_by_line) == [1, 3]
+    assert noqa_index.has_tag(3, 'C901')
+    assert not noqa_index.has_tag(1, 'C901')
+
+
+@pytest.mark.parametrize(
+    'comment, expected_tags',
+    [
+        ('# just a comment', None),
+        ('# noqa', frozenset()),
+        ('# noqa,', frozenset()),
+        ('# noqa: C901, E501', frozenset(['C901', 'E501'])),
+        ('# noqa:T001', frozenset(['T001'])),
+        ('# noqa: static object # and a note', frozenset(['static object'])),
+    ],
+)
+def test__parse_noqa_tags(comment, expected_tags):
+    assert parse_noqa_tags(comment) == expected_tags
+
+
+def test__noqa_index__get_lines_with_tags():
+    file_content = (
+        'A = 1  # noqa: static object\n'
+        'B = 1  # noqa\n'
+        'C = 1  # noqa: allowed straight assignment\n'
+    )
+
+    noqa_index = build_noqa_index(file_content)
+
+    assert noqa_index.get_lines_with_tags({'static object', 'allowed straight assignment'}) == {
+        1,
+        3,
+    }
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+import io
+import sys
+
+import pytest
+
 from hooks.utils.pre_commit import (
     get_input_files,
     get_input_test_files,
+    get_module_name_from_path,
     get_modules_files,
     is_django_model_file,
+    iterate_input_args,
+    iterate_paths_from,
 )
 
 
@@ -67,3 +75,50 @@ def test_is_django_model_file():
     assert not is_django_model_file('baz.py')
     assert not is_django_model_file('model.py')
     assert not is_django_model_file('/foo/models/bar.html')
+    assert not is_django_model_file('/foo/models/sub/baz.py')
+
+
+def test_get_module_name_from_path():
+    assert get_module_name_from_path('/app/orders/models.py', '/app') == 'orders.models'
+    assert get_module_name_from_path('/app/orders/__init__.py', '/app') == 'orders'
+    assert get_module_name_from_path('/app/manage.py', '/app') == 'manage'
+
+
+@pytest.mark.parametrize(
+    'content',
+    [
+        b'app/a.py\napp/b c.py\n\napp/d.py',
+        b'app/a.py\r\napp/b c.py\r\napp/d.py\r\n',
+        b'app/a.py\0app/b c.py\0app/d.py\0',
+    ],
+)
+def test__iterate_paths_from__reads_delimited_paths_in_chunks(tmp_path, content):
+    paths_file = tmp_path / 'paths.txt'
+    paths_file.write_bytes(content)
+
+    paths = list(iterate_paths_from(str(paths_file), chunk_size=3))
+
+    assert paths == ['app/a.py', 'app/b c.py', 'app/d.py']
+
+
+def test__iterate_input_args__expands_files_from_stdin(monkeypatch):
+    monkeypatch.setattr(sys, 'stdin', io.TextIOWrapper(io.BytesIO(b'b.py\0c.py\0')))
+
+    assert list(iterate_input_args(['--lines', 'a.py', '--files-from', '-', 'd.py'])) == [
+        '--lines',
+        'a.py',
+        'b.py',
+        'c.py',
+        'd.py',
+    ]
+
+
+def test__get_input_files__accepts_files_from_option(tmp_path):
+    py_file = tmp_path / 'module.py'
+    py_file.write_text('x = 1\n', encoding='utf-8')
+    paths_file = tmp_path / 'paths.txt'
+    paths_file.write_text(f'{py_file}\n{tmp_path / "missing.py"}\n', encoding='utf-8')
+
+    result = list(get_input_files(args=[f'--files-from={paths_file}'], dirs_to_exclude=[]))
+
+    assert result == [str(py_file.resolve())]
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from hooks.utils import source_file
+from hooks.utils.ast_helpers import get_ast_tree_with_content, iterate_ast_trees_with_content
+from hooks.utils.mypy_api_helpers import _load_pyproject_toml
+from hooks.utils.source_file import (
+    call_with_parse_guard,
+    get_parse_limits,
+    get_read_ahead,
+    iterate_prefetched_source_files,
+    read_source_file,
+    read_source_file_for_parsing,
+    time_budget,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_config_caches() -> None:
+    _load_pyproject_toml.cache_clear()
+    get_parse_limits.cache_clear()
+    get_read_ahead.cache_clear()
+    yield
+    _load_pyproject_toml.cache_clear()
+    get_parse_limits.cache_clear()
+    get_read_ahead.cache_clear()
+
+
+@pytest.mark.parametrize(
+    'content, expected_encoding, expected_text',
+    [
+        (b'x = 1\n', 'utf-8', 'x = 1\n'),
+        (b'\xef\xbb\xbfx = 1\n', 'utf-8-sig', 'x = 1\n'),
+        (
+            '# -*- coding: cp1251 -*-\nx = "тест"\n'.encode('cp1251'),
+            'cp1251',
+            '# -*- coding: cp1251 -*-\nx = "тест"\n',
+        ),
+        (b'x = 1\r\ny = 2\r', 'utf-8', 'x = 1\ny = 2\n'),
+    ],
+)
+def test__read_source_file__honours_encoding_cookie(
+    tmp_path, content, expected_encoding, expected_text
+):
+    py_file = tmp_path / 'module.py'
+    py_file.write_bytes(content)
+
+    source_file = read_source_file(str(py_file))
+
+    assert source_file is not None
+    assert source_file.content == content
+    assert source_file.encoding == expected_encoding
+    assert source_file.text == expected_text
+
+
+def test__read_source_file__returns_none_for_undecodable_file(tmp_path):
+    py_file = tmp_path / 'module.py'
+    py_file.write_bytes(b'x = "\xff\xfe"\n')
+
+    assert read_source_file(str(py_file)) is None
+
+
+@pytest.mark.parametrize(
+    'content, expected_lines_count',
+    [(b'', 0), (b'x = 1', 1), (b'x = 1\n', 1), (b'x = 1\n\ny = 2', 3)],
+)
+def test__source_file__lines_count(tmp_path, content, expected_lines_count):
+    py_file = tmp_path / 'module.py'
+    py_file.write_bytes(content)
+
+    assert read_source_file(str(py_file)).lines_count == expected_lines_count
+
+
+def test__read_source_file_for_parsing__skips_too_large_file(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    tmp_path.joinpath('pyproject.toml').write_text(
+        '[tool.pre_commit_hooks]\nmax-file-size-kb = 1\n', encoding='utf-8'
+    )
+    py_file = tmp_path / 'generated.py'
+    py_file.write_text('x = 1\n' * 1000, encoding='utf-8')
+
+    assert read_source_file_for_parsing(str(py_file)) is None
+    assert read_source_file(str(py_file)).lines_count == 1000
+    assert f'{py_file}: skipped: too large' in capsys.readouterr().err
+
+
+def test__get_ast_tree_with_content__skips_unparsable_file(tmp_path, capsys):
+    py_file = tmp_path / 'broken.py'
+    py_file.write_text('def foo(:\n', encoding='utf-8')
+
+    assert get_ast_tree_with_content(str(py_file)) == (None, None)
+    assert f'{py_file}: skipped: unparsable' in capsys.readouterr().err
+
+
+def test__call_with_parse_guard__stops_parse_over_time_budget(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    tmp_path.joinpath('pyproject.toml').write_text(
+        '[tool.pre_commit_hooks]\nparse-timeout = 0.05\n', encoding='utf-8'
+    )
+
+    def slow_parse() -> int:
+        time.sleep(1)
+        return 1
+
+    assert call_with_parse_guard('slow.py', slow_parse) is None
+    assert 'slow.py: skipped: timed out' in capsys.readouterr().err
+
+
+def test__iterate_prefetched_source_files__keeps_order_and_bounds_reads(tmp_path, monkeypatch):
+    paths = []
+    for index in range(12):
+        py_file = tmp_path / f'module_{index}.py'
+        py_file.write_text(f'x = {index}\n', encoding='utf-8')
+        paths.append(str(py_file))
+    reads_in_flight = []
+    peak_reads_in_flight = []
+    lock = threading.Lock()
+
+    def slow_read(path):
+        with lock:
+            reads_in_flight.append(path)
+            peak_reads_in_flight.append(len(reads_in_flight))
+        time.sleep(0.01)
+        with lock:
+            reads_in_flight.remove(path)
+        return read_source_file(path)
+
+    monkeypatch.setattr(source_file, 'read_source_file_for_parsing', slow_read)
+
+    prefetched = list(iterate_prefetched_source_files(paths, read_ahead=3))
+
+    assert [path for path, _ in prefetched] == paths
+    assert [prefetched_file.text for _, prefetched_file in prefetched] == [
+        f'x = {index}\n' for index in range(12)
+    ]
+    assert 1 < max(peak_reads_in_flight) <= 3
+
+
+def test__iterate_ast_trees_with_content__skips_broken_files(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    tmp_path.joinpath('pyproject.toml').write_text(
+        '[tool.pre_commit_hooks]\nread-ahead = 0\n', encoding='utf-8'
+    )
+    valid_file = tmp_path / 'valid.py'
+    valid_file.write_text('x = 1\n', encoding='utf-8')
+    broken_file = tmp_path / 'broken.py'
+    broken_file.write_text('def foo(:\n', encoding='utf-8')
+
+    parsed_files = list(iterate_ast_trees_with_content([str(broken_file), str(valid_file)]))
+
+    assert get_read_ahead() == 0
+    assert [(path, content) for path, _, content in parsed_files] == [(str(valid_file), 'x = 1\n')]
+    assert f'{broken_file}: skipped: unparsable' in capsys.readouterr().err
+
+
+def test__time_budget__restores_outer_budget_after_nested_one():
+    with pytest.raises(source_file.ParseTimeoutError):
+        with time_budget(0.2):
+            with time_budget(5):
+                pass
+            time.sleep(1)
+
+
+def test__call_with_parse_guard__skips_null_bytes_but_not_checker_errors(tmp_path, capsys):
+    py_file = tmp_path / 'null.py'
+    py_file.write_bytes(b'x = 1\0\n')
+
+    def broken_checker() -> int:
+        raise ValueError('checker bug')
+
+    assert get_ast_tree_with_content(str(py_file)) == (None, None)
+    assert f'{py_file}: skipped: unparsable' in capsys.readouterr().err
+    with pytest.raises(ValueError):
+        call_with_parse_guard('checked.py', broken_checker)
+
+
+def test__read_source_file_for_parsing__has_no_size_limit_by_default(tmp_path):
+    py_file = tmp_path / 'generated.py'
+    py_file.write_text('x = 1\n' * 300000, encoding='utf-8')
+
+    assert read_source_file_for_parsing(str(py_file)).lines_count == 300000
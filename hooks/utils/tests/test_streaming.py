@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from hooks.utils.source_file import _reported_skips
+from hooks.utils.streaming import (
+    AST_MEMORY_FACTOR,
+    SOURCE_MEMORY_FACTOR,
+    FileRule,
+    StreamingLimits,
+    StreamingRunner,
+    can_fork_workers,
+    get_limits_for_budget,
+    get_memory_report,
+)
+
+
+def _write_files(tmp_path, count: int):
+    filepaths = []
+    for index in range(count):
+        filepath = tmp_path / f'module_{index}.py'
+        filepath.write_text(f'assert {index}\n', encoding='utf-8')
+        filepaths.append(str(filepath))
+    return filepaths
+
+
+def test__streaming_runner__keeps_input_order_and_bounds_parsed_files(tmp_path):
+    filepaths = _write_files(tmp_path, 20)
+
+    def slow_check(pyfilepath, ast_tree, file_content):
+        time.sleep(0.001)
+        return [f'{pyfilepath}:{ast_tree.body[0].lineno}']
+
+    runner = StreamingRunner(
+        [
+            FileRule('slow', lambda filepath: True, slow_check),
+            FileRule('skipped', lambda filepath: False, lambda *args: ['unexpected']),
+        ],
+        workers=8,
+        max_parsed_files=3,
+    )
+
+    errors = list(runner.iterate_errors(filepaths))
+
+    assert errors == [f'{filepath}:1' for filepath in filepaths]
+    assert runner.workers == 3
+    assert runner.checked_files == 20
+    assert 1 <= runner.peak_parsed_files <= 3
+    assert runner.parsed_files == 0
+
+
+@pytest.mark.skipif(not can_fork_workers(), reason='worker processes need fork')
+def test__streaming_runner__kills_worker_stuck_on_file(tmp_path, capsys):
+    filepaths = _write_files(tmp_path, 6)
+    stuck_filepath = filepaths[1]
+    _reported_skips.clear()
+
+    def check(pyfilepath, ast_tree, file_content):
+        if pyfilepath == stuck_filepath:
+            time.sleep(60)
+        return [pyfilepath]
+
+    runner = StreamingRunner(
+        [FileRule('stuck', lambda filepath: True, check)], workers=2, timeout_seconds=0.5
+    )
+    started_at = time.monotonic()
+
+    errors = list(runner.iterate_errors(filepaths))
+
+    assert runner.uses_worker_processes
+    assert time.monotonic() - started_at < 30
+    assert errors == [filepath for filepath in filepaths if filepath != stuck_filepath]
+    assert runner.checked_files == 6
+    assert f'{stuck_filepath}: skipped: timed out (exceeded 0.5s)' in capsys.readouterr().err
+
+
+def test__streaming_runner__skips_files_without_rules(tmp_path, mocker):
+    filepaths = _write_files(tmp_path, 2)
+    parse_mock = mocker.patch('hooks.utils.streaming.parse_source_file')
+    runner = StreamingRunner([FileRule('none', lambda filepath: False, lambda *args: ['x'])])
+
+    assert list(runner.iterate_errors(filepaths)) == []
+    parse_mock.assert_not_called()
+    assert runner.checked_files == 0
+
+
+def test__get_limits_for_budget__counts_read_ahead_sources_and_clamps_workers(mocker):
+    mocker.patch('hooks.utils.streaming.get_peak_rss_bytes', return_value=100 * 2**20)
+    max_file_size_bytes = 2**20
+    read_ahead_mb = 3 * SOURCE_MEMORY_FACTOR
+    file_slot_mb = AST_MEMORY_FACTOR + SOURCE_MEMORY_FACTOR
+
+    assert get_limits_for_budget(
+        100 + read_ahead_mb + 3 * file_slot_mb, 8, 16, 2, max_file_size_bytes
+    ) == StreamingLimits(workers=3, max_parsed_files=3)
+    assert get_limits_for_budget(
+        100 + read_ahead_mb + 3 * file_slot_mb, 2, 16, 2, max_file_size_bytes
+    ) == StreamingLimits(workers=2, max_parsed_files=3)
+    assert get_limits_for_budget(
+        100 + 3 * file_slot_mb, 8, 16, 2, max_file_size_bytes
+    ) == StreamingLimits(workers=2, max_parsed_files=2)
+    assert get_limits_for_budget(50, 8, 16, 2, max_file_size_bytes) == StreamingLimits(1, 1)
+
+
+def test__streaming_runner__formats_memory_report(tmp_path):
+    runner = StreamingRunner([FileRule('noop', lambda filepath: True, lambda *args: [])])
+    list(runner.iterate_errors(_write_files(tmp_path, 1)))
+
+    report = runner.format_memory_report(get_memory_report())
+
+    assert report.splitlines()[0] == 'checked files: 1, workers: 1, peak parsed files: 1/16'
+    assert 'peak RSS' in report
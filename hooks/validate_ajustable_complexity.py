@@ -1,18 +1,75 @@
 from __future__ import annotations
 
+import argparse
 import ast
-from typing import List, Optional, Tuple
+from typing import List, Optional, Sequence, Set, Tuple
 
 from hooks.utils.ast_helpers import (
-    extract_all_variable_names,
-    get_all_funcdefs,
+    extract_variable_names_by_funcdef,
     get_ast_node_lineno,
-    get_ast_tree_with_content,
+    iterate_ast_trees_with_content,
 )
-from hooks.utils.complexity import get_node_mccabe_complexity
+from hooks.utils.baseline import (
+    add_baseline_arguments,
+    report_new_diagnostics,
+    validate_baseline_arguments,
+)
+from hooks.utils.complexity import get_functions_complexity
+from hooks.utils.diagnostics import Diagnostic
 from hooks.utils.mypy_api_helpers import get_list_param_from_configs, get_param_from_configs
+from hooks.utils.noqa import build_noqa_index
 from hooks.utils.pre_commit import get_input_files
 
+VARIABLE_NAMES_BLACKLIST = {
+    # from https://github.com/wemake-services/wemake-python-styleguide/
+    'val',
+    'vals',
+    'var',
+    'vars',
+    'variable',
+    'contents',
+    'handle',
+    'file',
+    'objs',
+    'some',
+    'do',
+    'no',
+    'true',
+    'false',
+    'foo',
+    'bar',
+    'baz',
+    'data',
+    'result',
+    'results',
+    'item',
+    'items',
+    'value',
+    'values',
+    'content',
+    'obj',
+    'info',
+    'handler',
+}
+COMPLEXITY_PENALTY = 2
+
+
+class ComplexityError(Diagnostic):
+    __slots__ = ('func_name', 'complexity', 'max_complexity')
+
+    rule_id = 'mccabe-complexity'
+    fields = __slots__
+    message_template = '{path}:{line} {0} is too complex ({1} > {2})'
+    fingerprint_fields = ('func_name',)
+
+    def __init__(
+        self, path: str, lineno: int, func_name: str, complexity: int, max_complexity: int
+    ) -> None:
+        super().__init__(path, lineno)
+        self.func_name = func_name
+        self.complexity = complexity
+        self.max_complexity = max_complexity
+
 
 def get_max_complexity_for_path(
     pyfilepath: str,
@@ -25,38 +82,41 @@ def get_max_complexity_for_path(
     return default_max_allowed_complexity
 
 
-def main() -> Optional[int]:
-    variable_names_blacklist = {
-        # from https://github.com/wemake-services/wemake-python-styleguide/
-        'val',
-        'vals',
-        'var',
-        'vars',
-        'variable',
-        'contents',
-        'handle',
-        'file',
-        'objs',
-        'some',
-        'do',
-        'no',
-        'true',
-        'false',
-        'foo',
-        'bar',
-        'baz',
-        'data',
-        'result',
-        'results',
-        'item',
-        'items',
-        'value',
-        'values',
-        'content',
-        'obj',
-        'info',
-        'handler',
-    }
+def get_blacklisted_vars_amount(var_names: Set[str]) -> int:
+    return len(var_names.intersection(VARIABLE_NAMES_BLACKLIST)) + len(
+        [v for v in var_names if len(v) == 1 and v not in ['_']]
+    )
+
+
+def get_file_errors(
+    pyfilepath: str, ast_tree: ast.AST, file_content: str, max_allowed_complexity: int
+) -> List[ComplexityError]:
+    errors = []
+    noqa_index = build_noqa_index(file_content)
+    functions_complexity = get_functions_complexity(ast_tree)
+    for funcdef, vars_in_function in extract_variable_names_by_funcdef(ast_tree).items():
+        if noqa_index.has_noqa(funcdef.lineno):
+            continue
+        all_vars_in_function = {
+            name
+            for name, node in vars_in_function
+            if not noqa_index.has_noqa(get_ast_node_lineno(node))
+        }
+        max_complexity = (
+            max_allowed_complexity
+            - get_blacklisted_vars_amount(all_vars_in_function) * COMPLEXITY_PENALTY
+        )
+        current_complexity = functions_complexity[funcdef].complexity
+        if current_complexity > max_complexity:
+            errors.append(
+                ComplexityError(
+                    pyfilepath, funcdef.lineno, funcdef.name, current_complexity, max_complexity
+                )
+            )
+    return errors
+
+
+def get_complexity_limits() -> Tuple[int, List[Tuple[str, int]]]:
     default_max_allowed_complexity = (
         int(get_param_from_configs('flake8', 'adjustable-default-max-complexity') or 8) + 1
     )
@@ -64,45 +124,25 @@ def main() -> Optional[int]:
         (rule.split(': ')[0], int(rule.split(': ')[1]) + 1)
         for rule in get_list_param_from_configs('flake8', 'per-path-max-complexity')
     ]
-    complexity_penalty = 2
+    return default_max_allowed_complexity, per_path_max_complexity
 
-    errors = []
-    for pyfilepath in get_input_files():
-        ast_tree_results: Tuple[Optional[ast.AST], Optional[str]] = get_ast_tree_with_content(
-            pyfilepath
+
+def main(args: Optional[Sequence[str]] = None) -> Optional[int]:
+    parser = argparse.ArgumentParser()
+    add_baseline_arguments(parser)
+    known_args, files = parser.parse_known_args(args)
+    validate_baseline_arguments(parser, known_args)
+    default_max_allowed_complexity, per_path_max_complexity = get_complexity_limits()
+
+    errors: List[ComplexityError] = []
+    for pyfilepath, ast_tree, file_content in iterate_ast_trees_with_content(
+        get_input_files(files or ['.'])
+    ):
+        max_allowed_complexity = get_max_complexity_for_path(
+            pyfilepath, per_path_max_complexity, default_max_allowed_complexity
         )
-        ast_tree, file_content = ast_tree_results
-        if ast_tree is None or file_content is None:
-            continue
-        file_lines = file_content.split('\n')
-        funcdefs = get_all_funcdefs(ast_tree)
-        for funcdef in funcdefs:
-            vars_in_function = [
-                v
-                for v in extract_all_variable_names(funcdef)
-                if '# noqa' not in file_lines[get_ast_node_lineno(v[1]) - 1]
-            ]
-            all_vars_in_function = {v[0] for v in vars_in_function}
-            blacklisted_vars_amount = len(
-                all_vars_in_function.intersection(variable_names_blacklist)
-            ) + len([v for v in all_vars_in_function if len(v) == 1 and v not in ['_']])
-            current_max_complexity = get_max_complexity_for_path(
-                pyfilepath, per_path_max_complexity, default_max_allowed_complexity
-            )
-            max_complexity = current_max_complexity - blacklisted_vars_amount * complexity_penalty
-            def_line = file_lines[funcdef.lineno - 1]
-            current_complexity = get_node_mccabe_complexity(funcdef)
-            if current_complexity > max_complexity and '# noqa' not in def_line:
-                errors.append(
-                    (pyfilepath, funcdef.lineno, funcdef.name, current_complexity, max_complexity)
-                )
-    if errors:
-        for path, line_no, func_name, comlexity, max_comlexity in errors:
-            print(
-                '{0}:{1} {2} is too complex ({3} > {4})'.format(  # noqa: T001
-                    path, line_no, func_name, comlexity, max_comlexity
-                )
-            )
+        errors += get_file_errors(pyfilepath, ast_tree, file_content, max_allowed_complexity)
+    if report_new_diagnostics(errors, known_args.baseline, known_args.update_baseline):
         return 1
 
 
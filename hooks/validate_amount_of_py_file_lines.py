@@ -4,16 +4,28 @@ import argparse
 import collections
 from typing import DefaultDict, List, Optional
 
+from hooks.utils.diagnostics import Diagnostic, report_diagnostics
 from hooks.utils.pre_commit import get_input_files
+from hooks.utils.source_file import read_source_file
 
 
-def count_amount_of_lines_in_file(filepath: str) -> int:
-    with open(filepath, 'r', encoding='utf=8') as file:
-        amount_of_lines = 0
-        for _line in file:
-            amount_of_lines += 1
+class TooLongFileError(Diagnostic):
+    __slots__ = ('amount_of_lines',)
+
+    rule_id = 'line-count'
+    fields = __slots__
+    message_template = '{0} lines in {path}'
+
+    def __init__(self, path: str, amount_of_lines: int) -> None:
+        super().__init__(path, 0)
+        self.amount_of_lines = amount_of_lines
 
-    return amount_of_lines
+
+def count_amount_of_lines_in_file(filepath: str) -> int:
+    source_file = read_source_file(filepath)
+    if source_file is None:
+        return 0
+    return source_file.lines_count
 
 
 def find_too_long_py_files(allowed_amount: int, filenames: List[str]) -> DefaultDict[str, int]:
@@ -35,8 +47,10 @@ def main() -> Optional[int]:
     too_long_files = find_too_long_py_files(args.lines, files)
     if too_long_files:
         print(f'Allowed amount of lines - {args.lines}. The following files failed validation:')
-        for py_file_name, amount_of_lines in too_long_files.items():
-            print(f'{amount_of_lines} lines in {py_file_name}')  # noqa: T001
+        report_diagnostics(
+            TooLongFileError(py_file_name, amount_of_lines)
+            for py_file_name, amount_of_lines in too_long_files.items()
+        )
         return 1
 
 
@@ -1,33 +1,64 @@
 from __future__ import annotations
 
+import argparse
 import ast
+import enum
 import typing
+import weakref
 
 from hooks.utils.ast_helpers import (
     _is_classdef_has_base_classes,
     function_def_has_decorator,
     get_assign_name,
-    get_ast_tree_with_content,
     get_classdef_assignments,
     get_classdef_methods,
+    get_var_names_from_assignment,
+    iterate_ast_trees_with_content,
 )
+from hooks.utils.baseline import (
+    add_baseline_arguments,
+    report_new_diagnostics,
+    validate_baseline_arguments,
+)
+from hooks.utils.class_hierarchy import ClassHierarchy
+from hooks.utils.common_types import AssignOrAnnAssign
+from hooks.utils.diagnostics import Diagnostic
+from hooks.utils.file_roles import FileRole, classify_path
 from hooks.utils.pre_commit import get_input_files
 
-OptionalError = typing.Optional[str]
-Errors = typing.List[str]
+
+class ApiSchemaError(Diagnostic):
+    """Нарушение аннотаций схемы в строке класса или его атрибута."""
+
+    __slots__ = ('reason',)
+
+    rule_id = 'api-annotated'
+    fields = __slots__
+    message_template = '{path}::{line} {0}'
+    fingerprint_fields = fields
+
+    def __init__(self, path: str, line: int, reason: str) -> None:
+        super().__init__(path, line)
+        self.reason = reason
+
+
+class ApiClassSchemaError(ApiSchemaError):
+    """Нарушение на весь класс: в сообщении нет строки, в baseline она есть."""
+
+    __slots__ = ()
+
+    message_template = '{path}:{0}'
+
+
+Errors = typing.List[ApiSchemaError]
 
 
 def is_api_filepath(filepath: str) -> bool:
-    return '/api/' in filepath and '/rest_in_peace/' not in filepath
+    return FileRole.API in classify_path(filepath)
 
 
 def is_serializer_or_view_filepath(filepath: str) -> bool:
-    if not filepath.endswith('.py'):
-        return False
-    for part in ('serializers', 'views', 'viewsets'):
-        if f'/{part}/' in filepath or filepath.endswith(f'/{part}.py'):
-            return True
-    return False
+    return bool(classify_path(filepath) & (FileRole.SERIALIZERS | FileRole.VIEWS))
 
 
 def _is_class(node: ast.AST) -> bool:
@@ -44,62 +75,109 @@ def _is_api_serializer(node: ast.AST, file_path: str) -> bool:
     )
 
 
-def _is_api_view(node: ast.AST) -> bool:
-    return _is_class(node) and is_view(typing.cast(ast.ClassDef, node))
-
-
-def _is_api_viewset(node: ast.AST) -> bool:
-    return _is_class(node) and is_viewset(typing.cast(ast.ClassDef, node))
+def is_api_schema_filepath(filepath: str) -> bool:
+    return FileRole.API_SCHEMA in classify_path(filepath)
 
 
-def _is_restdoctor_api_element(node: ast.AST, file_path: str) -> bool:
-    return _is_api_serializer(node, file_path) or _is_api_view(node) or _is_api_viewset(node)
+def iterate_api_files(args: typing.Optional[typing.List[str]] = None) -> typing.Iterator[str]:
+    return get_input_files(args, roles=FileRole.API_SCHEMA)
 
 
-def iterate_api_files() -> typing.Iterator[str]:
-    return (
-        filepath
-        for filepath in get_input_files()
-        if is_api_filepath(filepath) and is_serializer_or_view_filepath(filepath)
-    )
+VIEWSET_BASE_CLASSES = frozenset({'ModelViewSet', 'ReadOnlyModelViewSet', 'GenericViewSet'})
+VIEW_BASE_CLASSES = frozenset(
+    {'RetrieveAPIView', 'ListAPIView', 'SerializerClassMapApiView', 'GenericAPIView'}
+)
+SERIALIZER_BASE_CLASSES = frozenset({'Serializer', 'ModelSerializer', 'BaseSerializer'})
 
 
 def is_viewset(classdef_node: ast.ClassDef) -> bool:
-    base_models_classes_names = {'ModelViewSet', 'ReadOnlyModelViewSet', 'GenericViewSet'}
     return _is_classdef_has_base_classes(
-        classdef_node, base_models_classes_names, 'restdoctor.rest_framework.viewsets'
+        classdef_node, VIEWSET_BASE_CLASSES, 'restdoctor.rest_framework.viewsets'
     )
 
 
 def is_view(classdef_node: ast.ClassDef) -> bool:
-    base_models_classes_names = {
-        'RetrieveAPIView',
-        'ListAPIView',
-        'SerializerClassMapApiView',
-        'GenericAPIView',
-    }
     return _is_classdef_has_base_classes(
-        classdef_node, base_models_classes_names, 'restdoctor.rest_framework.views'
+        classdef_node, VIEW_BASE_CLASSES, 'restdoctor.rest_framework.views'
     )
 
 
 def is_serializer(classdef_node: ast.ClassDef) -> bool:
-    base_models_classes_names = {'Serializer', 'ModelSerializer', 'BaseSerializer'}
     return _is_classdef_has_base_classes(
-        classdef_node, base_models_classes_names, 'restdoctor.rest_framework.serializers'
+        classdef_node, SERIALIZER_BASE_CLASSES, 'restdoctor.rest_framework.serializers'
     )
 
 
-def check_docstring(node: typing.Union[ast.ClassDef, ast.FunctionDef], *args: typing.Any) -> Errors:
+class ApiClassKind(enum.Flag):
+    NONE = 0
+    SERIALIZER = enum.auto()
+    VIEW = enum.auto()
+    VIEWSET = enum.auto()
+
+
+class ApiClass:
+    """Класс API, разобранный один раз: вид, присваивания и методы по именам."""
+
+    def __init__(
+        self, node: ast.ClassDef, file_path: str, class_hierarchy: ClassHierarchy | None = None
+    ) -> None:
+        self.node = node
+        self.file_path = file_path
+        self.kind = ApiClassKind.NONE
+        if _is_api_serializer(node, file_path):
+            self.kind |= ApiClassKind.SERIALIZER
+        if is_view(node) or self._is_subclass_of(class_hierarchy, VIEW_BASE_CLASSES):
+            self.kind |= ApiClassKind.VIEW
+        if is_viewset(node) or self._is_subclass_of(class_hierarchy, VIEWSET_BASE_CLASSES):
+            self.kind |= ApiClassKind.VIEWSET
+
+        self.assignments = list(get_classdef_assignments(node))
+        self.assignments_by_name: typing.Dict[str, typing.List[AssignOrAnnAssign]] = {}
+        for assign in self.assignments:
+            for name, _ in get_var_names_from_assignment(assign):
+                self.assignments_by_name.setdefault(name, []).append(assign)
+
+        self.methods = list(get_classdef_methods(node))
+        self.methods_by_name: typing.Dict[str, ast.FunctionDef] = {}
+        for method in self.methods:
+            self.methods_by_name.setdefault(method.name, method)
+
+    def _is_subclass_of(
+        self, class_hierarchy: ClassHierarchy | None, base_class_names: typing.Collection[str]
+    ) -> bool:
+        """Непрямые наследники restdoctor через базовые классы проекта из других модулей."""
+        if class_hierarchy is None or not self.file_path:
+            return False
+        qualified_name = class_hierarchy.get_qualified_name(self.file_path, self.node.name)
+        return class_hierarchy.is_subclass_of(qualified_name, base_class_names)
+
+
+_api_classes: weakref.WeakKeyDictionary[ast.ClassDef, typing.Dict[str, ApiClass]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def describe_api_class(
+    node: ast.ClassDef, file_path: str = '', class_hierarchy: ClassHierarchy | None = None
+) -> ApiClass:
+    api_classes_by_path = _api_classes.setdefault(node, {})
+    if file_path not in api_classes_by_path:
+        api_classes_by_path[file_path] = ApiClass(node, file_path, class_hierarchy)
+    return api_classes_by_path[file_path]
+
+
+def check_docstring(
+    node: typing.Union[ast.ClassDef, ast.FunctionDef], file_path: str = ''
+) -> Errors:
     """
     Проверяет, что у View/ViewSet и Serializer есть докстринги.
     """
     if not ast.get_docstring(node):
-        return [f':{node.lineno} {node.name} missed docstring']
+        return [ApiSchemaError(file_path, node.lineno, f'{node.name} missed docstring')]
     return []
 
 
-def _check_help_text(function_node: ast.Call) -> OptionalError:
+def _get_call_without_help_text(function_node: ast.Call) -> typing.Optional[ast.Call]:
     function_kwargs_names = [keyword.arg for keyword in function_node.keywords]
 
     if 'help_text' in function_kwargs_names:
@@ -107,101 +185,92 @@ def _check_help_text(function_node: ast.Call) -> OptionalError:
 
     for function_node_arg in function_node.args:
         if isinstance(function_node_arg, ast.Call):
-            return _check_help_text(function_node_arg)
+            return _get_call_without_help_text(function_node_arg)
 
-    return f':{function_node.lineno} missing `help_text` attribute'
+    return function_node
 
 
 def check_help_text_attribute_in_serializer_fields(node: ast.ClassDef, file_path: str) -> Errors:
     """Проверяет, что для атрибутов сериализаторов определен help_text."""
-    if _is_api_serializer(node, file_path) is False:
+    api_class = describe_api_class(node, file_path)
+    if ApiClassKind.SERIALIZER not in api_class.kind:
         return []
 
     errors = []
 
-    for assign in get_classdef_assignments(node):
+    for assign in api_class.assignments:
         assign_value = assign.value
         if isinstance(assign_value, ast.Call) is False:
             continue
 
-        assign_error = _check_help_text(typing.cast(ast.Call, assign_value))
-        if assign_error:
-            errors.append(assign_error)
+        call_without_help_text = _get_call_without_help_text(typing.cast(ast.Call, assign_value))
+        if call_without_help_text:
+            errors.append(
+                ApiSchemaError(
+                    file_path, call_without_help_text.lineno, 'missing `help_text` attribute'
+                )
+            )
 
     return errors
 
 
-def _check_classdef_hasattr(node: ast.ClassDef, attribute: str) -> bool:
-    for assign in get_classdef_assignments(node):
-        if isinstance(assign, ast.AnnAssign):
-            if isinstance(assign.target, ast.Name) and attribute == assign.target.id:
-                return True
-            continue
-        assign_targets_names = [
-            target.id for target in assign.targets if isinstance(target, ast.Name)
-        ]
-
-        if attribute in assign_targets_names:
-            return True
-
-    return False
-
-
 def check_schema_tags_presence_in_views_and_viewsets(node: ast.ClassDef, file_path: str) -> Errors:
     """Проверяет наличие параметра schema_tags для вьюх и вьюсетов."""
     schema_tags_attribute = 'schema_tags'
+    api_class = describe_api_class(node, file_path)
 
-    if _is_api_serializer(node, file_path):
+    if ApiClassKind.SERIALIZER in api_class.kind:
         return []
 
-    if _check_classdef_hasattr(node, schema_tags_attribute):
+    if schema_tags_attribute in api_class.assignments_by_name:
         return []
 
-    return [f'{node.name} missed schema tags attribute']
+    return [
+        ApiClassSchemaError(file_path, node.lineno, f'{node.name} missed schema tags attribute')
+    ]
 
 
-def check_viewset_has_serializer_class_map(node: ast.ClassDef, *args: typing.Any) -> Errors:
+def check_viewset_has_serializer_class_map(node: ast.ClassDef, file_path: str = '') -> Errors:
     """Проверяет, что у ViewSet определен serializer_class_map."""
     serializer_class_map_attribute = 'serializer_class_map'
+    api_class = describe_api_class(node, file_path)
 
-    if _is_api_viewset(node) is False:
+    if ApiClassKind.VIEWSET not in api_class.kind:
         return []
 
-    if _check_classdef_hasattr(node, serializer_class_map_attribute):
+    if serializer_class_map_attribute in api_class.assignments_by_name:
         return []
 
-    return [f':{node.lineno} {node.name} missed `serializer_class_map` attribute']
+    return [
+        ApiSchemaError(
+            file_path, node.lineno, f'{node.name} missed `serializer_class_map` attribute'
+        )
+    ]
 
 
-def check_viewset_lookup_field_has_valid_value(node: ast.ClassDef, *args: typing.Any) -> Errors:
+def check_viewset_lookup_field_has_valid_value(node: ast.ClassDef, file_path: str = '') -> Errors:
     """Проверяет, что ViewSet.lookup_field != ‘id’."""
     allowed_lookup_fields = ['uuid']
-    if _is_api_viewset(node) is False:
+    api_class = describe_api_class(node, file_path)
+    if ApiClassKind.VIEWSET not in api_class.kind:
         return []
 
-    for assign in get_classdef_assignments(node):
-        if get_assign_name(assign) != 'lookup_field':
-            continue
-
+    for assign in api_class.assignments_by_name.get('lookup_field', []):
         if not isinstance(assign.value, ast.Constant):
             continue
         assign_value = assign.value.value
         if assign_value not in allowed_lookup_fields:
-            error = (
-                f':{node.lineno} {node.name} viewset has forbidden `lookup_field`. '
+            reason = (
+                f'{node.name} viewset has forbidden `lookup_field`. '
                 f'Choose from: {allowed_lookup_fields}'
             )
-            return [error]
+            return [ApiSchemaError(file_path, node.lineno, reason)]
 
     return []
 
 
-def get_serializer_field_method(node: ast.ClassDef, field_name: str) -> ast.FunctionDef | None:
-    for body_node in node.body:
-        if isinstance(body_node, ast.FunctionDef) and body_node.name == f'get_{field_name}':
-            return body_node
-
-    return None
+def get_serializer_field_method(api_class: ApiClass, field_name: str) -> ast.FunctionDef | None:
+    return api_class.methods_by_name.get(f'get_{field_name}')
 
 
 def _is_allowed_return_type(return_node: ast.expr | None) -> bool:
@@ -218,12 +287,13 @@ def _is_allowed_return_type(return_node: ast.expr | None) -> bool:
 
 def check_schema_wrapper_for_serializer_method_field(node: ast.ClassDef, file_path: str) -> Errors:
     """SerializerMethodField должны быть обернуты в SchemaWrapper (если функция возвращает не str)."""
-    if _is_api_serializer(node, file_path) is False:
+    api_class = describe_api_class(node, file_path)
+    if ApiClassKind.SERIALIZER not in api_class.kind:
         return []
 
     errors = []
 
-    for assign in get_classdef_assignments(node):
+    for assign in api_class.assignments:
         assign_value = assign.value
         if not isinstance(assign_value, ast.Call):
             continue
@@ -240,67 +310,73 @@ def check_schema_wrapper_for_serializer_method_field(node: ast.ClassDef, file_pa
             continue
 
         assign_field_name = get_assign_name(assign)
-        serializer_field_method = get_serializer_field_method(node, assign_field_name)
+        serializer_field_method = get_serializer_field_method(api_class, assign_field_name)
         if serializer_field_method is None:
             continue
 
         return_node = serializer_field_method.returns
         if _is_allowed_return_type(return_node) is False:
             errors.append(
-                f':{assign.lineno} {node.name} serializer {assign_field_name} field missing SchemaWrapper'
+                ApiSchemaError(
+                    file_path,
+                    assign.lineno,
+                    f'{node.name} serializer {assign_field_name} field missing SchemaWrapper',
+                )
             )
 
     return errors
 
 
-def check_docstrings_for_api_action_handlers(node: ast.ClassDef, *args: typing.Any) -> Errors:
+def check_docstrings_for_api_action_handlers(node: ast.ClassDef, file_path: str = '') -> Errors:
     """Проверяет, что методы action в апи имеют докстринги."""
     errors = []
 
-    for function_def in get_classdef_methods(node):
+    for function_def in describe_api_class(node, file_path).methods:
         function_has_action_decorator = function_def_has_decorator(
             function_def, 'action'
         ) or function_def_has_decorator(function_def, 'drf_action')
 
         if function_has_action_decorator:
-            errors.extend(check_docstring(function_def))
+            errors.extend(check_docstring(function_def, file_path))
 
     return errors
 
 
-def check_docstrings_for_views_dispatch_methods(node: ast.ClassDef, *args: typing.Any) -> Errors:
+def check_docstrings_for_views_dispatch_methods(node: ast.ClassDef, file_path: str = '') -> Errors:
     """Проверяет, что dispatch методы вьюх имеют докстринги."""
-    if _is_api_view(node) is False:
+    api_class = describe_api_class(node, file_path)
+    if ApiClassKind.VIEW not in api_class.kind:
         return []
 
     errors = []
     methods_to_check = ['get', 'put', 'post', 'patch', 'delete']
 
-    for function_def in get_classdef_methods(node):
+    for function_def in api_class.methods:
         if function_def.name in methods_to_check:
-            errors.extend(check_docstring(function_def))
+            errors.extend(check_docstring(function_def, file_path))
 
     return errors
 
 
-def check_doctstrings_viewsets_dispatch_methods(node: ast.ClassDef, *args: typing.Any) -> Errors:
+def check_doctstrings_viewsets_dispatch_methods(node: ast.ClassDef, file_path: str = '') -> Errors:
     """Проверяет, что dispatch методы вьюсетов имеют докстринги."""
-    if _is_api_viewset(node) is False:
+    api_class = describe_api_class(node, file_path)
+    if ApiClassKind.VIEWSET not in api_class.kind:
         return []
 
     errors = []
     methods_to_check = ['list', 'retrieve', 'create', 'update', 'partial_update', 'delete']
 
-    for function_def in get_classdef_methods(node):
+    for function_def in api_class.methods:
         if function_def.name in methods_to_check:
-            errors.extend(check_docstring(function_def))
+            errors.extend(check_docstring(function_def, file_path))
 
     return errors
 
 
 def check_schema_annotations(
     api_element_node: ast.ClassDef, file_path: str
-) -> typing.Tuple[bool, typing.List[str]]:
+) -> typing.Tuple[bool, Errors]:
     """
     Проверка правильности аннотаций для генерации схемы.
 
@@ -324,7 +400,7 @@ def check_schema_annotations(
         check_viewset_lookup_field_has_valid_value,
     ]
 
-    node_errors = []
+    node_errors: Errors = []
 
     for checker in checkers:
         node_errors.extend(checker(api_element_node, file_path))
@@ -333,21 +409,33 @@ def check_schema_annotations(
     return has_errors, node_errors
 
 
-def main() -> typing.Optional[int]:
-    has_errors = False
-    for pyfilepath in iterate_api_files():
-        ast_tree, file_content = get_ast_tree_with_content(pyfilepath)
-        if ast_tree is None or file_content is None:
+def get_file_errors(
+    pyfilepath: str, ast_tree: ast.AST, class_hierarchy: ClassHierarchy | None = None
+) -> typing.List[ApiSchemaError]:
+    errors: typing.List[ApiSchemaError] = []
+    for node in ast.walk(ast_tree):
+        if not isinstance(node, ast.ClassDef):
             continue
-        for node in ast.walk(ast_tree):
-            if _is_restdoctor_api_element(node, pyfilepath):
-                node_has_errors, errors = check_schema_annotations(
-                    typing.cast(ast.ClassDef, node), pyfilepath
-                )
-                for error in errors:
-                    print(f'{pyfilepath}:{error}')  # noqa: T001
-                has_errors = has_errors or node_has_errors
-    if has_errors:
+        if describe_api_class(node, pyfilepath, class_hierarchy).kind:
+            _, node_errors = check_schema_annotations(node, pyfilepath)
+            errors.extend(node_errors)
+    return errors
+
+
+def iterate_errors(
+    pyfilepaths: typing.Iterable[str], class_hierarchy: ClassHierarchy
+) -> typing.Iterator[ApiSchemaError]:
+    for pyfilepath, ast_tree, _ in iterate_ast_trees_with_content(pyfilepaths):
+        yield from get_file_errors(pyfilepath, ast_tree, class_hierarchy)
+
+
+def main(args: typing.Optional[typing.Sequence[str]] = None) -> typing.Optional[int]:
+    parser = argparse.ArgumentParser()
+    add_baseline_arguments(parser)
+    known_args, files = parser.parse_known_args(args)
+    validate_baseline_arguments(parser, known_args)
+    errors = iterate_errors(iterate_api_files(files or ['.']), ClassHierarchy())
+    if report_new_diagnostics(errors, known_args.baseline, known_args.update_baseline):
         return 1
 
 
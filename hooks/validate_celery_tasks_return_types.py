@@ -1,79 +1,267 @@
 from __future__ import annotations
 
-import dataclasses
+import argparse
+import json
 import typing
+from functools import lru_cache
 
-from libcst import FunctionDef
-from libcst import matchers as m
-from libcst import parse_module
+from libcst import (
+    Attribute,
+    BaseExpression,
+    BinaryOperation,
+    Call,
+    CSTVisitor,
+    Decorator,
+    FunctionDef,
+    Module,
+    Name,
+    ParserSyntaxError,
+    parse_module,
+)
 from libcst.metadata import MetadataWrapper, PositionProvider
 
-from hooks.utils.pre_commit import get_input_files
+from hooks.utils.diagnostics import Diagnostic, report_diagnostics
+from hooks.utils.disk_cache import get_content_digest, get_disk_cache
+from hooks.utils.mypy_api_helpers import get_list_param_from_configs
+from hooks.utils.pre_commit import get_input_files, get_module_name_from_path
+from hooks.utils.source_file import (
+    UNPARSABLE_ERRORS,
+    call_with_parse_guard,
+    read_source_file_for_parsing,
+)
+
+CELERY_TASKS_CONFIG_SECTION = 'celery_tasks'
+DEFAULT_TASK_DECORATORS = ('app.task',)
+WILDCARD_SEGMENT = '*'
+VALID_RETURN_ANNOTATIONS = frozenset({'None', 'AsyncTaskResult'})
+CELERY_TASKS_CACHE_SCHEMA_VERSION = 1
+
+
+class Error(Diagnostic):
+    __slots__ = ('function_name',)
+
+    rule_id = 'celery-tasks-return-types'
+    fields = __slots__
+    message_template = '{path}:{line}:{0} Invalid return type should be AsyncTaskResult or None'
 
+    def __init__(self, line: int, function_name: str, path: str = '') -> None:
+        super().__init__(path, line)
+        self.function_name = function_name
 
-@dataclasses.dataclass()
-class Error:
+
+class TaskInfo(typing.NamedTuple):
+    path: str
+    module: str
+    name: str
     line: int
-    function_name: str
+    return_annotation: typing.Optional[str]
+    has_valid_return_type: bool
 
 
-APP_TASK_DECORATOR_ATTRIBUTE = m.Attribute(value=m.Name(value='app'), attr=m.Name(value='task'))
-ASYNC_RESULT_OR_NONE_MATCHER = m.OneOf(m.Name(value='None'), m.Name(value='AsyncTaskResult'))
-APP_TASK_DECORATOR_MATCHER = m.Decorator(
-    decorator=m.Call(func=APP_TASK_DECORATOR_ATTRIBUTE) | APP_TASK_DECORATOR_ATTRIBUTE
-)
-FUNC_RETURN_NONE_OR_ASYNC_RESULT_MATCHER = m.FunctionDef(
-    returns=(
-        m.Annotation(
-            annotation=ASYNC_RESULT_OR_NONE_MATCHER
-            | m.BinaryOperation(
-                left=ASYNC_RESULT_OR_NONE_MATCHER, right=ASYNC_RESULT_OR_NONE_MATCHER
+class TaskDecorators:
+    """
+    Шаблоны декораторов задач: `app.task`, `shared_task`, `*.task`.
+
+    `*` совпадает с одним любым сегментом. Шаблоны сгруппированы по последнему сегменту,
+    так что на каждый декоратор приходится один поиск в словаре.
+    """
+
+    def __init__(self, patterns: typing.Iterable[str]) -> None:
+        self.patterns = tuple(pattern.strip().lstrip('@') for pattern in patterns)
+        self.patterns_by_name: typing.Dict[str, typing.List[typing.Tuple[str, ...]]] = {}
+        for pattern in self.patterns:
+            segments = tuple(pattern.split('.'))
+            self.patterns_by_name.setdefault(segments[-1], []).append(segments)
+
+    def has_marker(self, file_content: typing.Union[str, bytes]) -> bool:
+        """Дешевая проверка сырого текста: нет имени декоратора - нет и задач, парсить незачем."""
+        if WILDCARD_SEGMENT in self.patterns_by_name:
+            return True
+        if isinstance(file_content, bytes):
+            return any(name.encode() in file_content for name in self.patterns_by_name)
+        return any(name in file_content for name in self.patterns_by_name)
+
+    def matches(self, dotted_name: str) -> bool:
+        segments = dotted_name.split('.')
+        candidates = [
+            *self.patterns_by_name.get(segments[-1], []),
+            *self.patterns_by_name.get(WILDCARD_SEGMENT, []),
+        ]
+        return any(
+            len(pattern) == len(segments)
+            and all(
+                pattern_segment in (segment, WILDCARD_SEGMENT)
+                for pattern_segment, segment in zip(pattern, segments)
             )
+            for pattern in candidates
         )
+
+    def is_task_decorator(self, decorator: Decorator) -> bool:
+        dotted_name = get_dotted_name(decorator.decorator)
+        return dotted_name is not None and self.matches(dotted_name)
+
+
+@lru_cache(maxsize=None)
+def get_task_decorators() -> TaskDecorators:
+    return TaskDecorators(
+        get_list_param_from_configs(CELERY_TASKS_CONFIG_SECTION, 'decorators')
+        or DEFAULT_TASK_DECORATORS
     )
-)
 
 
-class ReturnAnnotationValidator(m.MatcherDecoratableVisitor):
-    METADATA_DEPENDENCIES = (PositionProvider,)
+def get_dotted_name(expression: BaseExpression) -> typing.Optional[str]:
+    if isinstance(expression, Call):
+        expression = expression.func
+    if isinstance(expression, Name):
+        return expression.value
+    if isinstance(expression, Attribute):
+        value_name = get_dotted_name(expression.value)
+        return None if value_name is None else f'{value_name}.{expression.attr.value}'
+    return None
 
-    def __init__(self) -> None:
+
+def _is_valid_return_name(annotation: BaseExpression) -> bool:
+    return isinstance(annotation, Name) and annotation.value in VALID_RETURN_ANNOTATIONS
+
+
+def has_valid_return_annotation(node: FunctionDef) -> bool:
+    if node.returns is None:
+        return False
+    annotation = node.returns.annotation
+    if isinstance(annotation, BinaryOperation):
+        return _is_valid_return_name(annotation.left) and _is_valid_return_name(annotation.right)
+    return _is_valid_return_name(annotation)
+
+
+class TaskCollector(CSTVisitor):
+    def __init__(self, task_decorators: TaskDecorators) -> None:
         super().__init__()
-        self.errors: list[Error] = []
+        self.task_decorators = task_decorators
+        self.tasks: typing.List[FunctionDef] = []
 
-    @m.call_if_inside(m.FunctionDef())
     def visit_FunctionDef(self, node: FunctionDef) -> None:
-        position = self.get_metadata(PositionProvider, node).start
-        function_name = node.name.value
-        for decorator in node.decorators:
-            if self.matches(decorator, APP_TASK_DECORATOR_MATCHER):
-                if not self.matches(node, FUNC_RETURN_NONE_OR_ASYNC_RESULT_MATCHER):
-                    self.errors.append(Error(line=position.line, function_name=function_name))
-                break
+        if any(self.task_decorators.is_task_decorator(decorator) for decorator in node.decorators):
+            self.tasks.append(node)
 
 
-def validate_return_types(file_content: str) -> typing.List[Error]:
-    validator = ReturnAnnotationValidator()
+def find_tasks(
+    file_content: typing.Union[str, bytes], task_decorators: TaskDecorators | None = None
+) -> typing.List[TaskInfo]:
+    """Задачи файла без пути и имени модуля; позиции считаются, только если задачи нашлись."""
+    if task_decorators is None:
+        task_decorators = get_task_decorators()
+    if not task_decorators.has_marker(file_content):
+        return []
     module = parse_module(file_content)
-    MetadataWrapper(module).visit(validator)
-    return validator.errors
-
-
-def main() -> typing.Optional[int]:
-    files = get_input_files(extension='py')
-    has_errors = False
-    for filepath in files:
-        with open(filepath) as f:
-            errors = validate_return_types(f.read())
-        if errors:
-            has_errors = True
-        for error in errors:
-            print(  # noqa: T001
-                f'{filepath}:{error.line}:{error.function_name} Invalid return type '
-                'should be AsyncTaskResult or None'
-            )
+    collector = TaskCollector(task_decorators)
+    module.visit(collector)
+    if not collector.tasks:
+        return []
+    positions = MetadataWrapper(module, unsafe_skip_copy=True).resolve(PositionProvider)
+    return [
+        TaskInfo(
+            path='',
+            module='',
+            name=node.name.value,
+            line=positions[node].start.line,
+            return_annotation=_get_return_annotation_code(module, node),
+            has_valid_return_type=has_valid_return_annotation(node),
+        )
+        for node in collector.tasks
+    ]
+
+
+def _get_return_annotation_code(module: Module, node: FunctionDef) -> typing.Optional[str]:
+    if node.returns is None:
+        return None
+    return module.code_for_node(node.returns.annotation)
+
+
+def validate_return_types(
+    file_content: typing.Union[str, bytes], task_decorators: TaskDecorators | None = None
+) -> typing.List[Error]:
+    return [
+        Error(line=task.line, function_name=task.name)
+        for task in find_tasks(file_content, task_decorators)
+        if not task.has_valid_return_type
+    ]
+
+
+def get_file_tasks(
+    filepath: str, task_decorators: TaskDecorators | None = None
+) -> typing.List[TaskInfo]:
+    if task_decorators is None:
+        task_decorators = get_task_decorators()
+    source_file = read_source_file_for_parsing(filepath)
+    if source_file is None or not task_decorators.has_marker(source_file.content):
+        return []
+    tasks_cache = get_disk_cache('celery_tasks', CELERY_TASKS_CACHE_SCHEMA_VERSION)
+    cache_key = get_content_digest(
+        source_file.content + '\n'.join(task_decorators.patterns).encode()
+    )
+    tasks = tasks_cache.load(cache_key) if tasks_cache is not None else None
+    if not isinstance(tasks, list):
+        tasks = call_with_parse_guard(
+            filepath,
+            lambda: find_tasks(source_file.content, task_decorators),
+            (*UNPARSABLE_ERRORS, ParserSyntaxError),
+        )
+        if tasks is None:
+            return []
+        if tasks_cache is not None:
+            tasks_cache.store(cache_key, tasks)
+    module_name = get_module_name_from_path(filepath)
+    return [task._replace(path=filepath, module=module_name) for task in tasks]
+
+
+class TaskRegistry:
+    """Найденные за прогон задачи: их могут читать другие проверки и экспорт в JSON."""
+
+    def __init__(self) -> None:
+        self.tasks: typing.List[TaskInfo] = []
+        self.tasks_by_module: typing.Dict[str, typing.List[TaskInfo]] = {}
+
+    def add_tasks(self, tasks: typing.Iterable[TaskInfo]) -> None:
+        for task in tasks:
+            self.tasks.append(task)
+            self.tasks_by_module.setdefault(task.module, []).append(task)
+
+    def get_module_tasks(self, module_name: str) -> typing.List[TaskInfo]:
+        return list(self.tasks_by_module.get(module_name, []))
+
+    def to_json(self) -> str:
+        return json.dumps([task._asdict() for task in self.tasks], indent=2, ensure_ascii=False)
+
+
+def build_task_registry(
+    filepaths: typing.Iterable[str], task_decorators: TaskDecorators | None = None
+) -> TaskRegistry:
+    task_registry = TaskRegistry()
+    for filepath in filepaths:
+        task_registry.add_tasks(get_file_tasks(str(filepath), task_decorators))
+    return task_registry
+
+
+def main(args: typing.Optional[typing.Sequence[str]] = None) -> typing.Optional[int]:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--export-tasks',
+        metavar='FILE',
+        help='Write discovered tasks (module, name, line, return annotation) to a JSON file',
+    )
+    known_args, _ = parser.parse_known_args(args)
+
+    task_registry = build_task_registry(get_input_files(extension='py'))
+    if known_args.export_tasks:
+        with open(known_args.export_tasks, 'w', encoding='utf-8') as export_file:
+            export_file.write(task_registry.to_json())
 
-    if has_errors:
+    errors = [
+        Error(task.line, task.name, task.path)
+        for task in task_registry.tasks
+        if not task.has_valid_return_type
+    ]
+    if report_diagnostics(errors):
         return 1
     return 0
 
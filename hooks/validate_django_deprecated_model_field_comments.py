@@ -9,25 +9,38 @@ import libcst as cst
 from libcst import matchers as m
 from libcst.metadata import PositionProvider
 
+from hooks.utils.diagnostics import Diagnostic, report_diagnostics
+from hooks.utils.django_models import ModelsModule, build_django_model_index
+from hooks.utils.file_roles import FileRole
 from hooks.utils.pre_commit import get_input_files
+from hooks.utils.source_file import (
+    UNPARSABLE_ERRORS,
+    call_with_parse_guard,
+    read_source_file_for_parsing,
+)
 
 DEFAULT_VALID_DEPRECATION_COMMENT_REGEX = (
     r'#? deprecated (?P<ticket_id>[A-Z][A-Z,0-9]+-[0-9]+) (?P<deprecation_date>\d{2}\.\d{2}\.\d{4})'
 )
 DEFAULT_DEPRECATION_COMMENT_MARKER_REGEX = 'deprecated'
+PARSERS = ('ast', 'libcst')
+DEFAULT_PARSER = 'ast'
 
 
-class Error(typing.NamedTuple):
-    model_file_path: str
-    line: int
-    col: int
-    field: str
+class Error(Diagnostic):
+    __slots__ = ('field',)
 
-    def __str__(self) -> str:
-        return (
-            f'{self.model_file_path}:{self.line}:{self.col} '
-            f'Field "{self.field}" needs a valid deprecation comment'
-        )
+    rule_id = 'django-deprecated-model-field-comments'
+    fields = __slots__
+    message_template = '{path}:{line}:{col} Field "{0}" needs a valid deprecation comment'
+
+    def __init__(self, model_file_path: str, line: int, col: int, field: str) -> None:
+        super().__init__(model_file_path, line, col)
+        self.field = field
+
+    @property
+    def model_file_path(self) -> str:
+        return self.path
 
 
 def is_model_field_type(name: str) -> bool:
@@ -84,6 +97,17 @@ def get_trailing_comment(node: cst.SimpleStatementLine) -> typing.Optional[str]:
     return None
 
 
+def get_deprecation_comment(
+    leading_comment: typing.Optional[str],
+    trailing_comment: typing.Optional[str],
+    deprecation_comment_marker_pattern: re.Pattern,
+) -> typing.Optional[str]:
+    for comment in (leading_comment, trailing_comment):
+        if comment and deprecation_comment_marker_pattern.search(comment) is not None:
+            return comment
+    return None
+
+
 def get_model_field_name(node: cst.SimpleStatementLine) -> str:
     if isinstance(node.body[0], cst.AnnAssign):
         return node.body[0].target.value
@@ -118,17 +142,15 @@ class DeprecatedModelFieldValidator(m.MatcherDecoratableVisitor):
         if not self.matches(node, django_model_field_with_comments):
             return None
 
-        leading_comment = get_leading_comment(node)
-        trailing_comment = get_trailing_comment(node)
-
-        if leading_comment and self.is_deprecation_comment(leading_comment):
-            is_valid_deprecation_comment = self.is_valid_deprecation_comment(leading_comment)
-        elif trailing_comment and self.is_deprecation_comment(trailing_comment):
-            is_valid_deprecation_comment = self.is_valid_deprecation_comment(trailing_comment)
-        else:
+        deprecation_comment = get_deprecation_comment(
+            get_leading_comment(node),
+            get_trailing_comment(node),
+            self.deprecation_comment_marker_pattern,
+        )
+        if deprecation_comment is None:
             return None
 
-        if not is_valid_deprecation_comment:
+        if not self.is_valid_deprecation_comment(deprecation_comment):
             position = self.get_metadata(PositionProvider, node)
             self.errors.append(
                 Error(
@@ -147,11 +169,7 @@ class DeprecatedModelFieldValidator(m.MatcherDecoratableVisitor):
 def get_input_models_files(
     args: list[str] | None = None, dirs_to_exclude: list[str] | None = None
 ) -> typing.Iterator[str]:
-    return (
-        filepath
-        for filepath in get_input_files(args, dirs_to_exclude, 'py')
-        if filepath.endswith('/models.py') or '/models/' in filepath
-    )
+    return get_input_files(args, dirs_to_exclude, 'py', roles=FileRole.MODELS)
 
 
 def validate_deprecated_model_field_comments(
@@ -159,14 +177,60 @@ def validate_deprecated_model_field_comments(
     valid_deprecation_comment_pattern: re.Pattern,
     deprecation_comment_marker_pattern: re.Pattern,
 ) -> typing.List[Error]:
-    with open(model_file_path) as f:
-        file_content = f.read()
+    source_file = read_source_file_for_parsing(model_file_path)
+    if source_file is None:
+        return []
 
     validator = DeprecatedModelFieldValidator(
         model_file_path, valid_deprecation_comment_pattern, deprecation_comment_marker_pattern
     )
-    module = cst.parse_module(file_content)
-    return validator.run_for_module(module).errors
+    errors = call_with_parse_guard(
+        model_file_path,
+        lambda: validator.run_for_module(cst.parse_module(source_file.content)).errors,
+        (*UNPARSABLE_ERRORS, cst.ParserSyntaxError),
+    )
+    return errors or []
+
+
+def get_deprecated_model_field_comments_errors(
+    models_module: ModelsModule,
+    valid_deprecation_comment_pattern: re.Pattern,
+    deprecation_comment_marker_pattern: re.Pattern,
+) -> typing.List[Error]:
+    errors = []
+    for field in models_module.iterate_fields():
+        if not field.is_line_statement or field.field_type is None:
+            continue
+        if not is_model_field_type(field.field_type):
+            continue
+        deprecation_comment = get_deprecation_comment(
+            field.leading_comment, field.trailing_comment, deprecation_comment_marker_pattern
+        )
+        if deprecation_comment is None:
+            continue
+        if valid_deprecation_comment_pattern.search(deprecation_comment) is None:
+            errors.append(Error(models_module.path, field.lineno, field.col_offset, field.name))
+    return errors
+
+
+def iterate_deprecated_model_field_comments_errors(
+    model_file_paths: typing.Iterable[str],
+    valid_deprecation_comment_pattern: re.Pattern,
+    deprecation_comment_marker_pattern: re.Pattern,
+    parser_name: str = DEFAULT_PARSER,
+) -> typing.Iterator[typing.List[Error]]:
+    if parser_name == 'libcst':
+        for model_file_path in model_file_paths:
+            yield validate_deprecated_model_field_comments(
+                str(model_file_path),
+                valid_deprecation_comment_pattern,
+                deprecation_comment_marker_pattern,
+            )
+        return
+    for models_module in build_django_model_index(model_file_paths).iterate_modules():
+        yield get_deprecated_model_field_comments_errors(
+            models_module, valid_deprecation_comment_pattern, deprecation_comment_marker_pattern
+        )
 
 
 def main(args: typing.Optional[typing.Sequence[str]] = None) -> int:
@@ -185,21 +249,28 @@ def main(args: typing.Optional[typing.Sequence[str]] = None) -> int:
             '(without checking whether the deprecation comment is valid or not).'
         ),
     )
+    parser.add_argument(
+        '--parser',
+        choices=PARSERS,
+        default=DEFAULT_PARSER,
+        help='ast is faster, libcst is kept as a fallback',
+    )
     args, _ = parser.parse_known_args(args)
     valid_deprecation_comment_pattern = re.compile(args.valid_deprecation_comment_regex)
     deprecation_comment_marker_pattern = re.compile(args.deprecation_comment_marker_regex)
 
-    has_errors = False
-    for model_file_path in get_input_models_files():
-        errors = validate_deprecated_model_field_comments(
-            model_file_path, valid_deprecation_comment_pattern, deprecation_comment_marker_pattern
+    errors_count = report_diagnostics(
+        error
+        for errors in iterate_deprecated_model_field_comments_errors(
+            get_input_models_files(),
+            valid_deprecation_comment_pattern,
+            deprecation_comment_marker_pattern,
+            args.parser,
         )
-        if errors:
-            has_errors = True
-            for error in errors:
-                print(error)  # noqa: T001
+        for error in errors
+    )
 
-    if has_errors:
+    if errors_count:
         print(
             f'HINT: Valid deprecation comment pattern: {args.valid_deprecation_comment_regex}'
         )  # noqa: T001
@@ -3,10 +3,13 @@ from __future__ import annotations
 import ast
 import re
 import sys
-from typing import Iterable, Iterator, List, NamedTuple, Optional
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
 
-from hooks.utils.ast_helpers import get_ast_tree
 from hooks.utils.common_types import AssignOrAnnAssign
+from hooks.utils.diagnostics import Diagnostic, report_diagnostics
+from hooks.utils.django_models import ModelsModule, build_django_model_index
+from hooks.utils.file_roles import FileRole, has_any_role
 from hooks.utils.pre_commit import get_input_files
 
 BOOLEAN_VERBS = ('is', 'was', 'has', 'needs', 'should')
@@ -56,40 +59,46 @@ VALIDATORS = [
 ]
 
 
+# Одна регулярка на все типы: lookahead-ветки проверяются в порядке VALIDATORS,
+# так что DateTime выигрывает у Date, как и при поиске подстрок по очереди
+FIELD_TYPE_REGEX = re.compile(
+    r'(?=\w*Field$)(?:{0})'.format(
+        '|'.join(fr'(?=\w*?(?P<{stem}>{stem}))' for stem, _ in VALIDATORS)
+    )
+)
+VALIDATORS_BY_STEM: Dict[str, BaseValidator] = dict(VALIDATORS)
+
+
+@lru_cache(maxsize=None)
 def get_validator(field_type: str) -> Optional[BaseValidator]:
-    if not field_type.endswith('Field'):
+    match = FIELD_TYPE_REGEX.match(field_type)
+    if match is None or match.lastgroup is None:
         return None
-    for stem, validator in VALIDATORS:
-        if stem in field_type:
-            return validator
-    return None
+    return VALIDATORS_BY_STEM[match.lastgroup]
 
 
-class Error(NamedTuple):
-    filepath: str
-    lineno: int
-    field_name: str
-    field_type: str
-    validator: BaseValidator
+class Error(Diagnostic):
+    __slots__ = ('field_name', 'field_type', 'validator')
 
-    def __str__(self) -> str:
-        return (
-            f'{self.filepath}:{self.lineno} '
-            f'{self.field_type} "{self.field_name}" should be named "{self.validator.field_name_format}"'
-        )
+    rule_id = 'django-model-field-names'
+    fields = __slots__
+    message_template = '{path}:{line} {1} "{0}" should be named "{2.field_name_format}"'
 
+    def __init__(
+        self, filepath: str, lineno: int, field_name: str, field_type: str, validator: BaseValidator
+    ) -> None:
+        super().__init__(filepath, lineno)
+        self.field_name = field_name
+        self.field_type = field_type
+        self.validator = validator
 
-def is_models_filepath(filepath: str) -> bool:
-    return filepath.endswith('/models.py') or '/models/' in filepath
-
+    @property
+    def filepath(self) -> str:
+        return self.path
 
-def iterate_module_classdef_assigns(module: ast.Module) -> Iterator[AssignOrAnnAssign]:
-    for node in module.body:
-        if not isinstance(node, ast.ClassDef):
-            continue
-        for child_node in node.body:
-            if isinstance(child_node, (ast.Assign, ast.AnnAssign)):
-                yield child_node
+    @property
+    def lineno(self) -> int:
+        return self.line
 
 
 def get_assign_target_name(assign: AssignOrAnnAssign) -> Optional[str]:
@@ -133,23 +142,34 @@ def check_assign(assign: AssignOrAnnAssign, filepath: str) -> Optional[Error]:
     )
 
 
-def validate(filepaths: Iterable[str]) -> List[Error]:
+def validate_models_module(models_module: ModelsModule) -> List[Error]:
     errors = []
-    for models_filepath in filter(is_models_filepath, filepaths):
-        module = get_ast_tree(models_filepath)
-        if not module:
+    for field in models_module.iterate_fields():
+        if not field.field_type or not field.is_class_attribute:
             continue
-        for assign in iterate_module_classdef_assigns(module):
-            error = check_assign(assign, models_filepath)
-            if error:
-                errors.append(error)
-                print(error)  # noqa: T001
+        validator = get_validator(field.field_type)
+        if validator and not validator.validate(field.name):
+            errors.append(
+                Error(models_module.path, field.lineno, field.name, field.field_type, validator)
+            )
+    return errors
+
+
+def is_models_filepath(filepath: str) -> bool:
+    """models.py или любой .py внутри пакета models, на любой глубине."""
+    return has_any_role(filepath, FileRole.MODELS)
+
+
+def validate(filepaths: Iterable[str]) -> List[Error]:
+    errors = []
+    model_index = build_django_model_index(filter(is_models_filepath, filepaths))
+    for models_module in model_index.iterate_modules():
+        errors += validate_models_module(models_module)
     return errors
 
 
 def main() -> int:
-    errors = validate(get_input_files())
-    return 1 if errors else 0
+    return 1 if report_diagnostics(validate(get_input_files())) else 0
 
 
 if __name__ == '__main__':
@@ -1,18 +1,38 @@
 from __future__ import annotations
 
-from collections import namedtuple
-from typing import Iterator, List, cast
+import argparse
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union, cast
 
 import libcst
 from libcst import Assign, SimpleStatementLine
 from libcst import matchers as m
 from libcst.metadata import MetadataWrapper, PositionProvider
 
+from hooks.utils.diagnostics import Diagnostic, report_diagnostics
+from hooks.utils.django_models import ModelField, ModelsModule, build_django_model_index
+from hooks.utils.file_roles import FileRole
 from hooks.utils.pre_commit import get_input_files
+from hooks.utils.source_file import (
+    UNPARSABLE_ERRORS,
+    call_with_parse_guard,
+    read_source_file_for_parsing,
+)
 
+PARSERS = ('ast', 'libcst')
+DEFAULT_PARSER = 'ast'
 VALID_COMMENTS_FOR_NULL_TRUE = {'null_by_design', 'null_for_compatibility'}
 
-Error = namedtuple('Error', 'line, col, field')
+
+class Error(Diagnostic):
+    __slots__ = ('field',)
+
+    rule_id = 'django-null-comments'
+    fields = __slots__
+    message_template = '{path}:{line}:{col} Field "{0}" needs a valid comment for its\' "null=True"'
+
+    def __init__(self, line: int, col: int, field: str, path: str = '') -> None:
+        super().__init__(path, line, col)
+        self.field = field
 
 
 def is_valid_comment(comment_text: str) -> bool:
@@ -69,34 +89,79 @@ class FieldValidator(m.MatcherDecoratableVisitor):
 def get_input_models_files(
     args: list[str] | None = None, dirs_to_exclude: list[str] | None = None
 ) -> Iterator[str]:
-    return (
-        filepath
-        for filepath in get_input_files(args, dirs_to_exclude, 'py')
-        if filepath.endswith('/models.py') or '/models/' in filepath
-    )
+    return get_input_files(args, dirs_to_exclude, 'py', roles=FileRole.MODELS)
 
 
-def validate_null_comments(file_content: str) -> List[Error]:
+def validate_null_comments(file_content: Union[str, bytes]) -> List[Error]:
     validator = FieldValidator()
     module = libcst.parse_module(file_content)
     MetadataWrapper(module).visit(validator)
     return validator.errors
 
 
-def main() -> int:
-    has_errors = False
-    for model_file_path in get_input_models_files():
-        with open(model_file_path) as f:
-            errors = validate_null_comments(f.read())
-            if errors:
-                has_errors = True
-                for line, col, field in errors:
-                    print(  # noqa: T001
-                        f'{model_file_path}:{line}:{col} Field "{field}" needs '
-                        'a valid comment for its\' "null=True"'
-                    )
-
-    if has_errors:
+def is_nullable_field(field: ModelField) -> bool:
+    return field.get_kwarg('null') == 'True' or field.field_type == 'NullBooleanField'
+
+
+def has_valid_null_comment(field: ModelField) -> bool:
+    return any(
+        comment is not None and is_valid_comment(comment)
+        for comment in (field.leading_comment, field.trailing_comment)
+    )
+
+
+def get_null_comments_errors(models_module: ModelsModule) -> List[Error]:
+    return [
+        Error(field.lineno, field.col_offset, field.name)
+        for field in models_module.iterate_fields()
+        if field.is_line_statement
+        and not field.is_annotated
+        and is_nullable_field(field)
+        and not has_valid_null_comment(field)
+    ]
+
+
+def get_null_comments_errors_with_libcst(model_file_path: str) -> List[Error]:
+    source_file = read_source_file_for_parsing(model_file_path)
+    if source_file is None:
+        return []
+    errors = call_with_parse_guard(
+        model_file_path,
+        lambda: validate_null_comments(source_file.content),
+        (*UNPARSABLE_ERRORS, libcst.ParserSyntaxError),
+    )
+    return errors or []
+
+
+def iterate_null_comments_errors(
+    model_file_paths: Iterable[str], parser_name: str = DEFAULT_PARSER
+) -> Iterator[Tuple[str, List[Error]]]:
+    if parser_name == 'libcst':
+        for model_file_path in model_file_paths:
+            yield model_file_path, get_null_comments_errors_with_libcst(model_file_path)
+        return
+    for models_module in build_django_model_index(model_file_paths).iterate_modules():
+        yield models_module.path, get_null_comments_errors(models_module)
+
+
+def main(args: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--parser',
+        choices=PARSERS,
+        default=DEFAULT_PARSER,
+        help='ast is faster, libcst is kept as a fallback',
+    )
+    known_args, _ = parser.parse_known_args(args)
+
+    errors_count = report_diagnostics(
+        error.with_path(model_file_path)
+        for model_file_path, errors in iterate_null_comments_errors(
+            get_input_models_files(), known_args.parser
+        )
+        for error in errors
+    )
+    if errors_count:
         return 1
 
     return 0
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
+import argparse
 import ast
-import io
 import itertools
-from typing import Any, Dict, Iterator, List
+from typing import Any, Dict, Iterator, List, Optional, Sequence
 
 from hooks.utils.ast_helpers import (
     get_ast_node_col_offset,
@@ -11,8 +11,16 @@ from hooks.utils.ast_helpers import (
     get_ast_node_lineno,
     get_ast_tree_with_content,
     is_django_orm_query,
+    iterate_ast_trees_with_content,
     iterate_over_expressions,
 )
+from hooks.utils.baseline import (
+    add_baseline_arguments,
+    report_new_diagnostics,
+    validate_baseline_arguments,
+)
+from hooks.utils.diagnostics import Diagnostic
+from hooks.utils.noqa import build_noqa_index
 from hooks.utils.pre_commit import get_input_files
 
 # Build the simple_type tuple based on Python version
@@ -49,6 +57,52 @@ class UnknownAstNodeError(BaseAstNodeError):
     pass
 
 
+MAX_EXPRESSION_COMPLEXITY = 9
+
+
+class ExpressionComplexityError(Diagnostic):
+    __slots__ = ('complexity', 'max_complexity')
+
+    rule_id = 'expr-complexity'
+    fields = __slots__
+    message_template = '{path}:{line} expression is too complex ({0}>{1})'
+
+    def __init__(self, path: str, lineno: int, complexity: float, max_complexity: float) -> None:
+        super().__init__(path, lineno)
+        self.complexity = complexity
+        self.max_complexity = max_complexity
+
+
+class UnknownExpressionError(Diagnostic):
+    """Выражение, сложность которого не посчитать: строка исходника с подчеркнутым узлом."""
+
+    __slots__ = ('error', 'source_line', 'end_col_offset')
+
+    rule_id = 'expr-complexity'
+    fields = ('error', 'source_line', 'marker')
+    message_template = '{0} in {path}:{line}\n{1}\n{2}'
+
+    def __init__(
+        self,
+        path: str,
+        lineno: int,
+        error: str,
+        source_line: str,
+        col_offset: int,
+        end_col_offset: Optional[int],
+    ) -> None:
+        super().__init__(path, lineno, col_offset)
+        self.error = error
+        self.source_line = source_line
+        self.end_col_offset = end_col_offset
+
+    @property
+    def marker(self) -> str:
+        col_offset = self.col or 0
+        end_col_offset = self.end_col_offset or len(self.source_line)
+        return ' ' * col_offset + '^' * (end_col_offset - col_offset)
+
+
 NODE_TYPES_BY_CLASS = [
     (ast.Assert, 'assert'),
     (ast.Assign, 'assign'),
@@ -166,43 +220,57 @@ def get_expression_complexity(node: ast.AST) -> float:
     return max((get_expression_complexity(n) for n in info['subnodes']), default=0) + score_addon
 
 
-def format_exception(exception: BaseAstNodeError, filepath: str, file_lines: List[str]) -> str:
+def get_unknown_expression_error(
+    exception: BaseAstNodeError, filepath: str, file_lines: List[str]
+) -> UnknownExpressionError:
     node = exception.node
     lineno = get_ast_node_lineno(node)
-    col_offset = get_ast_node_col_offset(node)
-    end_col_offset = get_ast_node_end_col_offset(node)
-    line = file_lines[lineno - 1]
-    error_message = io.StringIO()
-    error_message.write(f'{exception} in {filepath}:{lineno}\n')
-    error_message.write(line)
-    error_message.write('\n')
-    error_message.write(' ' * col_offset)
-    error_message.write('^' * ((end_col_offset or len(line)) - col_offset))
-    return error_message.getvalue()
+    return UnknownExpressionError(
+        filepath,
+        lineno,
+        str(exception),
+        file_lines[lineno - 1],
+        get_ast_node_col_offset(node),
+        get_ast_node_end_col_offset(node),
+    )
+
+
+def format_exception(exception: BaseAstNodeError, filepath: str, file_lines: List[str]) -> str:
+    return get_unknown_expression_error(exception, filepath, file_lines).format()
 
 
 def get_file_errors(
     pyfilepath: str, max_expression_complexity: int, ignore_django_orm_queries: bool
-) -> Iterator[str]:
+) -> Iterator[Diagnostic]:
     ast_tree, file_content = get_ast_tree_with_content(pyfilepath)
     if ast_tree is None or file_content is None:
         return
-
+    yield from get_tree_errors(
+        pyfilepath, ast_tree, file_content, max_expression_complexity, ignore_django_orm_queries
+    )
+
+
+def get_tree_errors(
+    pyfilepath: str,
+    ast_tree: ast.AST,
+    file_content: str,
+    max_expression_complexity: int,
+    ignore_django_orm_queries: bool,
+) -> Iterator[Diagnostic]:
     file_lines = file_content.split('\n')
+    noqa_index = build_noqa_index(file_content)
     for expression in iterate_over_expressions(ast_tree):
         if is_django_orm_query(expression) and ignore_django_orm_queries:
             continue
         try:
             complexity = get_expression_complexity(expression)
         except UnknownAstNodeError as exc:
-            formatted_error_message = format_exception(exc, pyfilepath, file_lines)
-            yield formatted_error_message
+            yield get_unknown_expression_error(exc, pyfilepath, file_lines)
         else:
-            if (
-                complexity > max_expression_complexity
-                and '# noqa' not in file_lines[get_ast_node_lineno(expression) - 1]
+            if complexity > max_expression_complexity and not noqa_index.has_noqa(
+                get_ast_node_lineno(expression)
             ):
-                yield '{0}:{1} expression is too complex ({2}>{3})'.format(
+                yield ExpressionComplexityError(
                     pyfilepath,
                     get_ast_node_lineno(expression),
                     complexity,
@@ -210,17 +278,29 @@ def get_file_errors(
                 )
 
 
-def main() -> int:
-    has_errors = False
-
-    for pyfilepath in get_input_files():
-        for error_message in get_file_errors(
-            pyfilepath, max_expression_complexity=9, ignore_django_orm_queries=True
-        ):
-            has_errors = True
-            print(error_message)  # noqa: T001
-
-    return int(has_errors)
+def main(args: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser()
+    add_baseline_arguments(parser)
+    known_args, files = parser.parse_known_args(args)
+    validate_baseline_arguments(parser, known_args)
+    errors_count = report_new_diagnostics(
+        (
+            error
+            for pyfilepath, ast_tree, file_content in iterate_ast_trees_with_content(
+                get_input_files(files or ['.'])
+            )
+            for error in get_tree_errors(
+                pyfilepath,
+                ast_tree,
+                file_content,
+                max_expression_complexity=MAX_EXPRESSION_COMPLEXITY,
+                ignore_django_orm_queries=True,
+            )
+        ),
+        known_args.baseline,
+        known_args.update_baseline,
+    )
+    return int(bool(errors_count))
 
 
 if __name__ == '__main__':
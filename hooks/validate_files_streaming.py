@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import argparse
+import ast
+import functools
+import sys
+import tracemalloc
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from hooks import (
+    validate_ajustable_complexity,
+    validate_api_schema_annotations,
+    validate_expressions_complexity,
+    validate_no_asserts,
+    validate_old_style_annotations,
+    validate_settings_variables,
+)
+from hooks.utils.baseline import (
+    add_baseline_arguments,
+    report_new_diagnostics,
+    validate_baseline_arguments,
+)
+from hooks.utils.class_hierarchy import ClassHierarchy
+from hooks.utils.diagnostics import Diagnostic
+from hooks.utils.pre_commit import get_input_files
+from hooks.utils.source_file import get_parse_limits
+from hooks.utils.streaming import (
+    DEFAULT_MAX_PARSED_FILES,
+    FileRule,
+    StreamingRunner,
+    can_fork_workers,
+    get_limits_for_budget,
+    get_memory_report,
+)
+
+
+def _is_any_file(filepath: str) -> bool:
+    return True
+
+
+def _get_complexity_errors(
+    pyfilepath: str,
+    ast_tree: ast.Module,
+    file_content: str,
+    complexity_limits: Tuple[int, List[Tuple[str, int]]],
+) -> List[validate_ajustable_complexity.ComplexityError]:
+    default_max_allowed_complexity, per_path_max_complexity = complexity_limits
+    max_allowed_complexity = validate_ajustable_complexity.get_max_complexity_for_path(
+        pyfilepath, per_path_max_complexity, default_max_allowed_complexity
+    )
+    return validate_ajustable_complexity.get_file_errors(
+        pyfilepath, ast_tree, file_content, max_allowed_complexity
+    )
+
+
+def _get_expressions_complexity_errors(
+    pyfilepath: str, ast_tree: ast.Module, file_content: str
+) -> List[Diagnostic]:
+    return list(
+        validate_expressions_complexity.get_tree_errors(
+            pyfilepath,
+            ast_tree,
+            file_content,
+            max_expression_complexity=validate_expressions_complexity.MAX_EXPRESSION_COMPLEXITY,
+            ignore_django_orm_queries=True,
+        )
+    )
+
+
+def get_file_rules(class_hierarchy: ClassHierarchy | None = None) -> Dict[str, FileRule]:
+    """Правила по id хуков из .pre-commit-hooks.yaml."""
+    api_class_hierarchy = class_hierarchy or ClassHierarchy()
+    rules = [
+        FileRule(
+            'mccabe-complexity',
+            _is_any_file,
+            functools.partial(
+                _get_complexity_errors,
+                complexity_limits=validate_ajustable_complexity.get_complexity_limits(),
+            ),
+        ),
+        FileRule('expr-complexity', _is_any_file, _get_expressions_complexity_errors),
+        FileRule(
+            'no-asserts',
+            _is_any_file,
+            lambda pyfilepath, ast_tree, _: validate_no_asserts.get_file_errors(
+                pyfilepath, ast_tree
+            ),
+        ),
+        FileRule(
+            'old-style-annotations',
+            _is_any_file,
+            lambda pyfilepath, ast_tree, _: validate_old_style_annotations.get_file_errors(
+                pyfilepath, ast_tree
+            ),
+        ),
+        FileRule(
+            'settings-variables',
+            validate_settings_variables.is_settings_filepath,
+            validate_settings_variables.get_file_errors,
+        ),
+        FileRule(
+            'api-annotated',
+            validate_api_schema_annotations.is_api_schema_filepath,
+            lambda pyfilepath, ast_tree, _: validate_api_schema_annotations.get_file_errors(
+                pyfilepath, ast_tree, api_class_hierarchy
+            ),
+        ),
+    ]
+    return {rule.name: rule for rule in rules}
+
+
+def main(args: Optional[Sequence[str]] = None) -> int:
+    file_rules = get_file_rules()
+    parser = argparse.ArgumentParser(
+        description='Run several file checks in one process, parsing each file once.'
+    )
+    parser.add_argument(
+        '--rules',
+        default=','.join(file_rules),
+        help=f'Comma-separated hook ids to run (default: all of {", ".join(file_rules)})',
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Files checked concurrently; with parse-timeout set they are checked in worker '
+        'processes and a file exceeding it is skipped',
+    )
+    parser.add_argument(
+        '--max-parsed-files',
+        type=int,
+        default=DEFAULT_MAX_PARSED_FILES,
+        help='Upper bound of files held parsed at once',
+    )
+    parser.add_argument(
+        '--read-ahead',
+        type=int,
+        help='Files read ahead in background threads while others are parsed '
+        '(default: read-ahead from config or 8, 0 disables)',
+    )
+    parser.add_argument(
+        '--memory-budget',
+        type=float,
+        metavar='MB',
+        help='Caps workers and parsed files so that read-ahead sources and worst-case '
+        'trees fit the budget',
+    )
+    parser.add_argument(
+        '--memory-report',
+        action='store_true',
+        help='Print peak RSS and top tracemalloc allocations to stderr',
+    )
+    add_baseline_arguments(parser)
+    known_args, files = parser.parse_known_args(args)
+    validate_baseline_arguments(parser, known_args)
+
+    rule_names = [name.strip() for name in known_args.rules.split(',') if name.strip()]
+    unknown_rule_names = sorted(set(rule_names) - set(file_rules))
+    if unknown_rule_names:
+        parser.error(f'unknown rules: {", ".join(unknown_rule_names)}')
+
+    if known_args.memory_report:
+        tracemalloc.start()
+
+    workers, max_parsed_files = known_args.workers, known_args.max_parsed_files
+    if known_args.memory_budget:
+        workers, max_parsed_files = get_limits_for_budget(
+            known_args.memory_budget, workers, max_parsed_files, known_args.read_ahead
+        )
+    timeout_seconds = get_parse_limits().timeout_seconds
+    if workers > 1 and timeout_seconds and not can_fork_workers():
+        # без fork воркеры - потоки, а SIGALRM доступен только главному
+        print(  # noqa: T001
+            'warning: parse-timeout is not applied with --workers > 1 on this platform',
+            file=sys.stderr,
+        )
+    runner = StreamingRunner(
+        [file_rules[name] for name in rule_names],
+        workers,
+        max_parsed_files,
+        known_args.read_ahead,
+        timeout_seconds,
+    )
+
+    errors_count = report_new_diagnostics(
+        runner.iterate_errors(get_input_files(files or ['.'])),
+        known_args.baseline,
+        known_args.update_baseline,
+    )
+
+    if known_args.memory_report:
+        print(runner.format_memory_report(get_memory_report()), file=sys.stderr)  # noqa: T001
+        tracemalloc.stop()
+    return int(bool(errors_count))
+
+
+if __name__ == '__main__':
+    exit(main())
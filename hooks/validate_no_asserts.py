@@ -1,12 +1,28 @@
 from __future__ import annotations
 
 import ast
-from typing import Optional
+from typing import List, Optional
 
 from hooks.utils.ast_helpers import get_ast_tree_with_content
+from hooks.utils.diagnostics import Diagnostic, report_diagnostics
 from hooks.utils.pre_commit import get_input_files
 
 
+class AssertUsage(Diagnostic):
+    __slots__ = ()
+
+    rule_id = 'no-asserts'
+    message_template = '{path}:{line} assert usage detected'
+
+
+def get_file_errors(pyfilepath: str, ast_tree: ast.AST) -> List[AssertUsage]:
+    return [
+        AssertUsage(pyfilepath, assert_node.lineno)
+        for assert_node in ast.walk(ast_tree)
+        if isinstance(assert_node, ast.Assert)
+    ]
+
+
 def main() -> Optional[int]:
     has_errors = False
     for pyfilepath in get_input_files():
@@ -14,11 +30,8 @@ def main() -> Optional[int]:
         ast_tree, file_content = ast_tree_results
         if ast_tree is None or file_content is None:
             continue
-        for assert_node in [n for n in ast.walk(ast_tree) if isinstance(n, ast.Assert)]:
+        if report_diagnostics(get_file_errors(pyfilepath, ast_tree)):
             has_errors = True
-            print(  # noqa: T001
-                '{0}:{1} assert usage detected'.format(pyfilepath, assert_node.lineno)
-            )
 
     if has_errors:
         return 1
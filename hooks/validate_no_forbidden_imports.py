@@ -1,31 +1,97 @@
 from __future__ import annotations
 
 import ast
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-from hooks.utils.ast_helpers import get_ast_tree, get_full_imported_name
-from hooks.utils.mypy_api_helpers import get_list_param_from_configs
+from hooks.utils.diagnostics import Diagnostic, report_diagnostics
+from hooks.utils.import_graph import (
+    DottedNameTrie,
+    ImportedName,
+    ImportGraph,
+    add_project_packages,
+    build_import_graph,
+    extract_imports,
+    get_reachable_names,
+    report_module_name_collisions,
+)
+from hooks.utils.mypy_api_helpers import get_bool_param_from_configs, get_list_param_from_configs
 from hooks.utils.pre_commit import get_input_files
 
 
+class ForbiddenImportError(Diagnostic):
+    __slots__ = ()
+
+    rule_id = 'forbidden-imports'
+    message_template = '{path}:{line} Forbidden import'
+
+
+class TransitiveForbiddenImportError(Diagnostic):
+    __slots__ = ('forbidden_names', 'dependency')
+
+    rule_id = 'forbidden-imports'
+    fields = ('forbidden_names_text', 'dependency')
+    message_template = '{path}:{line} Forbidden import {0} is reachable through {1}'
+
+    def __init__(
+        self, path: str, line: int, forbidden_names: Tuple[str, ...], dependency: str
+    ) -> None:
+        super().__init__(path, line)
+        self.forbidden_names = forbidden_names
+        self.dependency = dependency
+
+    @property
+    def forbidden_names_text(self) -> str:
+        return ', '.join(self.forbidden_names)
+
+
 def is_import_in_list(imported_name: str, forbidden_imports: List[str]) -> bool:
-    if imported_name in forbidden_imports:
-        return True
-    for forbidden_import in forbidden_imports:
-        if forbidden_import.startswith(f'{imported_name}.'):
-            return True
-    return False
+    return DottedNameTrie(forbidden_imports).matches(imported_name)
+
+
+def get_import_errors(
+    pyfilepath: str, imports: List[ImportedName], forbidden_imports_trie: DottedNameTrie
+) -> List[ForbiddenImportError]:
+    return [
+        ForbiddenImportError(pyfilepath, imported_name.lineno)
+        for imported_name in imports
+        if forbidden_imports_trie.matches(imported_name.name)
+    ]
 
 
 def get_import_errors_in_ast_tree(
     pyfilepath: str, ast_tree: ast.AST, forbidden_imports: List[str]
-) -> List[str]:
-    errors: List[str] = []
-    imports = [n for n in ast.walk(ast_tree) if isinstance(n, (ast.Import, ast.ImportFrom))]
-    for import_node in imports:
-        for import_name in get_full_imported_name(import_node):
-            if is_import_in_list(import_name, forbidden_imports):
-                errors.append(f'{pyfilepath}:{import_node.lineno} Forbidden import')
+) -> List[ForbiddenImportError]:
+    return get_import_errors(
+        pyfilepath, extract_imports(ast_tree), DottedNameTrie(forbidden_imports)
+    )
+
+
+def get_transitive_import_errors(
+    import_graph: ImportGraph, module_names: List[str], forbidden_imports_trie: DottedNameTrie
+) -> List[TransitiveForbiddenImportError]:
+    forbidden_names_by_module = {
+        module_name: [
+            imported_name.name
+            for imported_name in imports
+            if forbidden_imports_trie.matches(imported_name.name)
+        ]
+        for module_name, imports in import_graph.imports_by_module.items()
+    }
+    reachable_forbidden_names = get_reachable_names(import_graph, forbidden_names_by_module)
+
+    errors: List[TransitiveForbiddenImportError] = []
+    for module_name in module_names:
+        for dependency, lineno in import_graph.get_local_dependencies(module_name):
+            forbidden_names = reachable_forbidden_names[dependency]
+            if forbidden_names:
+                errors.append(
+                    TransitiveForbiddenImportError(
+                        import_graph.filepath_by_module[module_name],
+                        lineno,
+                        tuple(sorted(forbidden_names)),
+                        dependency,
+                    )
+                )
     return errors
 
 
@@ -34,18 +100,21 @@ def main() -> Optional[int]:
     if not forbidden_imports:
         return None
 
-    errors: List[str] = []
-
-    for pyfilepath in get_input_files():
-        ast_tree: Optional[ast.Module] = get_ast_tree(pyfilepath)
-        if ast_tree is None:
-            continue
+    forbidden_imports_trie = DottedNameTrie(forbidden_imports)
+    import_graph = build_import_graph(get_input_files())
+    input_modules = list(import_graph.imports_by_module)
+    errors: List[Diagnostic] = []
+    for module_name, imports in import_graph.imports_by_module.items():
+        errors += get_import_errors(
+            import_graph.filepath_by_module[module_name], imports, forbidden_imports_trie
+        )
 
-        errors += get_import_errors_in_ast_tree(pyfilepath, ast_tree, forbidden_imports)
+    if get_bool_param_from_configs('project_structure', 'forbidden_imports_transitive'):
+        add_project_packages(import_graph)
+        errors += get_transitive_import_errors(import_graph, input_modules, forbidden_imports_trie)
 
-    for error in errors:
-        print(error)  # noqa: T001
-    if errors:
+    report_module_name_collisions(import_graph)
+    if report_diagnostics(errors):
         return 1
 
 
@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import ast
 import itertools
-from typing import Optional
+from typing import List, Optional
 
 from hooks.utils.ast_helpers import get_ast_tree_with_content
+from hooks.utils.diagnostics import Diagnostic, report_diagnostics
 from hooks.utils.pre_commit import get_input_files
 
 
@@ -17,22 +18,33 @@ def _is_old_style_string_annotation(node: ast.expr | None) -> bool:
     return str_node_type is not None and isinstance(node, str_node_type)
 
 
+class OldStyleAnnotation(Diagnostic):
+    __slots__ = ()
+
+    rule_id = 'old-style-annotations'
+    message_template = '{path}:{line} old style annotation'
+
+
+def get_file_errors(pyfilepath: str, ast_tree: ast.AST) -> List[OldStyleAnnotation]:
+    errors = []
+    for annotated in itertools.chain(
+        [n.annotation for n in ast.walk(ast_tree) if isinstance(n, ast.AnnAssign)],
+        [n.annotation for n in ast.walk(ast_tree) if isinstance(n, ast.arg) and n.annotation],
+        [n.returns for n in ast.walk(ast_tree) if isinstance(n, ast.FunctionDef) and n.returns],
+    ):
+        if _is_old_style_string_annotation(annotated):
+            errors.append(OldStyleAnnotation(pyfilepath, annotated.lineno))
+    return errors
+
+
 def main() -> Optional[int]:
     has_errors = False
     for pyfilepath in get_input_files():
         ast_tree, file_content = get_ast_tree_with_content(pyfilepath)
         if ast_tree is None or file_content is None:
             continue
-        for annotated in itertools.chain(
-            [n.annotation for n in ast.walk(ast_tree) if isinstance(n, ast.AnnAssign)],
-            [n.annotation for n in ast.walk(ast_tree) if isinstance(n, ast.arg) and n.annotation],
-            [n.returns for n in ast.walk(ast_tree) if isinstance(n, ast.FunctionDef) and n.returns],
-        ):
-            if _is_old_style_string_annotation(annotated):
-                has_errors = True
-                print(  # noqa: T001
-                    '{0}:{1} old style annotation'.format(pyfilepath, annotated.lineno)
-                )
+        if report_diagnostics(get_file_errors(pyfilepath, ast_tree)):
+            has_errors = True
 
     if has_errors:
         return 1
@@ -15,74 +15,149 @@
 [x] нет пустых файлов кроме инитов
 [ ] миграции не импортируют модели
 [ ] миграций не больше 30
+[x] импорты между слоями соблюдают контракты из [tool.project_structure]
 """
 
 from __future__ import annotations
 
 import ast
+import functools
 import os
-from typing import Callable, List, Optional
+from typing import Callable, List, Optional, Sequence
 
 from hooks.utils.ast_helpers import (
     get_assignments_to,
     get_ast_node_lineno,
     get_ast_tree,
-    get_check_decorators_includes,
     get_not_ok_base_nodes_from,
     has_import_of_function_from_package,
-    is_django_model_definition,
     is_enum_definition,
     logger_ast_nodes_conditional,
 )
-from hooks.utils.pre_commit import get_input_files, get_modules_files, is_django_model_file
+from hooks.utils.diagnostics import Diagnostic, report_diagnostics
+from hooks.utils.django_models import DjangoModelIndex
+from hooks.utils.import_graph import ImportGraph, build_import_graph, report_module_name_collisions
+from hooks.utils.layer_contracts import LayerContracts, get_layer_contracts_from_configs
+from hooks.utils.pre_commit import (
+    get_input_files,
+    get_module_name_from_path,
+    get_modules_files,
+    is_django_model_file,
+)
 
 
-def has_only_models_in_models_submodule(
-    module_name: str, module_path: str, module_files: List[str]
-) -> List[str]:
-    logger_object_name = 'logger'
+class PackageStructureError(Diagnostic):
+    __slots__ = ()
 
-    allowed_ast_nodes = {ast.Import, ast.ImportFrom, ast.If}
+    rule_id = 'package-structure'
 
-    conditionals_ast_nodes = logger_ast_nodes_conditional(logger_object_name)
 
-    conditionals_ast_nodes.extend(
-        [
-            (ast.ClassDef, is_django_model_definition),  # определения моделей
-            (  # пропуск определений классов по декоратору
-                ast.ClassDef,
-                get_check_decorators_includes({'pass_check_is_django_model_definition'}),
-            ),
-            (  # определения депрекейтед функций
-                ast.FunctionDef,
-                get_check_decorators_includes({'deprecated'}),
-            ),
-        ]
+class MisplacedModelsStatementError(PackageStructureError):
+    __slots__ = ()
+
+    message_template = (
+        '{path}:{line} Wrong instruction for models submodule (models should contains only models)'
+    )
+
+
+class MisplacedEnumError(PackageStructureError):
+    __slots__ = ('enums_filename',)
+
+    fields = __slots__
+    message_template = '{path}:{line} Enums should live in {0}'
+
+    def __init__(self, path: str, line: int, enums_filename: str) -> None:
+        super().__init__(path, line)
+        self.enums_filename = enums_filename
+
+
+class BlacklistedSuffixError(PackageStructureError):
+    __slots__ = ()
+
+    message_template = (
+        '{path} should be moved to utils subdirectory and remove suffix from filename'
     )
 
-    errors: List[str] = []
+    def __init__(self, path: str) -> None:
+        super().__init__(path, 0)
+
+
+class EmptyFileError(PackageStructureError):
+    __slots__ = ()
+
+    message_template = '{path} empty files are not allowed'
+
+    def __init__(self, path: str) -> None:
+        super().__init__(path, 0)
+
+
+class FunctionViewError(PackageStructureError):
+    __slots__ = ('views_filename',)
+
+    fields = __slots__
+    message_template = '{path}:{line} Only class views allowed in {0}'
+
+    def __init__(self, path: str, line: int, views_filename: str) -> None:
+        super().__init__(path, line)
+        self.views_filename = views_filename
+
+
+class MissingAssignmentError(PackageStructureError):
+    __slots__ = ('assignment_name',)
+
+    fields = __slots__
+    message_template = '{path} does not contain "{0}" assignment'
+
+    def __init__(self, path: str, assignment_name: str) -> None:
+        super().__init__(path, 0)
+        self.assignment_name = assignment_name
+
+
+class UrlCallError(PackageStructureError):
+    __slots__ = ()
+
+    message_template = '{path}:{line} url() call is deprecated, use path() instead'
+
+
+class LayerContractError(PackageStructureError):
+    __slots__ = ('importer_layer', 'imported_layer', 'imported_module')
 
+    fields = __slots__
+    message_template = '{path}:{line} Layer "{0}" must not import layer "{1}" ({2})'
+
+    def __init__(
+        self, path: str, line: int, importer_layer: str, imported_layer: str, imported_module: str
+    ) -> None:
+        super().__init__(path, line)
+        self.importer_layer = importer_layer
+        self.imported_layer = imported_layer
+        self.imported_module = imported_module
+
+
+def has_only_models_in_models_submodule(
+    module_name: str,
+    module_path: str,
+    module_files: List[str],
+    model_index: DjangoModelIndex | None = None,
+) -> List[MisplacedModelsStatementError]:
+    if model_index is None:
+        model_index = DjangoModelIndex()
+
+    errors: List[MisplacedModelsStatementError] = []
     for filepath in module_files:
         if not is_django_model_file(filepath):
             continue
-
-        ast_tree = get_ast_tree(filepath)
-        if ast_tree is None:
+        models_module = model_index.get_module(filepath)
+        if models_module is None:
             continue
-
-        for bad_node in get_not_ok_base_nodes_from(
-            ast_tree, allowed_ast_nodes, conditionals_ast_nodes
-        ):
-            errors.append(
-                f'{filepath}:{get_ast_node_lineno(bad_node)} Wrong instruction for models '
-                f'submodule (models should contains only models)'
-            )
+        for lineno in models_module.misplaced_statement_linenos:
+            errors.append(MisplacedModelsStatementError(filepath, lineno))
     return errors
 
 
 def all_enums_in_enums_py_module(
     module_name: str, module_path: str, module_files: List[str]
-) -> List[str]:
+) -> List[MisplacedEnumError]:
     allowed_enums_filename = 'enums.py'
     errors = []
     for filepath in module_files:
@@ -94,15 +169,13 @@ def all_enums_in_enums_py_module(
             continue
         for classdef in [n for n in ast_tree.body if isinstance(n, ast.ClassDef)]:
             if is_enum_definition(classdef):
-                errors.append(
-                    f'{filepath}:{classdef.lineno} Enums should live in {allowed_enums_filename}'
-                )
+                errors.append(MisplacedEnumError(filepath, classdef.lineno, allowed_enums_filename))
     return errors
 
 
 def has_no_submodules_with_blacklisted_suffixes(
     module_name: str, module_path: str, module_files: List[str]
-) -> List[str]:
+) -> List[BlacklistedSuffixError]:
     errors = []
     for filepath in module_files:
         relative_path = os.path.relpath(filepath, module_path)
@@ -110,17 +183,17 @@ def has_no_submodules_with_blacklisted_suffixes(
         is_tests = relative_path.startswith('tests/')
 
         if is_forbidden and not is_tests:
-            errors.append(
-                f'{filepath} should be moved to utils subdirectory and remove suffix from filename'
-            )
+            errors.append(BlacklistedSuffixError(filepath))
 
     return errors
 
 
-def has_no_empty_py_files(module_name: str, module_path: str, module_files: List[str]) -> List[str]:
+def has_no_empty_py_files(
+    module_name: str, module_path: str, module_files: List[str]
+) -> List[EmptyFileError]:
     max_filesize_to_check_bytes = 100
     allowed_empty_file = {'__init__.py'}
-    errors: List[str] = []
+    errors: List[EmptyFileError] = []
     for filename in module_files:
         if (
             os.path.getsize(filename) > max_filesize_to_check_bytes
@@ -130,13 +203,13 @@ def has_no_empty_py_files(module_name: str, module_path: str, module_files: List
         with open(filename, 'r') as file_handler:
             file_content = file_handler.read()
         if not file_content.strip():
-            errors.append(f'{filename} empty files are not allowed')
+            errors.append(EmptyFileError(filename))
     return errors
 
 
 def views_py_has_only_class_views(
     module_name: str, module_path: str, module_files: List[str]
-) -> List[str]:
+) -> List[FunctionViewError]:
     views_py_filename = 'views.py'
     logger_object_name = 'logger'
 
@@ -144,7 +217,7 @@ def views_py_has_only_class_views(
 
     conditionals_ast_nodes = logger_ast_nodes_conditional(logger_object_name)
 
-    errors: List[str] = []
+    errors: List[FunctionViewError] = []
 
     for filepath in module_files:
         filename = os.path.basename(filepath)
@@ -158,10 +231,8 @@ def views_py_has_only_class_views(
         functions = get_not_ok_base_nodes_from(ast_tree, allowed_ast_nodes, conditionals_ast_nodes)
 
         errors.extend(
-            [
-                f'{filepath}:{get_ast_node_lineno(func)} Only class views allowed in {views_py_filename}'
-                for func in functions
-            ]
+            FunctionViewError(filepath, get_ast_node_lineno(func), views_py_filename)
+            for func in functions
         )
 
     return errors
@@ -169,11 +240,11 @@ def views_py_has_only_class_views(
 
 def urls_py_has_urlpatterns(
     module_name: str, module_path: str, module_files: List[str]
-) -> List[str]:
+) -> List[MissingAssignmentError]:
     urls_py_filename = 'urls.py'
     target_assignment_name = 'urlpatterns'
 
-    errors: List[str] = []
+    errors: List[MissingAssignmentError] = []
 
     for filepath in module_files:
         filename = os.path.basename(filepath)
@@ -187,13 +258,13 @@ def urls_py_has_urlpatterns(
             continue
 
         if not get_assignments_to(ast_tree, target_assignment_name):
-            errors.append(f'{filepath} does not contain "{target_assignment_name}" assignment')
+            errors.append(MissingAssignmentError(filepath, target_assignment_name))
 
     return errors
 
 
-def no_url_calls(module_name: str, module_path: str, module_files: List[str]) -> List[str]:
-    errors: List[str] = []
+def no_url_calls(module_name: str, module_path: str, module_files: List[str]) -> List[UrlCallError]:
+    errors: List[UrlCallError] = []
 
     for filepath in module_files:
         ast_tree = get_ast_tree(filepath)
@@ -212,34 +283,90 @@ def no_url_calls(module_name: str, module_path: str, module_files: List[str]) ->
             ]
 
             for url_call in url_calls:
-                errors.append(
-                    f'{filepath}:{url_call.lineno} url() call is deprecated, use path() instead'
-                )
+                errors.append(UrlCallError(filepath, url_call.lineno))
 
     return errors
 
 
+def imports_respect_layer_contracts(
+    module_name: str,
+    module_path: str,
+    module_files: List[str],
+    layer_contracts: LayerContracts | None = None,
+    import_graph: ImportGraph | None = None,
+) -> List[LayerContractError]:
+    if layer_contracts is None:
+        layer_contracts = get_layer_contracts_from_configs()
+    if not layer_contracts:
+        return []
+    base_dir = os.path.dirname(module_path)
+    if import_graph is None:
+        import_graph = build_import_graph(module_files, base_dir)
+
+    errors: List[LayerContractError] = []
+    for filepath in module_files:
+        importer_module = get_module_name_from_path(filepath, base_dir)
+        importer_layer = layer_contracts.get_layer(importer_module)
+        if importer_layer is None or importer_module not in import_graph.imports_by_module:
+            continue
+        for imported_name in import_graph.imports_by_module[importer_module]:
+            imported_module = import_graph.get_absolute_name(importer_module, imported_name)
+            if not _is_project_module(imported_module, base_dir):
+                continue
+            imported_layer = layer_contracts.get_layer(imported_module)
+            if imported_layer is None or layer_contracts.is_import_allowed(
+                importer_layer, imported_layer
+            ):
+                continue
+            errors.append(
+                LayerContractError(
+                    filepath, imported_name.lineno, importer_layer, imported_layer, imported_module
+                )
+            )
+    return errors
+
+
+@functools.lru_cache(maxsize=None)
+def _is_project_root(root: str, base_dir: str) -> bool:
+    return os.path.isdir(os.path.join(base_dir, root)) or os.path.isfile(
+        os.path.join(base_dir, f'{root}.py')
+    )
+
+
+def _is_project_module(module_name: str, base_dir: str) -> bool:
+    return _is_project_root(module_name.split('.')[0], base_dir)
+
+
 def main() -> Optional[int]:
     exit_zero = True
-    module_validators: List[Callable[[str, str, List[str]], List[str]]] = [
-        has_only_models_in_models_submodule,
+    input_files = list(get_input_files(dirs_to_exclude=[]))
+    layer_contracts = get_layer_contracts_from_configs()
+    import_graph = build_import_graph(input_files) if layer_contracts else ImportGraph()
+    module_validators: List[Callable[[str, str, List[str]], Sequence[Diagnostic]]] = [
+        functools.partial(has_only_models_in_models_submodule, model_index=DjangoModelIndex()),
         all_enums_in_enums_py_module,
         has_no_submodules_with_blacklisted_suffixes,
         has_no_empty_py_files,
         views_py_has_only_class_views,
         urls_py_has_urlpatterns,
         no_url_calls,
+        functools.partial(
+            imports_respect_layer_contracts,
+            layer_contracts=layer_contracts,
+            import_graph=import_graph,
+        ),
     ]
-    errors: List[str] = []
-    for module_name, module_path, module_files in get_modules_files(
-        get_input_files(dirs_to_exclude=[])
-    ):
+    errors: List[Diagnostic] = []
+    for module_name, module_path, module_files in get_modules_files(input_files):
         for validator in module_validators:
             errors += validator(module_name, module_path, module_files)
 
-    for error in errors:
-        print(error)  # noqa: T001
-    if errors and not exit_zero:
+    report_module_name_collisions(import_graph)
+    errors_count = report_diagnostics(errors)
+    # нарушения контрактов слоев валят хук всегда, остальные проверки пока информационные
+    if any(isinstance(error, LayerContractError) for error in errors):
+        return 1
+    if errors_count and not exit_zero:
         return 1
 
 
@@ -3,14 +3,15 @@ from __future__ import annotations
 import ast
 import dataclasses
 import enum
-import tokenize
 import typing
-from collections import deque
 
 from hooks.utils.ast_helpers import get_ast_node_lineno, get_ast_tree_with_content
+from hooks.utils.diagnostics import Diagnostic, report_diagnostics
+from hooks.utils.file_roles import FileRole, classify_path
+from hooks.utils.noqa import NoqaIndex, build_noqa_index
 from hooks.utils.pre_commit import get_input_files
 
-NOQA_FOR_SETTINGS_VARIABLES = ['# noqa: allowed straight assignment', '# noqa: static object']
+NOQA_TAGS_FOR_SETTINGS_VARIABLES = frozenset(['allowed straight assignment', 'static object'])
 
 
 class Reasons(enum.Enum):
@@ -19,35 +20,75 @@ class Reasons(enum.Enum):
     GETENV = 'getenv usage'
 
 
-@dataclasses.dataclass(frozen=True)
-class LineError:
-    lineno: int
-    reason: Reasons
+class LineError(Diagnostic):
+    __slots__ = ('reason',)
 
-    def __str__(self) -> str:
-        return f'{self.lineno} : {self.reason}'
+    rule_id = 'settings-variables'
+    fields = __slots__
+    message_template = '{path}:{line} : {0}'
+
+    def __init__(self, path: str, lineno: int, reason: Reasons) -> None:
+        super().__init__(path, lineno)
+        self.reason = reason
+
+    @property
+    def lineno(self) -> int:
+        return self.line
+
+
+STATIC_CONTAINER_TYPES = (ast.List, ast.Dict, ast.Tuple)
+STRAIGHT_VALUE_TYPES = (ast.Constant, ast.BinOp, ast.Load, ast.Store, ast.Starred)
+
+
+@dataclasses.dataclass
+class SettingsAstIndex:
+    """Атрибуты нод, посчитанные за один post-order обход дерева (build_settings_ast_index)."""
+
+    # нода -> (глубина, первая в порядке ast.walk нода с getenv в её поддереве)
+    first_getenv_nodes: typing.Dict[ast.AST, typing.Tuple[int, ast.AST]]
+    static_nodes: typing.Set[ast.AST]
+    child_nodes_count: typing.Dict[ast.AST, int]
+
+    def is_static(self, node: ast.AST) -> bool:
+        return node in self.static_nodes
+
+    def get_child_nodes_count(self, node: ast.AST) -> int:
+        return self.child_nodes_count.get(node, 0)
 
 
 def is_node_static(node: ast.AST) -> bool:
-    if isinstance(node, (ast.List, ast.Dict, ast.Tuple)):
-        child_nodes_with_straight_assignment = 0
-        for child_node in ast.iter_child_nodes(node):
-            if isinstance(child_node, (ast.Constant, ast.BinOp, ast.Load, ast.Store, ast.Starred)):
-                child_nodes_with_straight_assignment += 1
-            else:
-                child_nodes_with_straight_assignment += is_node_static(child_node)
-        return child_nodes_with_straight_assignment == len(list(ast.iter_child_nodes(node)))
-    else:
+    if not isinstance(node, STATIC_CONTAINER_TYPES):
         return False
+    return all(
+        isinstance(child_node, STRAIGHT_VALUE_TYPES) or is_node_static(child_node)
+        for child_node in ast.iter_child_nodes(node)
+    )
 
 
-def is_child_node_a_dict_value(child_idx: int, parent: ast.AST) -> bool:
-    """В словаре детские ноды идут в таком порядке: все ключи, затем все значения."""
-    return child_idx >= (len(list(ast.iter_child_nodes(parent)))) // 2
+def _count_child_nodes(node: ast.AST) -> int:
+    return sum(1 for _ in ast.iter_child_nodes(node))
 
 
-def is_node_straight_assignment(node: ast.AST, parent: ast.AST, child_idx: int) -> bool:
-    if len(list(ast.iter_child_nodes(node))):
+def is_child_node_a_dict_value(
+    child_idx: int, parent: ast.AST, parent_child_nodes_count: typing.Optional[int] = None
+) -> bool:
+    """В словаре детские ноды идут в таком порядке: все ключи, затем все значения."""
+    if parent_child_nodes_count is None:
+        parent_child_nodes_count = _count_child_nodes(parent)
+    return child_idx >= parent_child_nodes_count // 2
+
+
+def is_node_straight_assignment(
+    node: ast.AST,
+    parent: ast.AST,
+    child_idx: int,
+    settings_index: typing.Optional[SettingsAstIndex] = None,
+) -> bool:
+    if settings_index is None:
+        has_child_nodes = _count_child_nodes(node) > 0
+    else:
+        has_child_nodes = settings_index.get_child_nodes_count(node) > 0
+    if has_child_nodes:
         return False
 
     if isinstance(parent, (ast.List, ast.Assign, ast.Tuple)) and (
@@ -57,7 +98,11 @@ def is_node_straight_assignment(node: ast.AST, parent: ast.AST, child_idx: int)
 
     elif isinstance(parent, (ast.Dict)) and (
         isinstance(node, (ast.Constant, ast.BinOp))
-        and (is_child_node_a_dict_value(child_idx, parent))
+        and is_child_node_a_dict_value(
+            child_idx,
+            parent,
+            None if settings_index is None else settings_index.get_child_nodes_count(parent),
+        )
     ):
         return True
     return False
@@ -70,23 +115,56 @@ class AstRule:
     attrs: typing.Dict[str, typing.Union[str, 'AstRule']]
 
 
-def check_rule(root_rule: AstRule, root_node: ast.AST) -> bool:
-    stack: typing.Deque[typing.Tuple[AstRule, ast.AST]] = deque()
-    stack.append((root_rule, root_node))
-    while stack:
-        rule, node = stack.pop()
-        if not isinstance(node, rule.ast_type):
+AstPredicate = typing.Callable[[ast.AST], bool]
+
+
+def compile_rule(rule: AstRule) -> AstPredicate:
+    """Собирает из AstRule предикат с прямыми проверками атрибутов, без интерпретации правила."""
+    ast_type = rule.ast_type
+    constant_attrs = [
+        (name, value) for name, value in rule.attrs.items() if not isinstance(value, AstRule)
+    ]
+    nested_predicates = [
+        (name, compile_rule(value))
+        for name, value in rule.attrs.items()
+        if isinstance(value, AstRule)
+    ]
+
+    def _predicate(node: ast.AST) -> bool:
+        if not isinstance(node, ast_type):
             return False
-        for name, value in rule.attrs.items():
-            if isinstance(value, AstRule):
-                child_node = getattr(node, name, None)
-                if child_node is None:
-                    return False
-                stack.append((value, child_node))
-            else:
-                if value != getattr(node, name, None):
-                    return False
-    return True
+        for name, value in constant_attrs:
+            if value != getattr(node, name, None):
+                return False
+        for name, nested_predicate in nested_predicates:
+            child_node = getattr(node, name, None)
+            if child_node is None or not nested_predicate(child_node):
+                return False
+        return True
+
+    return _predicate
+
+
+class CompiledRules:
+    """Предикаты правил, сгруппированные по типу корневой ноды."""
+
+    def __init__(self, rules: typing.Sequence[AstRule]) -> None:
+        self._rules = [(rule.ast_type, compile_rule(rule)) for rule in rules]
+        self._predicates_by_type: typing.Dict[type, typing.List[AstPredicate]] = {}
+
+    def _get_predicates_for_type(self, node_type: type) -> typing.List[AstPredicate]:
+        predicates = self._predicates_by_type.get(node_type)
+        if predicates is None:
+            predicates = [
+                predicate
+                for rule_ast_type, predicate in self._rules
+                if issubclass(node_type, rule_ast_type)
+            ]
+            self._predicates_by_type[node_type] = predicates
+        return predicates
+
+    def matches(self, node: ast.AST) -> bool:
+        return any(predicate(node) for predicate in self._get_predicates_for_type(type(node)))
 
 
 GETENV_RULES = [
@@ -139,41 +217,100 @@ GETENV_RULES = [
 ]
 
 
+GETENV_MATCHER = CompiledRules(GETENV_RULES)
+
+
+def _index_node(
+    node: ast.AST, settings_index: SettingsAstIndex
+) -> typing.Optional[typing.Tuple[int, ast.AST]]:
+    first_getenv: typing.Optional[typing.Tuple[int, ast.AST]] = None
+    is_static = isinstance(node, STATIC_CONTAINER_TYPES)
+    child_nodes_count = 0
+    for child_node in ast.iter_child_nodes(node):
+        child_nodes_count += 1
+        child_first_getenv = _index_node(child_node, settings_index)
+        if child_first_getenv and (
+            first_getenv is None or child_first_getenv[0] + 1 < first_getenv[0]
+        ):
+            first_getenv = (child_first_getenv[0] + 1, child_first_getenv[1])
+        if is_static and not isinstance(child_node, STRAIGHT_VALUE_TYPES):
+            is_static = settings_index.is_static(child_node)
+
+    if GETENV_MATCHER.matches(node):
+        first_getenv = (0, node)
+    if first_getenv:
+        settings_index.first_getenv_nodes[node] = first_getenv
+    if is_static:
+        settings_index.static_nodes.add(node)
+    if child_nodes_count:
+        settings_index.child_nodes_count[node] = child_nodes_count
+    return first_getenv
+
+
+def build_settings_ast_index(root_node: ast.AST) -> SettingsAstIndex:
+    settings_index = SettingsAstIndex(
+        first_getenv_nodes={}, static_nodes=set(), child_nodes_count={}
+    )
+    _index_node(root_node, settings_index)
+    return settings_index
+
+
 def find_node_with_getenv_call(
-    node: ast.AST, parent: ast.AST, child_idx: int
+    node: ast.AST,
+    parent: ast.AST,
+    child_idx: int,
+    settings_index: typing.Optional[SettingsAstIndex] = None,
 ) -> typing.Optional[ast.AST]:
     """
     Find node, where getenv is called.
     """
+    if settings_index is not None:
+        first_getenv = settings_index.first_getenv_nodes.get(node)
+        return first_getenv[1] if first_getenv else None
     for n in ast.walk(node):
-        if any([check_rule(rule, n) for rule in GETENV_RULES]):
+        if GETENV_MATCHER.matches(n):
             return n
     return None
 
 
 def find_line_errors(
-    node: ast.AST, ast_content: typing.Optional[str], parent: ast.AST, child_idx: int = 0
+    node: ast.AST,
+    ast_content: typing.Optional[str],
+    parent: ast.AST,
+    child_idx: int = 0,
+    settings_index: typing.Optional[SettingsAstIndex] = None,
+    filepath: str = '',
 ) -> typing.Iterator[LineError]:
-    bad_node = find_node_with_getenv_call(node, parent, child_idx)
+    if settings_index is None:
+        settings_index = build_settings_ast_index(node)
+    bad_node = find_node_with_getenv_call(node, parent, child_idx, settings_index)
     if bad_node:
-        yield LineError(get_ast_node_lineno(bad_node), Reasons.GETENV)
+        yield LineError(filepath, get_ast_node_lineno(bad_node), Reasons.GETENV)
     if isinstance(node, (ast.Call)):
         return
 
-    if is_node_static(node):
-        yield LineError(get_ast_node_lineno(node), Reasons.STATIC_OBJECT)
+    is_static = settings_index.is_static(node)
+    if is_static:
+        yield LineError(filepath, get_ast_node_lineno(node), Reasons.STATIC_OBJECT)
 
-    if is_node_straight_assignment(node, parent, child_idx):
-        yield LineError(get_ast_node_lineno(node), Reasons.STRAIGHT_ASSIGNMENT)
-    elif not is_node_static(node):
+    if is_node_straight_assignment(node, parent, child_idx, settings_index):
+        yield LineError(filepath, get_ast_node_lineno(node), Reasons.STRAIGHT_ASSIGNMENT)
+    elif not is_static:
         for child_idx, child_node in enumerate(ast.iter_child_nodes(node)):
-            yield from find_line_errors(child_node, ast_content, node, child_idx)
+            yield from find_line_errors(
+                child_node, ast_content, node, child_idx, settings_index, filepath
+            )
 
 
 def get_line_numbers_of_wrong_assignments(
-    node: ast.AST, ast_content: typing.Optional[str], parent: ast.AST
+    node: ast.AST, ast_content: typing.Optional[str], parent: ast.AST, filepath: str = ''
 ) -> typing.Sequence[LineError]:
-    line_errors: typing.List[LineError] = list(find_line_errors(node, ast_content, parent))
+    settings_index = build_settings_ast_index(node)
+    line_errors: typing.List[LineError] = list(
+        find_line_errors(
+            node, ast_content, parent, settings_index=settings_index, filepath=filepath
+        )
+    )
 
     uniq_errors: typing.Set[LineError] = set()
     result = []
@@ -185,41 +322,38 @@ def get_line_numbers_of_wrong_assignments(
     return result
 
 
-def exclude_lines_with_noqa(filepath: str) -> typing.Set[int]:
-    with tokenize.open(filepath) as f:
-        line_numbers_with_noqa: typing.Set[int] = set()
-        for line in tokenize.generate_tokens(f.readline):
-            for noqa in NOQA_FOR_SETTINGS_VARIABLES:
-                if tokenize.COMMENT in line and noqa in line.string:
-                    line_numbers_with_noqa.add(line.start[0])
-    return line_numbers_with_noqa
+def get_lines_with_settings_noqa(noqa_index: NoqaIndex) -> typing.Set[int]:
+    return noqa_index.get_lines_with_tag_prefixes(NOQA_TAGS_FOR_SETTINGS_VARIABLES)
 
 
-def main() -> typing.Optional[int]:
-    settings_files = [
-        filepath
-        for filepath in get_input_files()
-        if 'settings/' in filepath and not filepath.endswith('/__init__.py')
+def is_settings_filepath(filepath: str) -> bool:
+    return FileRole.SETTINGS in classify_path(filepath)
+
+
+def get_file_errors(
+    settings_filepath: str, ast_tree: ast.AST, file_content: str
+) -> typing.List[LineError]:
+    lines_with_noqa = get_lines_with_settings_noqa(build_noqa_index(file_content))
+    return [
+        line_error
+        for line_error in get_line_numbers_of_wrong_assignments(
+            ast_tree, file_content, ast_tree, settings_filepath
+        )
+        if line_error.lineno not in lines_with_noqa
     ]
 
-    fail = False
+
+def main() -> typing.Optional[int]:
+    settings_files = list(get_input_files(roles=FileRole.SETTINGS))
+
+    errors: typing.List[LineError] = []
     for settings_filepath in settings_files:
         ast_tree, ast_content = get_ast_tree_with_content(settings_filepath)
-        if ast_tree is None:
+        if ast_tree is None or ast_content is None:
             continue
+        errors += get_file_errors(settings_filepath, ast_tree, ast_content)
 
-        lines_with_noqa = exclude_lines_with_noqa(settings_filepath)
-        line_errors = [
-            line_error
-            for line_error in get_line_numbers_of_wrong_assignments(ast_tree, ast_content, ast_tree)
-            if line_error.lineno not in lines_with_noqa
-        ]
-
-        for line_error in sorted(line_errors, key=lambda le: le.lineno):
-            print(f'{settings_filepath}:{line_error}')
-            fail = True
-
-    if fail:
+    if report_diagnostics(errors):
         return 1
 
 
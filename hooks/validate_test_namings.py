@@ -4,20 +4,10 @@ import ast
 import collections
 from typing import DefaultDict, List, Optional, Union
 
-from hooks.utils.ast_helpers import AnyFuncdef
+from hooks.utils.ast_helpers import AnyFuncdef, get_ast_tree
 from hooks.utils.pre_commit import get_input_test_files
 
 
-def get_ast_tree(pyfilepath: str) -> Optional[ast.Module]:
-    with open(pyfilepath, 'r') as file_handler:
-        try:
-            file_content = file_handler.read()
-        except UnicodeDecodeError:
-            return None
-    ast_tree = ast.parse(file_content)
-    return ast_tree
-
-
 def get_funcdefs(ast_tree: ast.Module) -> List[AnyFuncdef]:
     return [n for n in ast_tree.body if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))]
 